@@ -0,0 +1 @@
+"""Benchmark headless (tanpa Streamlit) untuk pipeline data notulensi."""
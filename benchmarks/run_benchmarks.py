@@ -0,0 +1,205 @@
+"""
+Benchmark pipeline data notulensi pada dataset sintetis skala armada.
+
+Contoh:
+    python -m benchmarks.run_benchmarks --sizes 10000 100000 1000000 --output bench.json
+"""
+import argparse
+import csv
+import gc
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from notulensi import aggregates, analysis, data
+from notulensi.index import FilterIndex
+from benchmarks.synthetic import generate_dataset
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+# Interval (detik) pengambilan sampel alokasi Arrow selama satu tahap
+ARROW_SAMPLE_INTERVAL = 0.001
+
+
+def _arrow_allocated():
+    """Byte yang sedang dialokasikan memory pool Arrow, atau None tanpa pyarrow."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+    return pa.total_allocated_bytes()
+
+
+class ArrowPeak:
+    """
+    Puncak alokasi Arrow (di atas nilai awal) selama blok `with`.
+
+    tracemalloc tidak melihat memori Arrow, padahal pandas >= 3 menyimpan
+    kolom teks sebagai string Arrow. Pool Arrow tidak punya puncak yang bisa
+    di-reset, jadi nilainya diambil sampel dari thread terpisah.
+    """
+
+    def __init__(self, interval=ARROW_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        current = _arrow_allocated() - self._start
+        if current > self.peak:
+            self.peak = current
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._start = _arrow_allocated()
+        if self._start is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._sample()
+
+
+def _stages(csv_path):
+    """
+    Daftar (nama, fungsi) yang dijalankan berurutan; setiap fungsi menerima
+    dict state dan menyimpan hasilnya di situ untuk tahap berikutnya.
+    """
+    def load(state):
+        state['raw'] = data.read_source(csv_path)
+
+    def clean(state):
+        state['df'] = data.normalize_frame(state['raw'])
+
+    def cube(state):
+        state['cube'] = aggregates.build_cube(state['df'])
+
+    def homepage(state):
+        for year in [None] + aggregates.cube_years(state['cube']):
+            aggregates.fleet_summary(state['cube'], year)
+
+    def build_index(state):
+        state['index'] = FilterIndex(state['df'])
+
+    def filter_(state):
+        index = state['index']
+        years = index.values('Year')
+        vessels = index.values('Vessel')
+        state['filtered'] = index.query(state['df'], year=years[-1], vessels=vessels[: max(1, len(vessels) // 2)])
+        state['filtered_all'] = index.query(state['df'], year='All', vessels=vessels)
+
+    def aggregate(state):
+        for df in (state['filtered'], state['filtered_all']):
+            analysis.compute_dashboard_kpis(df)
+
+    def chart_prep(state):
+        for df in (state['filtered'], state['filtered_all']):
+            analysis.oldest_open_reports(df, n=15)
+
+    return [
+        ('load', load), ('clean', clean), ('cube', cube), ('homepage', homepage),
+        ('build_index', build_index), ('filter', filter_),
+        ('aggregate', aggregate), ('chart_prep', chart_prep),
+    ]
+
+
+def run_size(n_rows, repeat=3, seed=0):
+    """Jalankan semua tahap untuk satu ukuran dataset. Mengembalikan list hasil per tahap."""
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, 'notulensi_synthetic.csv')
+        generate_dataset(n_rows, seed=seed).to_csv(csv_path, index=False)
+        file_size = os.path.getsize(csv_path)
+
+        stages = _stages(csv_path)
+        timings = {name: [] for name, _ in stages}
+
+        # Waktu: ambil yang tercepat dari beberapa ulangan (tanpa tracemalloc)
+        for _ in range(repeat):
+            data.clear_date_cache()
+            state = {}
+            for name, fn in stages:
+                gc.collect()
+                start = time.perf_counter()
+                fn(state)
+                timings[name].append(time.perf_counter() - start)
+
+        # Memori puncak: satu putaran terpisah dengan tracemalloc (heap Python
+        # dan numpy) ditambah puncak alokasi Arrow (string pandas >= 3). Kedua
+        # puncak belum tentu terjadi bersamaan, jadi jumlahnya batas atas.
+        peaks = {}
+        arrow_peaks = {}
+        data.clear_date_cache()
+        state = {}
+        for name, fn in stages:
+            gc.collect()
+            tracemalloc.start()
+            with ArrowPeak() as arrow:
+                fn(state)
+            arrow_peaks[name] = arrow.peak
+            peaks[name] = tracemalloc.get_traced_memory()[1] + arrow.peak
+            tracemalloc.stop()
+
+    return [
+        {
+            'rows': n_rows,
+            'csv_bytes': file_size,
+            'stage': name,
+            'best_s': min(timings[name]),
+            'mean_s': sum(timings[name]) / len(timings[name]),
+            'peak_mb': peaks[name] / 2 ** 20,
+            'arrow_peak_mb': arrow_peaks[name] / 2 ** 20,
+        }
+        for name, _ in stages
+    ]
+
+
+def print_table(results):
+    print(f"{'rows':>10} {'stage':<12} {'best (s)':>10} {'mean (s)':>10} {'peak (MB)':>10} {'arrow (MB)':>10}")
+    for r in results:
+        print(f"{r['rows']:>10} {r['stage']:<12} {r['best_s']:>10.4f} {r['mean_s']:>10.4f} "
+              f"{r['peak_mb']:>10.1f} {r['arrow_peak_mb']:>10.1f}")
+
+
+def write_results(results, path):
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]))
+            writer.writeheader()
+            writer.writerows(results)
+    else:
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='simpan hasil ke file .json atau .csv')
+    args = parser.parse_args(argv)
+
+    results = []
+    for n_rows in args.sizes:
+        results.extend(run_size(n_rows, repeat=args.repeat, seed=args.seed))
+        print_table([r for r in results if r['rows'] == n_rows])
+        sys.stdout.flush()
+
+    if args.output:
+        write_results(results, args.output)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from notulensi.data import COLUMNS, DATE_FORMAT
+
+# Distribusi kira-kira mengikuti notulensi_kerusakan.csv
+UNITS = {
+    'Crane': 0.23, 'ME': 0.15, 'AE': 0.14, 'Navigation': 0.06, 'Grab': 0.04,
+    'Boiler': 0.03, 'Hull & Structure': 0.03, 'Pump': 0.03, 'Outfitting': 0.03,
+    'Compressor': 0.02, 'LSA': 0.02, 'Pipe': 0.02, 'Hatch Cover': 0.02,
+    'Mooring System': 0.02, 'Accomodation': 0.02, 'Bridge System': 0.02,
+    'Computer': 0.01, 'Navigasi': 0.01, 'LAINNYA': 0.01, '': 0.09,
+}
+PROBLEMS = [
+    'Kerusakan {unit} no.{n}', '{unit} no {n} bermasalah', 'Kebocoran pada {unit}',
+    'Pompa {unit} tidak berfungsi', 'Sensor {unit} error', 'Perawatan rutin {unit} no.{n}',
+]
+SOLUTIONS = ['Menunggu Spare Part', 'Akan dilakukan pergantian', 'Sudah diperbaiki oleh crew', '']
+OPEN_RATIO = 0.06
+EMPTY_VESSEL_RATIO = 0.07
+ISO_DATE_RATIO = 0.05
+
+
+def vessel_codes(n_vessels):
+    letters = [chr(c) for c in range(ord('A'), ord('Z') + 1)]
+    codes = [a + b for a in letters for b in letters]
+    return codes[:n_vessels]
+
+
+def generate_dataset(n_rows, n_vessels=40, years=5, seed=0, end_date='2025-10-01'):
+    """
+    DataFrame mentah (semua kolom teks, seperti CSV) dengan distribusi kapal
+    yang condong (Zipf), unit dan status mirip data asli, serta sebagian
+    baris kotor (kapal kosong, format tanggal ISO).
+    """
+    rng = np.random.default_rng(seed)
+
+    vessels = np.array(vessel_codes(n_vessels), dtype=object)
+    weights = 1.0 / np.arange(1, n_vessels + 1) ** 0.8
+    vessel = vessels[rng.choice(n_vessels, n_rows, p=weights / weights.sum())]
+    vessel[rng.random(n_rows) < EMPTY_VESSEL_RATIO] = ''
+
+    units = np.array(list(UNITS), dtype=object)
+    unit_p = np.array(list(UNITS.values()))
+    unit = units[rng.choice(len(units), n_rows, p=unit_p / unit_p.sum())]
+
+    is_open = rng.random(n_rows) < OPEN_RATIO
+    status = np.where(is_open, 'OPEN', 'CLOSED').astype(object)
+
+    # Tanggal: dihitung sebagai offset hari lalu diformat lewat tabel string unik
+    end = pd.Timestamp(end_date)
+    calendar = pd.date_range(end - pd.Timedelta(days=365 * years), end + pd.Timedelta(days=400), freq='D')
+    fmt_main = np.array(calendar.strftime(DATE_FORMAT), dtype=object)
+    fmt_iso = np.array(calendar.strftime('%Y-%m-%d'), dtype=object)
+    n_days = 365 * years
+
+    issued_idx = rng.integers(0, n_days, n_rows)
+    day_idx = issued_idx + rng.integers(0, 30, n_rows)
+    closed_idx = issued_idx + rng.exponential(20, n_rows).astype(int)
+
+    def fmt(idx):
+        out = fmt_main[idx]
+        iso = rng.random(n_rows) < ISO_DATE_RATIO
+        out[iso] = fmt_iso[idx[iso]]
+        return out
+
+    issued = fmt(issued_idx)
+    closed = fmt(closed_idx)
+    closed[is_open] = ''
+
+    n_template = rng.integers(0, len(PROBLEMS), n_rows)
+    numbers = rng.integers(1, 5, n_rows)
+    problems = [PROBLEMS[t].format(unit=u or 'mesin', n=n) for t, u, n in zip(n_template, unit, numbers)]
+
+    keterangan = np.where(is_open, 'Menunggu unit ready', '').astype(object)
+    keterangan[~is_open] = np.char.add('Closed ', closed[~is_open].astype(str))
+
+    return pd.DataFrame({
+        'Day': fmt(day_idx),
+        'Vessel': vessel,
+        'Permasalahan': problems,
+        'Penyelesaian': np.array(SOLUTIONS, dtype=object)[rng.integers(0, len(SOLUTIONS), n_rows)],
+        'Unit': unit,
+        'Issued Date': issued,
+        'Closed Date': closed,
+        'Keterangan': keterangan,
+        'Status': status,
+    }, columns=COLUMNS)
@@ -0,0 +1,7 @@
+"""Modul bersama untuk memuat dan mengolah data notulensi kerusakan kapal."""
+import os
+
+# Konstanta tanpa dependensi berat (pandas/numpy), supaya modul ringan seperti
+# metrics, outbox dan sync bisa diimpor tanpa memuat data.py
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLUMNS = ['Day', 'Vessel', 'Permasalahan', 'Penyelesaian', 'Unit', 'Issued Date', 'Closed Date', 'Keterangan', 'Status']
@@ -0,0 +1,96 @@
+import pandas as pd
+
+from notulensi import data
+
+# Kunci kubus agregat: satu baris per kombinasi yang benar-benar ada di data
+CUBE_KEYS = ['Vessel', 'Year', 'Unit', 'Status']
+CUBE_COLUMNS = CUBE_KEYS + ['Count', 'First_Date', 'Last_Date']
+
+
+def empty_cube():
+    cube = pd.DataFrame(columns=CUBE_COLUMNS)
+    return cube.astype({
+        'Year': 'int16', 'Count': 'int64',
+        'First_Date': 'datetime64[ns]', 'Last_Date': 'datetime64[ns]',
+    })
+
+
+def build_cube(df):
+    """
+    Kubus (Vessel, Year, Unit, Status) -> jumlah laporan, beserta tanggal
+    laporan pertama/terakhir (Date_Ref) di setiap sel.
+    """
+    if df.empty:
+        return empty_cube()
+    cube = df.groupby(CUBE_KEYS, observed=True).agg(
+        Count=('Date_Ref', 'size'),
+        First_Date=('Date_Ref', 'min'),
+        Last_Date=('Date_Ref', 'max'),
+    ).reset_index()
+    for col in ['Vessel', 'Unit', 'Status']:
+        cube[col] = cube[col].astype(str)
+    return cube
+
+
+def merge_cube(cube, delta):
+    """Gabungkan kubus delta (dari baris baru) ke kubus yang ada."""
+    if delta.empty:
+        return cube
+    if cube.empty:
+        return delta
+    return pd.concat([cube, delta], ignore_index=True).groupby(CUBE_KEYS).agg(
+        Count=('Count', 'sum'),
+        First_Date=('First_Date', 'min'),
+        Last_Date=('Last_Date', 'max'),
+    ).reset_index()
+
+
+def subtract_cube(cube, delta):
+    """
+    Kurangi kubus `delta` (baris yang keluar dari data) dari kubus yang ada.
+    Sel yang jumlahnya menjadi 0 dihapus. First_Date/Last_Date tidak bisa
+    dihitung mundur, jadi sel yang tersisa tetap memakai rentang lamanya.
+    """
+    if delta.empty:
+        return cube
+    merged = cube.merge(delta[CUBE_KEYS + ['Count']], on=CUBE_KEYS, how='left', suffixes=('', '_removed'))
+    merged['Count'] = merged['Count'] - merged['Count_removed'].fillna(0).astype('int64')
+    return merged[merged['Count'] > 0].drop(columns='Count_removed').reset_index(drop=True)
+
+
+def cube_years(cube):
+    """Daftar tahun yang ada di data."""
+    return sorted(cube['Year'].astype(int).unique().tolist())
+
+
+def vessel_status_counts(cube, year=None):
+    """Tabel Vessel x Status (minimal kolom OPEN dan CLOSED), opsional difilter per tahun."""
+    if year is not None:
+        cube = cube[cube['Year'] == int(year)]
+    if cube.empty:
+        return pd.DataFrame(columns=['OPEN', 'CLOSED'], dtype='int64')
+    counts = cube.pivot_table(index='Vessel', columns='Status', values='Count', aggfunc='sum', fill_value=0)
+    for status in ['OPEN', 'CLOSED']:
+        if status not in counts.columns:
+            counts[status] = 0
+    counts.columns.name = None
+    return counts.astype('int64')
+
+
+def vessel_last_dates(cube):
+    """Tanggal laporan terakhir per kapal (seluruh tahun)."""
+    return cube.groupby('Vessel')['Last_Date'].max()
+
+
+def fleet_summary(cube, year=None):
+    """
+    Statistik untuk kartu kapal Homepage: DataFrame [Vessel, OPEN, CLOSED,
+    last_inspection] dan total OPEN/CLOSED global. Biaya sebanding jumlah sel
+    kubus, bukan jumlah baris laporan.
+    """
+    counts = vessel_status_counts(cube, year)
+    last_inspection = vessel_last_dates(cube).dt.strftime(data.DATE_FORMAT)
+
+    result = counts[['OPEN', 'CLOSED']].rename_axis('Vessel').reset_index()
+    result['last_inspection'] = result['Vessel'].map(last_inspection)
+    return result, int(counts['OPEN'].sum()), int(counts['CLOSED'].sum())
@@ -0,0 +1,140 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from notulensi import BASE_DIR, data, metrics
+
+# Kelompok umur laporan OPEN (hari sejak Day, atau Issued Date jika Day kosong): (batas atas inklusif, label)
+AGING_BUCKETS = [(7, '0-7'), (30, '8-30'), (90, '31-90'), (None, '90+')]
+AGING_LABELS = [label for _, label in AGING_BUCKETS]
+# Laporan OPEN yang lebih tua dari ini dianggap melanggar SLA
+SLA_DAYS = 30
+# Lokasi digest harian pelanggaran SLA
+DIGEST_DIR = os.path.join(BASE_DIR, 'digests')
+BREACH_COLUMNS = ['Vessel', 'Unit', 'Day', 'Permasalahan', 'Umur (Hari)']
+
+
+@dataclass
+class AgingReport:
+    """Hasil perhitungan umur laporan OPEN untuk satu versi data dan satu tanggal."""
+    version: object = None
+    day: date = None
+    computed_at: datetime = None
+    sla_days: int = SLA_DAYS
+    # [Vessel, Unit] + AGING_LABELS: jumlah laporan OPEN per kelompok umur
+    buckets: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=['Vessel', 'Unit'] + AGING_LABELS))
+    # Laporan OPEN melewati SLA, tertua lebih dulu
+    breaches: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=BREACH_COLUMNS))
+
+    def vessel_breaches(self):
+        """Jumlah pelanggaran SLA per kapal (Series index Vessel)."""
+        return self.breaches['Vessel'].value_counts()
+
+
+def compute_aging(frame, today=None, version=None, sla_days=SLA_DAYS):
+    """Kelompokkan laporan OPEN `frame` per (Vessel, Unit, umur) dan kumpulkan pelanggaran SLA."""
+    today = today or date.today()
+    report = AgingReport(version=version, day=today, computed_at=datetime.now(), sla_days=sla_days)
+    start = data.age_start(frame)
+    is_open = (frame['Status'] == 'OPEN') & start.notna()
+    open_rows = frame[is_open]
+    if open_rows.empty:
+        return report
+
+    age = (pd.Timestamp(today) - start[is_open]).dt.days.clip(lower=0)
+    bins = [-1] + [upper for upper, _ in AGING_BUCKETS[:-1]] + [np.inf]
+    bucket = pd.cut(age, bins=bins, labels=AGING_LABELS)
+    counts = open_rows.groupby([open_rows['Vessel'], open_rows['Unit'], bucket], observed=True).size()
+    buckets = counts.unstack(fill_value=0)
+    buckets.columns = buckets.columns.astype(str)
+    buckets = buckets.reindex(columns=AGING_LABELS, fill_value=0).reset_index()
+    buckets['Vessel'] = buckets['Vessel'].astype(str)
+    buckets['Unit'] = buckets['Unit'].astype(str)
+    report.buckets = buckets
+
+    breached = age > sla_days
+    breaches = open_rows.loc[breached, BREACH_COLUMNS[:-1]].copy()
+    breaches['Umur (Hari)'] = age[breached]
+    breaches['Vessel'] = breaches['Vessel'].astype(str)
+    breaches['Unit'] = breaches['Unit'].astype(str)
+    report.breaches = breaches.sort_values('Umur (Hari)', ascending=False, kind='stable').reset_index(drop=True)
+    return report
+
+
+def write_digest(report, directory=DIGEST_DIR):
+    """Tulis daftar pelanggaran SLA hari ini ke `directory` (ditimpa atomik). Mengembalikan path file."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f'sla_breaches_{report.day.isoformat()}.csv')
+    tmp_path = path + '.tmp'
+    report.breaches.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+class AgingScheduler:
+    """
+    Menghitung ulang AgingReport di latar belakang setiap `interval` detik,
+    tetapi hanya jika versi data atau tanggal berubah (umur bertambah setiap
+    hari). Hasil terbaru dibaca lewat `report` tanpa perhitungan di rerun.
+    """
+
+    def __init__(self, dataset, sla_days=SLA_DAYS, digest_dir=DIGEST_DIR):
+        self.dataset = dataset
+        self.sla_days = sla_days
+        self.digest_dir = digest_dir
+        self.report = AgingReport(sla_days=sla_days)
+        self.last_error = None
+        self._lock = threading.Lock()
+        # Satu perhitungan sekaligus (thread scheduler dan skrip halaman)
+        self._run_lock = threading.Lock()
+        self._thread = None
+        self._wake = threading.Event()
+
+    def _is_current(self, snapshot, today):
+        return self.report.version == snapshot.version and self.report.day == today
+
+    def run_once(self):
+        snapshot = self.dataset.snapshot()
+        today = date.today()
+        if self._is_current(snapshot, today):
+            return self.report
+        with self._run_lock:
+            # Pemanggil lain mungkin baru saja selesai menghitung versi yang sama
+            if self._is_current(snapshot, today):
+                return self.report
+            with metrics.timer('aging.compute'):
+                report = compute_aging(snapshot.frame, today, snapshot.version, self.sla_days)
+            self.report = report
+            if self.digest_dir:
+                try:
+                    write_digest(report, self.digest_dir)
+                except OSError as e:
+                    # Digest hanya salinan; hasil di memori tetap dipakai halaman
+                    self.last_error = e
+            return report
+
+    def request_run(self):
+        """Minta perhitungan ulang secepatnya (mis. setelah data baru masuk)."""
+        self._wake.set()
+
+    def start(self, interval=300):
+        """Jalankan perhitungan berkala di thread latar belakang (sekali per proses)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, args=(interval,), name='aging-scheduler', daemon=True)
+            self._thread.start()
+
+    def _run(self, interval):
+        while True:
+            try:
+                self.run_once()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+            self._wake.wait(interval)
+            self._wake.clear()
@@ -0,0 +1,194 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import pandas as pd
+
+from notulensi import data
+
+# Fungsi perhitungan Dashboard Analisis tanpa ketergantungan ke Streamlit,
+# supaya bisa dipakai ulang dan diukur (lihat benchmarks/).
+
+# Bucket tren dipilih dari rentang tanggal: (batas maksimum hari, nama bucket, label sumbu)
+TREND_BUCKETS = [
+    (120, 'week', 'Minggu'),
+    (3 * 366, 'month', 'Bulan'),
+    (None, 'quarter', 'Kuartal'),
+]
+_EPOCH = pd.Timestamp('1970-01-01')
+
+
+def choose_trend_bucket(start, end):
+    """Pilih bucket tren (week/month/quarter) supaya jumlah titik tetap kecil."""
+    if pd.isna(start) or pd.isna(end):
+        return 'month'
+    span = (end - start).days
+    for max_days, bucket, _ in TREND_BUCKETS:
+        if max_days is None or span <= max_days:
+            return bucket
+    return 'quarter'
+
+
+def trend_bucket_title(bucket):
+    return next(title for _, name, title in TREND_BUCKETS if name == bucket)
+
+
+def bucket_keys(date_day, bucket):
+    """Kunci bucket integer per baris (-1 jika tanggal kosong)."""
+    if bucket == 'week':
+        # 1970-01-01 adalah hari Kamis; +3 supaya minggu dimulai hari Senin
+        days = (date_day - _EPOCH).dt.days
+        keys = (days + 3) // 7
+    elif bucket == 'quarter':
+        keys = date_day.dt.year * 4 + (date_day.dt.month - 1) // 3
+    else:
+        keys = date_day.dt.year * 12 + date_day.dt.month - 1
+    return keys.fillna(-1).astype('int32')
+
+
+def bucket_label(key, bucket):
+    if bucket == 'week':
+        return (_EPOCH + pd.Timedelta(days=int(key) * 7 - 3)).strftime('%Y-%m-%d')
+    if bucket == 'quarter':
+        return f"{key // 4}-Q{key % 4 + 1}"
+    return f"{key // 12}-{key % 12 + 1:02d}"
+
+
+def _sum_by(cells, key, label, ascending=False):
+    """Jumlahkan Count per `key` menjadi DataFrame [key, label], terurut."""
+    counts = cells.groupby(key, sort=False)['Count'].sum()
+    counts = counts[counts > 0].sort_values(ascending=ascending, kind='stable')
+    return counts.rename(label).rename_axis(key).reset_index()
+
+
+@dataclass
+class DashboardKPIs:
+    """Semua angka yang dibutuhkan keempat tab Dashboard, hasil satu kali agregasi."""
+    total: int = 0
+    open_count: int = 0
+    closed_count: int = 0
+    avg_res_time: object = "N/A"
+    unit_counts: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=['Unit', 'Jumlah Kerusakan']))
+    top_unit_status_counts: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=['Status', 'Count']))
+    vessel_counts: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=['Vessel', 'Total Kerusakan']))
+    open_per_vessel: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=['Vessel', 'Jumlah OPEN']))
+    trend: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=['Periode', 'Status', 'Jumlah']))
+    trend_bucket: str = 'month'
+    mttr_per_unit: pd.DataFrame = field(default_factory=lambda: pd.DataFrame(columns=['Unit', 'MTTR (Hari)', 'Jumlah Kerusakan']))
+
+
+def kpi_cells(df_filtered, bucket='month'):
+    """
+    Satu-satunya pass atas baris laporan: grup (Vessel, Unit, Status, Bucket)
+    dengan jumlah laporan serta jumlah & banyaknya Resolution_Time_Days.
+    Bucket adalah periode tren (lihat bucket_keys) dari Date_Day.
+    Hasilnya kecil (sebanding jumlah kombinasi, bukan jumlah baris).
+    """
+    bucket_key = bucket_keys(df_filtered['Date_Day'], bucket).rename('Bucket')
+    cells = df_filtered.groupby(
+        [df_filtered['Vessel'], df_filtered['Unit'], df_filtered['Status'], bucket_key], observed=True
+    )['Resolution_Time_Days'].agg(['size', 'sum', 'count'])
+    cells.columns = ['Count', 'Res_Sum', 'Res_Count']
+    cells = cells.reset_index()
+    for col in ['Vessel', 'Unit', 'Status']:
+        cells[col] = cells[col].astype(str)
+    return cells
+
+
+def compute_dashboard_kpis(df_filtered, top_n_units=5):
+    """Hitung semua metrik tab Dashboard dari kpi_cells; tab hanya tinggal menampilkan."""
+    if df_filtered.empty:
+        return DashboardKPIs()
+
+    # Rentang tanggal (dua reduksi vektor) menentukan granularitas tren
+    bucket = choose_trend_bucket(df_filtered['Date_Day'].min(), df_filtered['Date_Day'].max())
+    cells = kpi_cells(df_filtered, bucket)
+    is_open = cells['Status'] == 'OPEN'
+    is_closed = cells['Status'] == 'CLOSED'
+    closed = cells[is_closed]
+
+    # === Ringkasan ===
+    res_count = closed['Res_Count'].sum()
+    avg_res_time = float(closed['Res_Sum'].sum() / res_count) if res_count else "N/A"
+
+    # === Unit & Kapal ===
+    unit_counts = _sum_by(cells, 'Unit', 'Jumlah Kerusakan')
+    top_units = unit_counts['Unit'].head(top_n_units).tolist()
+    top_unit_status_counts = _sum_by(cells[cells['Unit'].isin(top_units)], 'Status', 'Count')
+
+    # === Tren per periode (minggu/bulan/kuartal) ===
+    trend = cells[cells['Bucket'] >= 0].groupby(['Bucket', 'Status'])['Count'].sum().reset_index(name='Jumlah')
+    trend['Periode'] = trend['Bucket'].map(lambda key: bucket_label(key, bucket))
+    trend = trend[['Periode', 'Status', 'Jumlah']]
+
+    # === MTTR per Unit (dari laporan CLOSED), tercepat lebih dulu ===
+    mttr = closed.groupby('Unit')[['Res_Sum', 'Res_Count']].sum()
+    mttr_display = pd.DataFrame({
+        'Unit': mttr.index,
+        'MTTR (Hari)': (mttr['Res_Sum'] / mttr['Res_Count'].where(mttr['Res_Count'] > 0)).values,
+    })
+    failure_counts = cells.groupby('Unit')['Count'].sum()
+    mttr_display['Jumlah Kerusakan'] = mttr_display['Unit'].map(failure_counts).fillna(0).astype(int)
+    mttr_display = mttr_display.sort_values(by='MTTR (Hari)', ascending=True).reset_index(drop=True)
+
+    return DashboardKPIs(
+        total=int(cells['Count'].sum()),
+        open_count=int(cells.loc[is_open, 'Count'].sum()),
+        closed_count=int(closed['Count'].sum()),
+        avg_res_time=avg_res_time,
+        unit_counts=unit_counts,
+        top_unit_status_counts=top_unit_status_counts,
+        vessel_counts=_sum_by(cells, 'Vessel', 'Total Kerusakan'),
+        open_per_vessel=_sum_by(cells[is_open], 'Vessel', 'Jumlah OPEN'),
+        trend=trend,
+        trend_bucket=bucket,
+        mttr_per_unit=mttr_display,
+    )
+
+
+# Pilihan urutan daftar laporan di detail kapal
+VESSEL_SORTS = {
+    'open_age': 'OPEN terlama dulu',
+    'newest': 'Terbaru',
+    'oldest': 'Terlama',
+}
+
+
+def vessel_reports(df_vessel, sort='open_age', now=None):
+    """
+    Laporan satu kapal dengan kolom 'Umur (Hari)' (hanya untuk OPEN, dihitung
+    dari data.age_start), terurut sesuai `sort` (lihat VESSEL_SORTS). Hanya
+    menyentuh baris kapal tersebut.
+    """
+    now = now or datetime.now()
+    reports = df_vessel.copy()
+    is_open = reports['Status'] == 'OPEN'
+    reports['_start'] = data.age_start(reports)
+    reports['Umur (Hari)'] = (now - reports['_start']).dt.days.where(is_open)
+    if sort == 'open_age':
+        # OPEN lebih dulu, lalu yang paling lama terbuka
+        reports['_closed'] = ~is_open
+        reports = reports.sort_values(['_closed', '_start'], na_position='last', kind='stable')
+        return reports.drop(columns=['_closed', '_start'])
+    reports = reports.sort_values('_start', ascending=(sort == 'oldest'), na_position='last', kind='stable')
+    return reports.drop(columns='_start')
+
+
+def oldest_open_reports(df_filtered, n=15, now=None):
+    """
+    n laporan OPEN terlama dengan kolom Start_Date (data.age_start), Duration,
+    Current_Time, Label. Umur laporan naik seiring Start_Date makin lama, jadi
+    cukup seleksi top-k (nsmallest) tanpa sort penuh; durasi hanya dihitung
+    untuk n baris terpilih.
+    """
+    now = now or datetime.now()
+    start = data.age_start(df_filtered)
+    is_open = (df_filtered['Status'] == 'OPEN') & start.notna()
+    if not is_open.any():
+        return df_filtered[is_open].copy()
+
+    df_open = df_filtered[is_open].assign(Start_Date=start[is_open]).nsmallest(n, 'Start_Date')
+    df_open['Duration'] = (now - df_open['Start_Date']).dt.days
+    df_open['Current_Time'] = now
+    df_open['Vessel'] = df_open['Vessel'].astype(str)
+    df_open['Label'] = df_open['Vessel'] + ' - ' + df_open['Permasalahan'].str.slice(0, 30) + '...'
+    return df_open
@@ -0,0 +1,180 @@
+import argparse
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from notulensi import analysis, data
+from notulensi.aggregates import cube_years, fleet_summary
+from notulensi.index import FilterIndex
+
+# API JSON read-only untuk sistem lain (planner perawatan, wallboard).
+# ETag diturunkan dari versi data, sehingga klien yang polling mendapat 304
+# tanpa perhitungan ulang selama data belum berubah.
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8502
+# Jumlah respons (per versi data, path dan parameter) yang disimpan
+RESPONSE_CACHE_SIZE = 256
+
+
+def _records(df):
+    """DataFrame -> list of dict yang aman untuk JSON (NaN -> null, tanggal ISO)."""
+    return json.loads(df.to_json(orient='records', date_format='iso'))
+
+
+def _year_param(params):
+    year = params.get('year', [None])[0]
+    return None if not year or year == 'All' else int(year)
+
+
+def _vessels_param(params):
+    """Daftar kapal dari ?vessels=A,B (boleh diulang); None berarti semua kapal."""
+    values = [v for raw in params.get('vessels', []) for v in raw.split(',') if v]
+    return values or None
+
+
+class FleetAPI:
+    """
+    Logika API tanpa ketergantungan ke HTTP: setiap permintaan menjadi
+    (status, header, body). Dataset yang dipakai sama dengan aplikasi
+    Streamlit jika API dijalankan di proses yang sama (lihat cache.start_api).
+    """
+
+    def __init__(self, dataset, cache_size=RESPONSE_CACHE_SIZE):
+        self.dataset = dataset
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._responses = OrderedDict()
+        self._index = None
+        self.routes = {
+            '/api/version': self.version,
+            '/api/fleet': self.fleet,
+            '/api/kpis': self.kpis,
+            '/api/mttr': self.mttr,
+        }
+
+    def _filter_index(self, frame, version):
+        with self._lock:
+            if self._index is None or self._index.version != version:
+                self._index = FilterIndex(frame, version=version)
+            return self._index
+
+    def _filtered(self, snapshot, params):
+        index = self._filter_index(snapshot.frame, snapshot.version)
+        vessels = _vessels_param(params)
+        return index.query(
+            snapshot.frame, year=_year_param(params),
+            vessels=vessels if vessels is not None else index.values('Vessel'),
+        )
+
+    # --- Endpoint ---
+
+    def version(self, snapshot, params):
+        return {'version': snapshot.version}
+
+    def fleet(self, snapshot, params):
+        """Statistik kartu kapal Homepage (sama dengan get_processed_data_for_display)."""
+        result, total_open, total_closed = fleet_summary(snapshot.cube, _year_param(params))
+        result['Vessel'] = result['Vessel'].astype(str)
+        return {
+            'years': cube_years(snapshot.cube),
+            'total_open': total_open,
+            'total_closed': total_closed,
+            'vessels': _records(result),
+        }
+
+    def kpis(self, snapshot, params):
+        """Ringkasan Dashboard: total, OPEN/CLOSED, MTTR rata-rata, per kapal dan unit."""
+        kpis = analysis.compute_dashboard_kpis(self._filtered(snapshot, params))
+        return {
+            'total': kpis.total,
+            'open': kpis.open_count,
+            'closed': kpis.closed_count,
+            'avg_resolution_days': None if kpis.avg_res_time == "N/A" else kpis.avg_res_time,
+            'vessel_counts': _records(kpis.vessel_counts),
+            'open_per_vessel': _records(kpis.open_per_vessel),
+            'unit_counts': _records(kpis.unit_counts),
+        }
+
+    def mttr(self, snapshot, params):
+        """MTTR per unit (laporan CLOSED), tercepat lebih dulu."""
+        kpis = analysis.compute_dashboard_kpis(self._filtered(snapshot, params))
+        return {
+            'avg_resolution_days': None if kpis.avg_res_time == "N/A" else kpis.avg_res_time,
+            'units': _records(kpis.mttr_per_unit),
+        }
+
+    # --- Dispatch ---
+
+    def handle(self, target, if_none_match=None):
+        parts = urlsplit(target)
+        route = self.routes.get(parts.path.rstrip('/'))
+        if route is None:
+            return 404, {}, json.dumps({'error': 'not found'}).encode('utf-8')
+
+        snapshot = self.dataset.snapshot()
+        key = (snapshot.version, parts.path.rstrip('/'), parts.query)
+        etag = '"{}"'.format(hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:32])
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if if_none_match and etag in [t.strip() for t in if_none_match.split(',')]:
+            return 304, headers, b''
+
+        with self._lock:
+            body = self._responses.get(key)
+            if body is not None:
+                self._responses.move_to_end(key)
+        if body is None:
+            try:
+                payload = route(snapshot, parse_qs(parts.query))
+            except ValueError as e:
+                return 400, {}, json.dumps({'error': str(e)}).encode('utf-8')
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            with self._lock:
+                self._responses[key] = body
+                while len(self._responses) > self.cache_size:
+                    self._responses.popitem(last=False)
+        headers['Content-Type'] = 'application/json; charset=utf-8'
+        return 200, headers, body
+
+
+def make_server(api, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, headers, body = api.handle(self.path, self.headers.get('If-None-Match'))
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Polling wallboard tidak perlu memenuhi log
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def start_in_background(dataset, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Jalankan API di thread daemon; mengembalikan server-nya."""
+    server = make_server(FleetAPI(dataset), host, port)
+    threading.Thread(target=server.serve_forever, name='fleet-api', daemon=True).start()
+    return server
+
+
+if __name__ == '__main__':
+    # python -m notulensi.api [--host 0.0.0.0] [--port 8502]
+    from notulensi.ingest import CombinedDataset, IncrementalDataset, enable_copy_on_write
+    from notulensi.sync import SNAPSHOT_FILE
+
+    parser = argparse.ArgumentParser(description="API JSON read-only untuk agregat armada.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    enable_copy_on_write()
+    dataset = CombinedDataset([IncrementalDataset(data.DATA_FILE), IncrementalDataset(SNAPSHOT_FILE)])
+    print(f"Fleet API di http://{args.host}:{args.port}/api/fleet")
+    make_server(FleetAPI(dataset), args.host, args.port).serve_forever()
@@ -0,0 +1,202 @@
+import os
+
+import streamlit as st
+
+from notulensi import aging, api, data, export, figures, metrics, outbox, recurrence, search, sheets, sync
+from notulensi.index import FilterIndex
+from notulensi.ingest import CombinedDataset, IncrementalDataset, enable_copy_on_write
+
+# Interval (detik) penarikan data Google Sheet ke snapshot lokal
+SYNC_INTERVAL = 60
+# Interval (detik) pengecekan ulang umur laporan OPEN dan pelanggaran SLA
+AGING_INTERVAL = 300
+# Jumlah maksimum figure Plotly di cache bersama
+FIGURE_CACHE_SIZE = 128
+# Jika diisi (mis. 8502), API JSON read-only dijalankan di proses yang sama
+API_PORT_ENV = 'NOTULENSI_API_PORT'
+API_HOST_ENV = 'NOTULENSI_API_HOST'
+
+
+@st.cache_resource(show_spinner=False)
+def get_dataset():
+    """
+    Satu dataset per proses, dipakai bersama oleh semua sesi: CSV histori
+    ditambah snapshot Google Sheet yang diperbarui oleh sync latar belakang.
+    """
+    enable_copy_on_write()
+    _start_sheet_sync()
+    dataset = CombinedDataset([
+        IncrementalDataset(data.DATA_FILE),
+        IncrementalDataset(sync.SNAPSHOT_FILE),
+    ])
+    _start_api(dataset)
+    return dataset
+
+
+def _start_api(dataset):
+    """API JSON (lihat api.py) di thread latar belakang, memakai dataset bersama yang sama."""
+    port = os.environ.get(API_PORT_ENV)
+    if not port:
+        return None
+    try:
+        return api.start_in_background(dataset, os.environ.get(API_HOST_ENV, api.DEFAULT_HOST), int(port))
+    except (OSError, ValueError):
+        # Port sudah dipakai (mis. proses lain) atau tidak valid: aplikasi tetap jalan tanpa API
+        return None
+
+
+def current_data_version():
+    """
+    Versi data saat ini (hash dari isi semua sumber data). Hanya berubah
+    jika isi file sumber benar-benar berubah, sehingga aman dipakai sebagai
+    kunci cache turunan.
+    """
+    return get_dataset().snapshot().version
+
+
+def load_master_data():
+    """
+    Mengambil data master bersama. Cek mtime/size sangat murah sehingga aman
+    dipanggil setiap rerun; jika file hanya bertambah baris, hanya baris baru
+    yang diparse. Semua sesi berbagi satu salinan data: yang dikembalikan
+    adalah salinan dangkal copy-on-write, bukan salinan per sesi.
+    """
+    return get_dataset().snapshot().frame
+
+
+def load_cube():
+    """Kubus agregat (Vessel, Year, Unit, Status), diperbarui secara inkremental."""
+    return get_dataset().snapshot().cube
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _build_filter_index(data_version, _frame):
+    metrics.cache_miss('filter_index')
+    return FilterIndex(_frame, version=data_version)
+
+
+def load_indexed_data():
+    """Data master beserta FilterIndex-nya (dibangun sekali per versi data)."""
+    snapshot = get_dataset().snapshot()
+    metrics.cache_lookup('filter_index')
+    return snapshot.frame, _build_filter_index(snapshot.version, snapshot.frame)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _build_recurrence(data_version, _frame):
+    metrics.cache_miss('recurrence')
+    with metrics.timer('recurrence.build'):
+        return recurrence.cluster_reports(_frame)
+
+
+def load_recurrence(data_version, frame):
+    """ID klaster laporan berulang untuk data master versi `data_version` (dihitung sekali per versi)."""
+    metrics.cache_lookup('recurrence')
+    return _build_recurrence(data_version, frame)
+
+
+@st.cache_resource(show_spinner=False)
+def get_sheets_client():
+    """Klien Google Sheets per proses; autentikasi baru terjadi saat pertama kali dipakai."""
+    credentials_info = None
+    if not os.environ.get(sheets.BASE_URL_ENV):
+        # Ambil credentials dari secrets Streamlit
+        credentials_info = dict(st.secrets["gcp_service_account"])
+    return sheets.SheetsClient(credentials_info)
+
+
+@st.cache_resource(show_spinner=False)
+def get_outbox():
+    """
+    Outbox bersama: laporan dicatat ke write-ahead log lokal lalu dikirim ke
+    Google Sheet oleh worker latar belakang (digabung, dengan retry).
+    """
+    sheet_sync = _start_sheet_sync()
+    return outbox.OutboxWorker(
+        outbox.WriteAheadLog(),
+        get_sheets_client(),
+        on_sent=sheet_sync.request_pull if sheet_sync else None,
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_sheet_sync():
+    """Sync Google Sheet -> snapshot lokal, berjalan berkala di latar belakang."""
+    sheet_sync = sync.SheetSync(get_sheets_client())
+    sheet_sync.start(SYNC_INTERVAL)
+    return sheet_sync
+
+
+def _start_sheet_sync():
+    try:
+        return get_sheet_sync()
+    except Exception:
+        # Credentials tidak tersedia: halaman analisis cukup membaca CSV lokal
+        return None
+
+
+def get_export(data_version, fmt, year=None, vessels=()):
+    """
+    Path file export (baris mentah sumber) yang dibuat hanya saat diminta,
+    di-cache per versi data dan filter. Yang di-cache hanya path-nya; isi
+    file ditulis per potongan ke disk (lihat export.build_export).
+    """
+    metrics.cache_lookup('export')
+    path = _build_export(data_version, fmt, year, vessels)
+    if not os.path.exists(path):
+        # File terhapus (mis. dibersihkan oleh versi data yang lebih baru): buat ulang
+        _build_export.clear()
+        path = _build_export(data_version, fmt, year, vessels)
+    return path
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _build_export(data_version, fmt, year, vessels):
+    metrics.cache_miss('export')
+    paths = [part.path for part in get_dataset().parts]
+    with metrics.timer('export.build'):
+        return export.build_export(paths, data_version, fmt, year, list(vessels))
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    """Cache figure Plotly (LRU) bersama lintas sesi."""
+    return figures.FigureCache(max_entries=FIGURE_CACHE_SIZE)
+
+
+@st.cache_resource(show_spinner=False)
+def get_search_indexes():
+    """Satu inverted index teks per sumber data, diperbarui saat dipakai."""
+    return [search.SearchIndex() for _ in get_dataset().parts]
+
+
+def search_reports(query, vessels=None, units=None, statuses=None):
+    """Cari laporan berdasarkan teks Permasalahan/Penyelesaian/Keterangan."""
+    with metrics.timer('search'):
+        return search.search_reports(
+            get_dataset(), get_search_indexes(), query, vessels, units, statuses
+        )
+
+
+@st.cache_resource(show_spinner=False)
+def get_aging_scheduler():
+    """Scheduler umur laporan OPEN & SLA, berjalan berkala di latar belakang."""
+    scheduler = aging.AgingScheduler(get_dataset())
+    scheduler.start(AGING_INTERVAL)
+    return scheduler
+
+
+def load_aging_report():
+    """
+    AgingReport terbaru dari scheduler (tanpa perhitungan di rerun). Hanya
+    jika scheduler belum pernah selesai menghitung, perhitungan dilakukan
+    sekali di sini. Jika versi data sudah berubah, scheduler dibangunkan
+    agar menghitung ulang tanpa menunggu interval berikutnya.
+    """
+    scheduler = get_aging_scheduler()
+    report = scheduler.report
+    if report.version is None:
+        report = scheduler.run_once()
+    elif report.version != current_data_version():
+        scheduler.request_run()
+    return report
@@ -0,0 +1,173 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from notulensi import BASE_DIR, COLUMNS
+
+# --- Konfigurasi ---
+DATA_FILE = os.path.join(BASE_DIR, 'notulensi_kerusakan.csv')
+DATE_FORMAT = '%d/%m/%Y'
+# Urutan format yang dicoba: CSV histori memakai DATE_FORMAT, halaman input menulis %Y-%m-%d
+DATE_FORMATS = [DATE_FORMAT, '%Y-%m-%d', '%d-%m-%Y', '%d/%m/%y', '%Y-%m-%d %H:%M:%S']
+TEXT_COLUMNS = ['Permasalahan', 'Penyelesaian', 'Keterangan']
+UNIT_DEFAULT = 'TIDAK DITENTUKAN'
+STATUS_DEFAULT = 'OPEN'
+# Naikkan jika aturan normalize_frame berubah, supaya checkpoint Parquet lama diabaikan
+SCHEMA_VERSION = 2
+
+# Cache hasil parse per string tanggal unik (dipakai lintas pemuatan)
+_DATE_CACHE = {}
+_DATE_CACHE_LIMIT = 100_000
+
+
+def source_signature(path=DATA_FILE):
+    """
+    Tanda tangan murah dari file sumber: (mtime_ns, size, inode), atau None
+    jika file tidak ada. Inode berubah jika file diganti lewat os.replace.
+    """
+    try:
+        st_result = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st_result.st_mtime_ns, st_result.st_size, st_result.st_ino
+
+
+def content_hash(path=DATA_FILE, chunk_size=1 << 16):
+    """Hash SHA-1 isi file sumber, dipakai sebagai versi data."""
+    if not os.path.exists(path):
+        return 'missing'
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_source(path=DATA_FILE):
+    """Membaca CSV mentah. Semua kolom dibaca sebagai teks supaya pembersihan seragam."""
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def clean_code(series):
+    """Upper + strip, string kosong / 'NAN' dianggap tidak ada."""
+    cleaned = series.fillna('').astype(str).str.strip().str.upper()
+    return cleaned.mask(cleaned.isin(['', 'NAN', 'NONE']))
+
+
+def clear_date_cache():
+    """Kosongkan cache parse tanggal (mis. untuk mengukur pemuatan dingin)."""
+    _DATE_CACHE.clear()
+
+
+def parse_dates(series):
+    """
+    Parse kolom tanggal dengan beberapa format (DATE_FORMATS) secara vektor.
+    Hanya string unik yang belum pernah dilihat yang diparse, sehingga
+    biayanya sebanding jumlah tanggal unik, bukan jumlah baris.
+    """
+    codes, uniques = pd.factorize(series.fillna('').astype(str).str.strip())
+    known = {}
+    for u in uniques:
+        value = _DATE_CACHE.get(u)
+        if value is not None:
+            known[u] = value
+    unseen = [u for u in uniques if u not in known]
+    if unseen:
+        remaining = pd.Series(unseen, dtype=object)
+        parsed = pd.Series(pd.NaT, index=remaining.index, dtype='datetime64[ns]')
+        for fmt in DATE_FORMATS:
+            todo = parsed.isna() & (remaining != '')
+            if not todo.any():
+                break
+            parsed[todo] = pd.to_datetime(remaining[todo], format=fmt, errors='coerce')
+        known.update(zip(unseen, parsed))
+        if len(_DATE_CACHE) + len(unseen) > _DATE_CACHE_LIMIT:
+            _DATE_CACHE.clear()
+        _DATE_CACHE.update(zip(unseen, parsed))
+
+    values = pd.DatetimeIndex([known[u] for u in uniques], dtype='datetime64[ns]')
+    return pd.Series(values.take(codes), index=series.index)
+
+
+def normalize_frame(df_raw):
+    """
+    Aturan pembersihan tunggal untuk semua halaman.
+
+    Baris dianggap valid jika memiliki kode kapal dan minimal satu tanggal
+    (Day atau Issued Date) yang bisa diparse. Kolom Vessel/Unit/Status
+    disimpan sebagai categorical, tanggal sebagai datetime64.
+    """
+    df = df_raw.copy()
+    for col in COLUMNS:
+        if col not in df.columns:
+            df[col] = ''
+
+    df['Vessel'] = clean_code(df['Vessel'])
+    df['Unit'] = clean_code(df['Unit']).fillna(UNIT_DEFAULT)
+    df['Status'] = clean_code(df['Status']).fillna(STATUS_DEFAULT)
+
+    for col in ['Day', 'Issued Date', 'Closed Date'] + TEXT_COLUMNS:
+        df[col] = df[col].fillna('').astype(str).str.strip()
+
+    # Konversi tanggal (beberapa format, di-cache per string unik)
+    df['Date_Day'] = parse_dates(df['Day'])
+    df['Date_Issued'] = parse_dates(df['Issued Date'])
+    df['Date_Closed'] = parse_dates(df['Closed Date'])
+
+    # Tanggal acuan untuk filter tahun: Issued Date, fallback ke Day
+    df['Date_Ref'] = df['Date_Issued'].fillna(df['Date_Day'])
+
+    # Hapus baris tanpa kode kapal atau tanpa tanggal sama sekali
+    df = df.dropna(subset=['Vessel', 'Date_Ref']).reset_index(drop=True)
+
+    df['Year'] = df['Date_Ref'].dt.year.astype('int16')
+
+    # Resolution Time (MTTR) dengan hari kalender INKLUSIF (+1)
+    resolution = (df['Date_Closed'] - df['Date_Issued']).dt.days + 1
+    df['Resolution_Time_Days'] = resolution.where(resolution > 0, np.nan).astype('float32')
+
+    for col in ['Vessel', 'Unit', 'Status']:
+        df[col] = df[col].astype('category')
+
+    return df
+
+
+def age_start(frame):
+    """
+    Tanggal mulai umur laporan: Day, atau Issued Date jika Day kosong (sama
+    seperti fallback Date_Ref). Dipakai untuk umur laporan OPEN di semua
+    tampilan: aging/SLA, detail kapal dan timeline Dashboard.
+    """
+    return frame['Date_Day'].fillna(frame['Date_Issued'])
+
+
+def report_keys(frame):
+    """
+    Hash 64-bit identitas laporan per baris: kode kapal, Date_Ref dan teks
+    Permasalahan (huruf besar/kecil dan spasi diabaikan). Kolom yang biasa
+    diubah setelah laporan dibuat (Status, Closed Date, Penyelesaian,
+    Keterangan) tidak ikut, jadi laporan yang ditutup di Google Sheet tetap
+    dikenali sebagai laporan yang sama dengan versi lamanya di CSV histori.
+    """
+    if frame.empty:
+        return np.array([], dtype=np.uint64)
+    keys = pd.DataFrame({
+        'Vessel': frame['Vessel'].astype(str),
+        'Date_Ref': frame['Date_Ref'].astype('datetime64[ns]'),
+        'Permasalahan': frame['Permasalahan'].astype(str).str.lower().str.split().str.join(' '),
+    })
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+def empty_frame():
+    """DataFrame kosong dengan skema yang sama seperti hasil normalize_frame."""
+    return normalize_frame(pd.DataFrame(columns=COLUMNS))
+
+
+def load_dataset(path=DATA_FILE):
+    """Memuat dan menormalisasi data. Mengembalikan frame kosong jika file tidak ada."""
+    if not os.path.exists(path):
+        return empty_frame()
+    return normalize_frame(read_source(path))
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from notulensi import data
+from notulensi.storage import CACHE_DIR
+
+# format -> (label, mime, ekstensi)
+EXPORT_FORMATS = {
+    'csv': ('CSV', 'text/csv', '.csv'),
+    'csv.gz': ('CSV (gzip)', 'application/gzip', '.csv.gz'),
+    'parquet': ('Parquet', 'application/vnd.apache.parquet', '.parquet'),
+}
+# Baris per potongan saat menulis export besar
+CHUNK_ROWS = 50_000
+# File export ditulis ke disk, satu file per versi data, format dan filter
+EXPORT_DIR = os.path.join(CACHE_DIR, 'exports')
+
+
+def raw_report_keys(raw):
+    """data.report_keys untuk baris mentah (kapal dan tanggal dinormalisasi seperti normalize_frame)."""
+    return data.report_keys(pd.DataFrame({
+        'Vessel': data.clean_code(raw['Vessel']),
+        'Date_Ref': data.parse_dates(raw['Issued Date']).fillna(data.parse_dates(raw['Day'])),
+        'Permasalahan': raw['Permasalahan'],
+    }))
+
+
+def read_raw_sources(paths):
+    """
+    Baris mentah semua sumber (CSV histori, lalu snapshot Sheet) dengan kolom
+    COLUMNS apa adanya sebagai teks, termasuk baris yang dibuang analitik.
+    Seperti CombinedDataset, baris yang laporannya ada di sumber setelahnya
+    dibuang, sehingga versi sheet yang dipakai.
+    """
+    frames = []
+    later = None
+    for path in reversed(paths):
+        if not os.path.exists(path):
+            continue
+        raw = data.read_source(path).reindex(columns=data.COLUMNS, fill_value='')
+        keys = raw_report_keys(raw)
+        if later is None:
+            later = keys
+        else:
+            shadowed = np.isin(keys, later)
+            raw, later = raw[~shadowed], np.concatenate([later, keys])
+        frames.append(raw)
+    if not frames:
+        return pd.DataFrame(columns=data.COLUMNS, dtype=str)
+    return pd.concat(frames[::-1], ignore_index=True)
+
+
+def export_frame(raw, year=None, vessels=None):
+    """
+    Subset baris mentah untuk export (tanpa menyalin jika tidak ada filter).
+    Tahun dan kapal dicocokkan dengan aturan normalize_frame, tetapi nilai
+    kolom yang diexport tidak diubah.
+    """
+    mask = None
+    if year is not None:
+        ref = data.parse_dates(raw['Issued Date']).fillna(data.parse_dates(raw['Day']))
+        mask = (ref.dt.year == int(year)).to_numpy()
+    if vessels:
+        vessel_mask = data.clean_code(raw['Vessel']).isin(vessels).to_numpy()
+        mask = vessel_mask if mask is None else mask & vessel_mask
+    return raw if mask is None else raw[mask]
+
+
+def iter_export_chunks(df, fmt, chunk_rows=CHUNK_ROWS):
+    """
+    Hasilkan isi file CSV / CSV gzip sebagai potongan bytes, per `chunk_rows`
+    baris, sehingga teks seluruh data tidak pernah dibentuk sekaligus.
+    """
+    compressor = zlib.compressobj(wbits=31) if fmt == 'csv.gz' else None  # wbits=31: format gzip
+
+    def emit(text):
+        raw = text.encode('utf-8')
+        return compressor.compress(raw) if compressor else raw
+
+    yield emit(','.join(data.COLUMNS) + '\n')
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows][data.COLUMNS].to_csv(header=False, index=False)
+        out = emit(chunk)
+        if out:
+            yield out
+    if compressor:
+        yield compressor.flush()
+
+
+def _write_parquet(df, path, chunk_rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(col, pa.string()) for col in data.COLUMNS])
+    with pq.ParquetWriter(path, schema) as writer:
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows][data.COLUMNS]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_export(df, fmt, path, chunk_rows=CHUNK_ROWS):
+    """Tulis file export ke `path` per potongan (ditimpa atomik)."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format export tidak dikenal: {fmt}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    if fmt == 'parquet':
+        _write_parquet(df, tmp_path, chunk_rows)
+    else:
+        with open(tmp_path, 'wb') as f:
+            for chunk in iter_export_chunks(df, fmt, chunk_rows):
+                f.write(chunk)
+    os.replace(tmp_path, path)
+    return path
+
+
+def export_path(data_version, fmt, year=None, vessels=None, directory=EXPORT_DIR):
+    key = repr((fmt, year, sorted(vessels or [])))
+    name = f'{str(data_version)[:16]}_{hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]}'
+    return os.path.join(directory, name + EXPORT_FORMATS[fmt][2])
+
+
+def build_export(paths, data_version, fmt='csv', year=None, vessels=None, directory=EXPORT_DIR):
+    """
+    Buat file export dari sumber mentah `paths` untuk format dan filter
+    tertentu, lalu kembalikan path-nya. File export versi data lain dihapus.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Format export tidak dikenal: {fmt}")
+    path = export_path(data_version, fmt, year, vessels, directory)
+    write_export(export_frame(read_raw_sources(paths), year, vessels), fmt, path)
+    prefix = os.path.basename(path).split('_', 1)[0] + '_'
+    for name in os.listdir(directory):
+        if not name.startswith(prefix) and not name.endswith('.tmp'):
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+    return path
+
+
+def export_filename(fmt, year=None, vessels=None):
+    parts = ['notulensi_kerusakan']
+    if year is not None:
+        parts.append(str(year))
+    if vessels:
+        parts.append('-'.join(sorted(vessels)) if len(vessels) <= 3 else f'{len(vessels)}kapal')
+    return '_'.join(parts) + EXPORT_FORMATS[fmt][2]
@@ -0,0 +1,75 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from notulensi import metrics
+
+
+def vessel_set_hash(vessels):
+    """Hash pendek dan stabil untuk sekumpulan kode kapal (urutan tidak berpengaruh)."""
+    joined = '\x1f'.join(sorted(str(v) for v in vessels))
+    return hashlib.sha1(joined.encode('utf-8')).hexdigest()[:16]
+
+
+def figure_key(data_version, year, vessels, chart_id):
+    return (data_version, str(year), vessel_set_hash(vessels), chart_id)
+
+
+class FigureCache:
+    """
+    Cache figure Plotly LRU berukuran tetap yang dipakai bersama oleh semua
+    sesi. Jika beberapa sesi meminta figure yang sama bersamaan, figure hanya
+    dibuat sekali; sesi lain menunggu hasilnya.
+
+    Yang disimpan adalah objek go.Figure, bukan JSON-nya: st.plotly_chart
+    selalu memvalidasi dan men-serialisasi ulang figure yang diberikan
+    (termasuk dict/JSON), dan tidak ada API publik untuk mengirim spec yang
+    sudah jadi. Cache hit menghemat pembuatan figure plotly.express (sekitar
+    60 ms per chart dashboard), sedangkan validasi + to_json di setiap rerun
+    (sekitar 6-7 ms per chart) tetap dibayar.
+
+    Figure yang dikembalikan dipakai bersama, jadi JANGAN dimodifikasi.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._building = {}
+
+    def get_or_build(self, key, build):
+        metrics.cache_lookup('figure')
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            key_lock = self._building.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    return self._entries[key]
+            metrics.cache_miss('figure')
+            try:
+                with metrics.timer('figure.build'):
+                    figure = build()
+            except BaseException:
+                with self._lock:
+                    self._building.pop(key, None)
+                raise
+            # Simpan entri dan lepas lock pembuatan sekaligus, supaya permintaan
+            # berikutnya selalu menemukan salah satunya
+            with self._lock:
+                self._entries[key] = figure
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                self._building.pop(key, None)
+            return figure
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,97 @@
+import argparse
+import re
+import subprocess
+import sys
+
+# Laporan waktu impor: setiap modul diimpor di proses Python baru dengan
+# `-X importtime`, sehingga hasilnya mencerminkan cold start.
+
+DEFAULT_MODULES = [
+    'streamlit', 'numpy', 'pandas', 'pyarrow', 'plotly.express',
+    'gspread', 'google.oauth2.service_account',
+    'notulensi.data', 'notulensi.cache',
+]
+_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def _parse(stderr):
+    """
+    [(nama, kumulatif detik, [(nama, kumulatif detik)] anak langsung)] impor
+    tingkat atas dari output `-X importtime`. Baris anak dicetak sebelum
+    induknya, dengan indentasi dua spasi per tingkat.
+    """
+    roots = []
+    children = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        depth = (len(match.group(3)) - 1) // 2
+        entry = (match.group(4), int(match.group(2)) / 1e6)
+        if depth == 0:
+            roots.append(entry + (children,))
+            children = []
+        elif depth == 1:
+            children.append(entry)
+    return roots
+
+
+def _root_imports(code):
+    """(returncode, impor tingkat atas (lihat _parse), stderr) dari `python -X importtime -c code`."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True,
+    )
+    return result.returncode, _parse(result.stderr), result.stderr
+
+
+def breakdown(roots, startup=(), top=5):
+    """
+    (total detik, [(nama, kumulatif detik)] impor terberat) dari hasil _parse.
+    Impor bawaan interpreter (`startup`) tidak dihitung. Rincian memakai impor
+    tingkat kedua, karena impor tingkat atas biasanya hanya modul itu sendiri;
+    impor tingkat atas tanpa anak ditampilkan apa adanya.
+    """
+    roots = [root for root in roots if root[0] not in startup]
+    total = sum(seconds for _, seconds, _ in roots)
+    detail = []
+    for name, seconds, children in roots:
+        detail.extend(children or [(name, seconds)])
+    return total, sorted(detail, key=lambda item: -item[1])[:top]
+
+
+def measure(module, top=5, startup=None):
+    """
+    (total detik, [(nama, kumulatif detik)] impor terberat) untuk satu modul,
+    atau (None, pesan error) jika gagal diimpor. Impor bawaan interpreter
+    (`startup`, mis. site/encodings) tidak dihitung.
+    """
+    if startup is None:
+        startup = {name for name, _, _ in _root_imports('pass')[1]}
+    returncode, roots, stderr = _root_imports(f'import {module}')
+    if returncode != 0:
+        return None, stderr.strip().splitlines()[-1:]
+    return breakdown(roots, startup, top)
+
+
+def report(modules=DEFAULT_MODULES, top=5):
+    startup = {name for name, _, _ in _root_imports('pass')[1]}
+    lines = []
+    for module in modules:
+        total, detail = measure(module, top, startup)
+        if total is None:
+            lines.append(f'{module:<32} gagal: {" ".join(detail)}')
+            continue
+        lines.append(f'{module:<32} {total * 1000:9.1f} ms')
+        for name, seconds in detail:
+            lines.append(f'    {name:<28} {seconds * 1000:9.1f} ms')
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    # python -m notulensi.importtime [modul ...] [--top N]
+    parser = argparse.ArgumentParser(description="Waktu impor (cold start) per modul.")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--top', type=int, default=5)
+    args = parser.parse_args()
+    print(report(args.modules, args.top))
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+# Kolom yang diberi indeks posisi baris
+INDEX_COLUMNS = ['Year', 'Vessel', 'Unit', 'Status']
+_EMPTY = np.array([], dtype=np.intp)
+
+
+def _key(value):
+    return value.item() if hasattr(value, 'item') else value
+
+
+def group_positions(series):
+    """
+    Posisi baris (terurut) untuk setiap nilai unik di `series`, sebagai
+    potongan (view) dari satu array hasil argsort. Nilai kosong diabaikan.
+    """
+    codes, uniques = pd.factorize(series, sort=True)
+    order = np.argsort(codes, kind='stable')
+    valid = codes >= 0
+    order = order[len(codes) - int(valid.sum()):]  # kode -1 (kosong) ada di depan
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(codes[valid], minlength=len(uniques)))])
+    return {_key(u): order[bounds[i]:bounds[i + 1]] for i, u in enumerate(uniques)}
+
+
+class FilterIndex:
+    """
+    Indeks posisi baris per Year, Vessel, Unit dan Status untuk satu versi
+    data. Kombinasi filter apa pun diselesaikan dengan menggabung/mengiris
+    array posisi, tanpa memindai atau menyalin seluruh frame.
+    """
+
+    def __init__(self, df, version=None):
+        self.version = version
+        self.n_rows = len(df)
+        self._positions = {col: group_positions(df[col]) for col in INDEX_COLUMNS}
+
+    def values(self, column):
+        """Nilai unik (terurut) yang ada di kolom terindeks."""
+        return sorted(self._positions[column])
+
+    def group(self, column, value):
+        """
+        Posisi baris untuk satu nilai, mis. satu kapal. Baris sudah
+        dipartisi per nilai saat indeks dibangun, jadi ini hanya potongan
+        (rentang) dari array posisi: biayanya sebanding jumlah baris grup.
+        """
+        return self._positions[column].get(value, _EMPTY)
+
+    def rows(self, df, column, value):
+        """Subset `df` untuk satu nilai `column` (tanpa memindai seluruh frame)."""
+        return df.take(self.group(column, value))
+
+    def positions(self, column, values):
+        """Posisi baris (terurut) yang nilai `column`-nya ada di `values`, atau None jika tidak membatasi."""
+        groups = self._positions[column]
+        parts = [groups[v] for v in set(values) if v in groups]
+        if len(parts) == len(groups) and len(groups) > 0:
+            return None
+        if not parts:
+            return _EMPTY
+        return parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+
+    def select(self, **filters):
+        """
+        Posisi baris yang lolos semua filter (mis. Year=[2025], Vessel=['ND']).
+        Filter bernilai None diabaikan. Mengembalikan None jika tidak ada
+        filter yang membatasi (semua baris).
+        """
+        selections = []
+        for column, values in filters.items():
+            if values is None:
+                continue
+            positions = self.positions(column, values)
+            if positions is not None:
+                selections.append(positions)
+        if not selections:
+            return None
+
+        # Mulai dari himpunan terkecil supaya irisan tetap murah
+        selections.sort(key=len)
+        result = selections[0]
+        for positions in selections[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, positions, assume_unique=True)
+        return result
+
+    def query(self, df, year=None, vessels=None, units=None, statuses=None):
+        """
+        Subset `df` untuk filter Dashboard. Tahun 'All'/None berarti semua
+        tahun; daftar kapal kosong berarti tidak ada kapal. Tanpa filter yang
+        membatasi, `df` dikembalikan apa adanya (tanpa salinan).
+        """
+        positions = self.select(
+            Year=None if not year or year == 'All' else [int(year)],
+            Vessel=vessels,
+            Unit=units,
+            Status=statuses,
+        )
+        return df if positions is None else df.take(positions)
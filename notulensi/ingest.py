@@ -0,0 +1,408 @@
+import hashlib
+import io
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from notulensi import data, metrics, storage
+from notulensi.aggregates import build_cube, merge_cube, subtract_cube
+
+# Jumlah byte sebelum offset terakhir yang dicek untuk memastikan file hanya ditambah (append)
+FINGERPRINT_SIZE = 4096
+
+# generation: naik setiap kali frame dibangun ulang (bukan sekadar ditambah
+# baris di akhir); None jika posisi baris tidak dijamin stabil antar versi.
+DataSnapshot = namedtuple('DataSnapshot', ['frame', 'cube', 'version', 'generation'])
+_NO_KEYS = np.array([], dtype=np.uint64)
+
+
+def enable_copy_on_write():
+    """
+    Pastikan pandas memakai copy-on-write, supaya frame bersama bisa dibagikan
+    sebagai salinan dangkal: modifikasi oleh pemanggil menyalin data yang
+    disentuh lebih dulu, sehingga data bersama tidak pernah berubah. Sejak
+    pandas 3 perilaku ini selalu aktif (opsinya usang), jadi opsi hanya
+    diset di pandas 2.x. Dipanggil sekali oleh aplikasi yang membagi dataset
+    lintas sesi, bukan saat modul ini diimpor.
+    """
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return
+    try:
+        pd.set_option('mode.copy_on_write', True)
+    except KeyError:
+        # pandas lama tanpa copy-on-write: pemanggil tetap tidak boleh memodifikasi frame
+        pass
+
+
+def record_end(raw, complete=False):
+    """
+    Panjang bagian awal `raw` yang terdiri dari rekaman CSV utuh. Baris baru
+    di dalam field bertanda kutip bukan akhir rekaman, jadi rekaman yang
+    sedang ditulis (mis. teks multi-baris dari form) tidak terbaca setengah.
+    Dengan `complete`, rekaman terakhir tanpa baris baru ikut dihitung
+    asalkan tanda kutipnya tertutup.
+    """
+    buffer = np.frombuffer(raw, dtype=np.uint8)
+    quotes = np.cumsum(buffer == ord('"'))
+    if complete and (not len(quotes) or quotes[-1] % 2 == 0):
+        return len(raw)
+    newlines = np.flatnonzero(buffer == ord('\n'))
+    boundaries = newlines[quotes[newlines] % 2 == 0]
+    return int(boundaries[-1]) + 1 if len(boundaries) else 0
+
+
+def concat_frames(frames):
+    """Gabung frame hasil normalize_frame tanpa kehilangan tipe categorical."""
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return data.empty_frame()
+    if len(frames) == 1:
+        return frames[0]
+    merged = pd.concat(frames, ignore_index=True)
+    for col in ['Vessel', 'Unit', 'Status']:
+        merged[col] = pd.api.types.union_categoricals(
+            [f[col] for f in frames], ignore_order=True
+        )
+    return merged
+
+
+class _PublishedDataset:
+    """
+    Dasar dataset yang dibagi lintas sesi. Pembaca hanya melihat snapshot
+    (frame, cube, version) yang dipublikasikan utuh dalam satu penugasan
+    referensi, jadi tidak pernah melihat data yang setengah diperbarui.
+    """
+
+    _snapshot = None
+    generation = None
+
+    def _publish(self):
+        if self._snapshot is None or self._snapshot.version != self.version:
+            self._snapshot = DataSnapshot(self.frame, self.cube, self.version, self.generation)
+
+    def snapshot(self):
+        """
+        Snapshot terbaru setelah refresh. Jika sesi lain sedang memuat data
+        baru, snapshot sebelumnya langsung dikembalikan tanpa menunggu; hanya
+        pemuatan pertama yang ditunggu. Frame dan kubus diberikan sebagai
+        salinan dangkal (copy-on-write) sehingga aman dipakai per sesi.
+        """
+        if self._lock.acquire(blocking=self._snapshot is None):
+            try:
+                self.refresh()
+            finally:
+                self._lock.release()
+        current = self._snapshot
+        return current._replace(frame=current.frame.copy(deep=False), cube=current.cube.copy(deep=False))
+
+
+class IncrementalDataset(_PublishedDataset):
+    """
+    Data master yang dimuat secara inkremental dari CSV append-only.
+
+    Menyimpan offset byte terakhir yang sudah diproses. Jika file hanya
+    bertambah di akhir, hanya baris baru yang diparse lalu digabung ke data
+    yang ada, dan kubus agregat (lihat aggregates.py) diperbarui dengan delta.
+    Jika file ditulis ulang (baris lama diubah/dihapus, atau file diganti
+    sehingga inode-nya berubah), data dimuat penuh.
+
+    Setelah pemuatan penuh, hasilnya disimpan sebagai checkpoint Parquet
+    (lihat storage.py). Saat cold start, checkpoint yang masih cocok dengan
+    awal file dipakai langsung dan hanya sisa baris setelahnya yang diparse.
+
+    Frame yang sudah diberikan ke pemanggil tidak pernah dimodifikasi;
+    setiap perubahan menghasilkan objek frame baru yang dipublikasikan
+    secara atomik (lihat _PublishedDataset).
+    """
+
+    def __init__(self, path=data.DATA_FILE):
+        self.path = path
+        self._lock = threading.RLock()
+        self.generation = 0
+        self._reset()
+
+    def _reset(self):
+        self.generation += 1
+        self.frame = data.empty_frame()
+        self.cube = build_cube(self.frame)
+        self.offset = 0
+        self.header = b''
+        self.signature = None
+        self._digest = hashlib.sha1()
+        self._fingerprint = b''
+
+    @property
+    def version(self):
+        """Hash SHA-1 dari byte yang sudah diproses."""
+        return self._digest.hexdigest()
+
+    def refresh(self):
+        """Sinkronkan dengan file sumber. Aman dipanggil setiap rerun."""
+        with self._lock:
+            self._sync()
+            self._publish()
+            return self.frame
+
+    def _sync(self):
+        signature = data.source_signature(self.path)
+        if signature == self.signature:
+            return
+        if signature is None:
+            self._reset()
+            return
+
+        size = signature[1]
+        # File diganti (mis. SheetSync menulis ulang lewat os.replace): bisa saja
+        # baris lama berubah di luar fingerprint, jadi jangan anggap append
+        replaced = self.signature is not None and signature[2] != self.signature[2]
+        if self.offset == 0 or replaced or size < self.offset or not self._prefix_unchanged():
+            self._full_load()
+        elif size == self.offset:
+            # mtime berubah tanpa pertambahan ukuran: pastikan isinya memang sama
+            if data.content_hash(self.path) != self.version:
+                self._full_load()
+        elif not self._fingerprint.endswith(b'\n'):
+            # Rekaman terakhir dibaca tanpa baris baru: byte baru bisa jadi lanjutannya
+            self._full_load()
+        else:
+            self._append_tail()
+        self.signature = signature
+
+    def _prefix_unchanged(self):
+        start = max(0, self.offset - FINGERPRINT_SIZE)
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            current = f.read(self.offset - start)
+        return current == self._fingerprint
+
+    def _advance(self, raw):
+        """Catat `raw` (rekaman CSV utuh) sebagai sudah diproses: offset, hash dan fingerprint."""
+        self.offset += len(raw)
+        self._digest.update(raw)
+        self._fingerprint = (self._fingerprint + raw)[-FINGERPRINT_SIZE:]
+
+    def _parse(self, raw):
+        return data.normalize_frame(
+            pd.read_csv(io.BytesIO(raw), dtype=str, keep_default_na=False)
+        )
+
+    def _full_load(self):
+        """
+        Muat ulang seluruh file. State baru (offset, hash, frame) hanya
+        disimpan setelah parse berhasil; jika gagal, dataset tetap kosong
+        dengan offset 0 sehingga refresh berikutnya kembali memuat penuh.
+        """
+        metrics.count('dataset.full_load')
+        self._reset()
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        if not raw:
+            return
+        header = raw[:raw.find(b'\n') + 1]
+        end = record_end(raw, complete=True)
+
+        checkpoint = self._load_checkpoint(raw, end)
+        if checkpoint is not None:
+            frame, offset = checkpoint
+            tail = raw[offset:end]
+            if tail.strip():
+                frame = concat_frames([frame, self._parse(header + tail)])
+        else:
+            frame = self._parse(raw[:end])
+
+        self.header = header
+        self._advance(raw[:end])
+        self.frame = frame
+        self.cube = build_cube(frame)
+        if checkpoint is None and self._fingerprint.endswith(b'\n'):
+            # Rekaman terakhir tanpa baris baru mungkin belum selesai: jangan dijadikan checkpoint
+            self._save_checkpoint()
+
+    def _load_checkpoint(self, raw, end):
+        """Frame dari checkpoint Parquet jika masih cocok dengan awal `raw[:end]`, beserta offset-nya."""
+        if not storage.parquet_available():
+            return None
+        path = storage.parquet_path_for(self.path)
+        source_hash, offset = storage.parquet_checkpoint(path)
+        if source_hash is None or offset > end:
+            return None
+        if hashlib.sha1(raw[:offset]).hexdigest() != source_hash:
+            return None
+        try:
+            return storage.read_parquet(path), offset
+        except (OSError, ValueError):
+            return None
+
+    def _save_checkpoint(self):
+        if not storage.parquet_available():
+            return
+        try:
+            storage.write_parquet(self.frame, storage.parquet_path_for(self.path), self.version, self.offset)
+        except (OSError, ValueError):
+            # Checkpoint hanya mempercepat cold start; gagal menulis tidak fatal
+            pass
+
+    def _append_tail(self):
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read()
+        raw = chunk[:record_end(chunk)]
+        if not raw.strip():
+            self._advance(raw)
+            return
+        metrics.count('dataset.append')
+        try:
+            new_rows = self._parse(self.header + raw)
+        except ValueError:
+            # Baris baru tidak bisa diparse: jangan lompati, muat penuh di refresh berikutnya
+            self._reset()
+            raise
+        self._advance(raw)
+        self.frame = concat_frames([self.frame, new_rows])
+        self.cube = merge_cube(self.cube, build_cube(new_rows))
+
+
+class CombinedDataset(_PublishedDataset):
+    """
+    Gabungan beberapa IncrementalDataset (mis. CSV histori + snapshot Google
+    Sheet) dengan antarmuka yang sama. Frame gabungan hanya dibentuk ulang
+    jika salah satu sumber berubah; kubus digabung dari kubus tiap sumber.
+
+    Sumber diurutkan dari cadangan ke utama. CSV histori adalah export lama
+    dari Google Sheet yang sama, jadi snapshot sheet yang menjadi acuan:
+    baris sumber lebih awal dibuang jika laporan yang sama (data.report_keys)
+    ada di sumber setelahnya, walaupun isinya sudah berubah (mis. OPEN ->
+    CLOSED). CSV hanya mengisi laporan yang tidak ada di sheet, atau semua
+    laporan jika snapshot belum ada.
+
+    Jika hanya sumber terakhir yang bertambah baris (laporan baru masuk ke
+    sheet), hanya baris baru yang di-hash dan kubus diperbarui dengan delta:
+    ditambah kubus baris baru, dikurangi kubus baris sumber lain yang baru
+    tergantikan olehnya.
+    """
+
+    def __init__(self, parts):
+        self.parts = list(parts)
+        self._lock = threading.RLock()
+        self._part_versions = None
+        # Per sumber: (generation, jumlah baris, report_keys) dari snapshot terakhir
+        self._part_keys = [None] * len(self.parts)
+        # Per sumber: report_keys semua sumber setelahnya, dan mask baris yang tergantikan
+        self._superseding = [_NO_KEYS] * len(self.parts)
+        self._shadowed = [None] * len(self.parts)
+        self.frame = data.empty_frame()
+        self.cube = build_cube(self.frame)
+        self.version = hashlib.sha1().hexdigest()
+
+    def refresh(self):
+        with self._lock:
+            snapshots = [part.snapshot() for part in self.parts]
+            part_versions = tuple(snapshot.version for snapshot in snapshots)
+            if part_versions != self._part_versions:
+                if not self._append_last(snapshots):
+                    self._combine(snapshots)
+                self.version = hashlib.sha1('|'.join(part_versions).encode()).hexdigest()
+                self._part_versions = part_versions
+            self._publish()
+            return self.frame
+
+    def _keys(self, i, snapshot):
+        """
+        report_keys sumber ke-i. Jika sumber hanya bertambah baris sejak
+        dihitung terakhir (generation sama), hanya baris baru yang di-hash.
+        """
+        cached = self._part_keys[i]
+        n_rows = len(snapshot.frame)
+        appended = (
+            cached is not None and snapshot.generation is not None
+            and cached[0] == snapshot.generation and cached[1] <= n_rows
+        )
+        if appended:
+            keys = cached[2]
+            if cached[1] < n_rows:
+                keys = np.concatenate([keys, data.report_keys(snapshot.frame.iloc[cached[1]:])])
+        else:
+            keys = data.report_keys(snapshot.frame)
+        self._part_keys[i] = (snapshot.generation, n_rows, keys)
+        return keys
+
+    def superseded(self, i, frame):
+        """Mask baris `frame` (dari sumber ke-i) yang laporannya ada di sumber setelahnya."""
+        later = self._superseding[i]
+        if not len(later) or frame.empty:
+            return np.zeros(len(frame), dtype=bool)
+        return np.isin(data.report_keys(frame), later)
+
+    def _kept(self, i, snapshot):
+        shadowed = self._shadowed[i]
+        return snapshot.frame if shadowed is None else snapshot.frame[~shadowed]
+
+    def _append_last(self, snapshots):
+        """
+        Perbarui gabungan dengan delta jika hanya sumber terakhir yang
+        bertambah baris. Mengembalikan False jika perlu digabung ulang penuh.
+        """
+        if self._part_versions is None:
+            return False
+        *earlier, last = snapshots
+        if any(s.version != v for s, v in zip(earlier, self._part_versions)):
+            return False
+        cached = self._part_keys[-1]
+        if cached is None or last.generation is None or cached[0] != last.generation or cached[1] > len(last.frame):
+            return False
+
+        start = cached[1]
+        new_rows = last.frame.iloc[start:]
+        new_keys = self._keys(len(snapshots) - 1, last)[start:]
+        metrics.count('dataset.combined_append')
+
+        removed = []
+        superseding = list(self._superseding)
+        for i, snapshot in enumerate(earlier):
+            superseding[i] = np.concatenate([superseding[i], new_keys])
+            if not len(new_keys):
+                continue
+            newly = np.isin(self._keys(i, snapshot), new_keys)
+            if self._shadowed[i] is not None:
+                newly &= ~self._shadowed[i]
+            if newly.any():
+                removed.append(snapshot.frame[newly])
+                self._shadowed[i] = newly if self._shadowed[i] is None else self._shadowed[i] | newly
+
+        cube = self.cube
+        if removed:
+            # Laporan lama yang kini ada di sheet: keluarkan dari frame dan kubus
+            cube = subtract_cube(cube, build_cube(concat_frames(removed)))
+            self.frame = concat_frames([self._kept(i, s) for i, s in enumerate(earlier)] + [last.frame])
+        else:
+            self.frame = concat_frames([self.frame, new_rows])
+        self.cube = merge_cube(cube, build_cube(new_rows))
+        self._superseding = superseding
+        return True
+
+    def _combine(self, snapshots):
+        parts = [None] * len(snapshots)
+        superseding = [_NO_KEYS] * len(snapshots)
+        later = _NO_KEYS
+        for i in reversed(range(len(snapshots))):
+            snapshot = snapshots[i]
+            keys = self._keys(i, snapshot)
+            superseding[i] = later
+            shadowed = np.isin(keys, later) if len(later) else None
+            if shadowed is not None and shadowed.any():
+                self._shadowed[i] = shadowed
+                rows = snapshot.frame[~shadowed]
+                parts[i] = (rows, build_cube(rows))
+            else:
+                self._shadowed[i] = None
+                parts[i] = (snapshot.frame, snapshot.cube)
+            later = np.concatenate([later, keys])
+
+        cube = parts[0][1]
+        for _, part_cube in parts[1:]:
+            cube = merge_cube(cube, part_cube)
+        self.frame = concat_frames([frame for frame, _ in parts])
+        self.cube = cube
+        self._superseding = superseding
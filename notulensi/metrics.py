@@ -0,0 +1,227 @@
+import csv
+import io
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+from notulensi import BASE_DIR
+
+# Lokasi log metrik lokal (JSON Lines + CSV)
+LOG_DIR = os.path.join(BASE_DIR, 'logs')
+# Jika diisi (path file .jsonl), setiap rerun otomatis ditambahkan ke log
+LOG_ENV = 'NOTULENSI_METRICS_LOG'
+# Jumlah rerun terakhir yang disimpan di memori
+HISTORY_SIZE = 500
+
+_local = threading.local()
+# Mencegah satu trace ditutup dua kali (thread rerun lama vs rerun baru)
+_finish_lock = threading.Lock()
+
+
+class RerunTrace:
+    """Waktu per tahap (ms) dan counter untuk satu rerun halaman."""
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.time()
+        self.total_ms = None
+        self.interrupted = False
+        self.stages = defaultdict(float)
+        self.counters = defaultdict(int)
+        self._t0 = time.perf_counter()
+        self._last_activity = self._t0
+
+    def touch(self):
+        self._last_activity = time.perf_counter()
+
+    def finish(self, interrupted=False):
+        """
+        Tutup trace. Rerun yang terputus (st.stop/st.rerun/st.switch_page)
+        baru ditutup saat rerun berikutnya dimulai, jadi durasinya dihitung
+        sampai aktivitas tercatat terakhir.
+        """
+        end = self._last_activity if interrupted else time.perf_counter()
+        self.total_ms = (end - self._t0) * 1000
+        self.interrupted = interrupted
+
+    def as_record(self):
+        return {
+            'page': self.page,
+            'ts': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+            'total_ms': round(self.total_ms or 0.0, 3),
+            'interrupted': self.interrupted,
+            'stages': {k: round(v, 3) for k, v in self.stages.items()},
+            'counters': dict(self.counters),
+        }
+
+
+class Metrics:
+    """
+    Registry metrik per proses: total waktu per tahap, counter (termasuk
+    lookup/miss cache) dan riwayat rerun terakhir. Dipakai bersama oleh semua
+    sesi dan thread latar belakang (outbox, sync Google Sheet).
+    """
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        self._lock = threading.Lock()
+        self.history = deque(maxlen=history_size)
+        self.stage_totals = defaultdict(lambda: [0, 0.0])  # tahap -> [jumlah, total ms]
+        self.counters = defaultdict(int)
+
+    def record_stage(self, stage, ms):
+        with self._lock:
+            totals = self.stage_totals[stage]
+            totals[0] += 1
+            totals[1] += ms
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] += n
+
+    def add_trace(self, trace):
+        with self._lock:
+            self.history.append(trace.as_record())
+
+    def stage_summary(self):
+        """Daftar dict per tahap: jumlah panggilan, total dan rata-rata ms."""
+        with self._lock:
+            items = sorted(self.stage_totals.items())
+        return [
+            {'stage': stage, 'calls': calls, 'total_ms': round(total, 3), 'mean_ms': round(total / calls, 3)}
+            for stage, (calls, total) in items
+        ]
+
+    def cache_stats(self):
+        """Hit rate per cache dari counter `cache.<nama>.lookup` dan `cache.<nama>.miss`."""
+        with self._lock:
+            counters = dict(self.counters)
+        stats = []
+        for name in sorted(k[len('cache.'):-len('.lookup')] for k in counters
+                           if k.startswith('cache.') and k.endswith('.lookup')):
+            lookups = counters[f'cache.{name}.lookup']
+            misses = min(counters.get(f'cache.{name}.miss', 0), lookups)
+            stats.append({
+                'cache': name, 'lookups': lookups, 'misses': misses,
+                'hit_rate': round((lookups - misses) / lookups, 4) if lookups else None,
+            })
+        return stats
+
+    def recent(self, page=None, limit=None):
+        with self._lock:
+            records = [r for r in self.history if page is None or r['page'] == page]
+        return records[-limit:] if limit else records
+
+    def export_json(self):
+        payload = {
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'stages': self.stage_summary(),
+            'caches': self.cache_stats(),
+            'counters': dict(self.counters),
+            'reruns': self.recent(),
+        }
+        return json.dumps(payload, ensure_ascii=False, indent=2).encode('utf-8')
+
+    def export_csv(self):
+        """Satu baris per (rerun, tahap), cocok untuk dibuka di spreadsheet."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(['ts', 'page', 'total_ms', 'stage', 'stage_ms'])
+        for record in self.recent():
+            for stage, ms in record['stages'].items() or [('', '')]:
+                writer.writerow([record['ts'], record['page'], record['total_ms'], stage, ms])
+        return buffer.getvalue().encode('utf-8')
+
+    def write_log(self, directory=LOG_DIR):
+        """Simpan snapshot metrik ke `directory` sebagai JSON dan CSV; kembalikan path keduanya."""
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        paths = []
+        for ext, content in (('json', self.export_json()), ('csv', self.export_csv())):
+            path = os.path.join(directory, f'metrics_{stamp}.{ext}')
+            with open(path, 'wb') as f:
+                f.write(content)
+            paths.append(path)
+        return paths
+
+    def reset(self):
+        with self._lock:
+            self.history.clear()
+            self.stage_totals.clear()
+            self.counters.clear()
+
+
+REGISTRY = Metrics()
+
+
+def start_trace(page):
+    """Mulai mencatat rerun halaman `page` pada thread ini."""
+    trace = RerunTrace(page)
+    _local.trace = trace
+    return trace
+
+
+def current_trace():
+    return getattr(_local, 'trace', None)
+
+
+def finish_trace(trace=None, interrupted=False):
+    """
+    Tutup `trace` (default: trace aktif thread ini), simpan ke riwayat (dan ke
+    log jika LOG_ENV diisi). Mengembalikan None jika trace sudah ditutup.
+    """
+    if trace is None:
+        trace = current_trace()
+        if trace is None:
+            return None
+        _local.trace = None
+    with _finish_lock:
+        if trace.total_ms is not None:
+            return None
+        trace.finish(interrupted)
+    REGISTRY.add_trace(trace)
+    log_path = os.environ.get(LOG_ENV)
+    if log_path:
+        try:
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(trace.as_record(), ensure_ascii=False) + '\n')
+        except OSError:
+            # Log metrik hanya pelengkap; gagal menulis tidak boleh mengganggu halaman
+            pass
+    return trace
+
+
+@contextmanager
+def timer(stage):
+    """Ukur waktu blok kode sebagai tahap `stage` (mis. 'load', 'sheets.append_rows')."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - t0) * 1000
+        REGISTRY.record_stage(stage, ms)
+        trace = current_trace()
+        if trace is not None:
+            trace.stages[stage] += ms
+            trace.touch()
+
+
+def count(name, n=1):
+    REGISTRY.count(name, n)
+    trace = current_trace()
+    if trace is not None:
+        trace.counters[name] += n
+        trace.touch()
+
+
+def cache_lookup(name):
+    """Catat satu permintaan ke cache `name`."""
+    count(f'cache.{name}.lookup')
+
+
+def cache_miss(name):
+    """Catat bahwa cache `name` harus membangun nilainya (dipanggil dari badan fungsi yang di-cache)."""
+    count(f'cache.{name}.miss')
@@ -0,0 +1,81 @@
+import os
+
+import streamlit as st
+
+from notulensi import metrics
+
+# Daftar ID pengguna (dipisah koma) yang boleh melihat panel metrik
+ADMIN_USERS_ENV = 'NOTULENSI_ADMIN_USERS'
+# Trace rerun terakhir sesi ini, untuk menutup rerun yang tidak sampai render_panel
+_TRACE_KEY = '_metrics_trace'
+
+
+def is_admin():
+    admins = {u.strip() for u in os.environ.get(ADMIN_USERS_ENV, '').split(',') if u.strip()}
+    return st.session_state.get('username') in admins
+
+
+def begin_page(page):
+    """
+    Panggil di awal skrip halaman: mulai trace rerun baru. Rerun sebelumnya
+    yang berhenti lewat st.stop/st.rerun/st.switch_page (tidak sampai
+    render_panel) dicatat di sini sebagai rerun terputus.
+    """
+    previous = st.session_state.get(_TRACE_KEY)
+    if previous is not None:
+        metrics.finish_trace(previous, interrupted=True)
+    trace = metrics.start_trace(page)
+    st.session_state[_TRACE_KEY] = trace
+    return trace
+
+
+def render_panel():
+    """
+    Panggil di akhir skrip halaman: tutup trace rerun dan, untuk admin,
+    tampilkan rincian waktu per tahap, hit rate cache, serta export log.
+    """
+    trace = metrics.finish_trace()
+    if trace is None or not is_admin():
+        return
+
+    registry = metrics.REGISTRY
+    with st.sidebar.expander("⏱️ Metrik Performa (Admin)", expanded=False):
+        st.markdown(f"**Rerun ini** ({trace.page}): {trace.total_ms:,.1f} ms")
+        stages = sorted(trace.stages.items(), key=lambda item: -item[1])
+        if stages:
+            st.dataframe(
+                [{'Tahap': stage, 'ms': round(ms, 1)} for stage, ms in stages],
+                hide_index=True, use_container_width=True,
+            )
+        if trace.counters:
+            st.caption(" · ".join(f"{name}: {n}" for name, n in sorted(trace.counters.items())))
+
+        st.markdown("**Cache (sejak proses dimulai)**")
+        caches = registry.cache_stats()
+        if caches:
+            st.dataframe(
+                [{'Cache': c['cache'], 'Lookup': c['lookups'], 'Miss': c['misses'],
+                  'Hit rate': f"{c['hit_rate']:.0%}" if c['hit_rate'] is not None else '-'}
+                 for c in caches],
+                hide_index=True, use_container_width=True,
+            )
+
+        st.markdown("**Rata-rata per tahap (semua halaman & thread)**")
+        st.dataframe(
+            [{'Tahap': s['stage'], 'Panggilan': s['calls'], 'Rata-rata ms': s['mean_ms']}
+             for s in registry.stage_summary()],
+            hide_index=True, use_container_width=True,
+        )
+
+        col_json, col_csv = st.columns(2)
+        col_json.download_button(
+            "JSON", registry.export_json(), file_name="metrics.json",
+            mime="application/json", use_container_width=True,
+        )
+        col_csv.download_button(
+            "CSV", registry.export_csv(), file_name="metrics.csv",
+            mime="text/csv", use_container_width=True,
+        )
+        if st.button("Simpan ke log lokal", key="btn_metrics_write_log", use_container_width=True):
+            paths = registry.write_log()
+            st.success("Tersimpan: " + ", ".join(os.path.relpath(p, metrics.BASE_DIR) for p in paths))
@@ -0,0 +1,195 @@
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from notulensi import BASE_DIR
+
+OUTBOX_FILE = os.path.join(BASE_DIR, 'outbox', 'sheets_outbox.jsonl')
+
+
+def new_submission_id():
+    """ID unik yang dibuat di sisi klien untuk setiap laporan."""
+    return uuid.uuid4().hex
+
+
+class WriteAheadLog:
+    """
+    Log append-only (JSON Lines) untuk laporan yang belum terkirim ke Google Sheet.
+
+    Setiap laporan ditulis dan di-fsync sebagai record `submit` SEBELUM
+    dikirim, lalu ditandai dengan record `ack` setelah berhasil. Saat proses
+    dimulai ulang, semua `submit` tanpa `ack` dikirim kembali.
+    """
+
+    def __init__(self, path=OUTBOX_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()
+        self._done = set()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._replay()
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            content = f.read()
+        complete = content[:content.rfind(b'\n') + 1]
+        if len(complete) != len(content):
+            # Baris terakhir terpotong (proses mati saat menulis): buang, supaya
+            # record berikutnya tidak tersambung ke sisa baris itu dan ikut rusak
+            with open(self.path, 'r+b') as f:
+                f.truncate(len(complete))
+                f.flush()
+                os.fsync(f.fileno())
+        for line in complete.decode('utf-8', errors='replace').splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('op') == 'submit':
+                if record['id'] not in self._done:
+                    self._pending[record['id']] = record['row']
+            elif record.get('op') == 'ack':
+                self._pending.pop(record['id'], None)
+                self._done.add(record['id'])
+
+    def _write(self, records):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append(self, submission_id, row):
+        """Catat laporan baru. Mengembalikan False jika ID yang sama sudah pernah dicatat."""
+        with self._lock:
+            if submission_id in self._pending or submission_id in self._done:
+                return False
+            self._write([{'op': 'submit', 'id': submission_id, 'row': list(row), 'ts': time.time()}])
+            self._pending[submission_id] = list(row)
+            return True
+
+    def pending(self, limit=None):
+        """Daftar (id, row) yang belum terkirim, urut sesuai waktu submit."""
+        with self._lock:
+            items = list(self._pending.items())
+        return items[:limit] if limit else items
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def mark_done(self, submission_ids):
+        with self._lock:
+            ids = [i for i in submission_ids if i in self._pending]
+            if not ids:
+                return
+            self._write([{'op': 'ack', 'id': i} for i in ids])
+            for i in ids:
+                self._pending.pop(i)
+                self._done.add(i)
+            if not self._pending:
+                self._compact()
+
+    def _compact(self):
+        """Kosongkan log jika semua laporan sudah terkirim (ganti file secara atomik)."""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class OutboxWorker:
+    """
+    Worker latar belakang yang mengirim isi WriteAheadLog ke Google Sheet.
+
+    Laporan yang masuk berdekatan digabung menjadi satu `append_rows`.
+    Jika gagal, dicoba lagi dengan exponential backoff. ID laporan ikut
+    ditulis sebagai kolom terakhir sehingga setelah kegagalan, ID yang
+    ternyata sudah ada di sheet tidak dikirim dua kali.
+    """
+
+    def __init__(self, wal, client, max_batch=50, max_delay=0.5, base_backoff=1.0, max_backoff=300.0,
+                 on_sent=None):
+        self.wal = wal
+        self.client = client
+        self.on_sent = on_sent
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self.last_error = None
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        if self.wal.pending_count():
+            self._wake.set()
+            self._ensure_worker()
+
+    def submit(self, row, submission_id=None):
+        """Catat laporan ke log lalu kembali seketika; pengiriman dilakukan worker."""
+        submission_id = submission_id or new_submission_id()
+        self.wal.append(submission_id, row)
+        self._wake.set()
+        self._ensure_worker()
+        return submission_id
+
+    def status(self):
+        return {
+            'pending': self.wal.pending_count(),
+            'failures': self.failures,
+            'last_error': str(self.last_error) if self.last_error else None,
+        }
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='sheets-outbox', daemon=True)
+                self._thread.start()
+
+    def _backoff_delay(self):
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (self.failures - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            # Beri kesempatan submit lain ikut dalam batch yang sama
+            time.sleep(self.max_delay)
+            self._wake.clear()
+            batch = self.wal.pending(self.max_batch)
+            if not batch:
+                continue
+            try:
+                self._send(batch)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = e
+                time.sleep(self._backoff_delay())
+                self._wake.set()
+            else:
+                self.failures = 0
+                self.last_error = None
+                if self.on_sent is not None:
+                    self.on_sent()
+                if self.wal.pending_count():
+                    self._wake.set()
+
+    def _send(self, batch):
+        if self.failures:
+            # Kiriman sebelumnya mungkin sudah sampai walau responsnya gagal
+            existing = set(self.client.submission_ids())
+            already_sent = [i for i, _ in batch if i in existing]
+            self.wal.mark_done(already_sent)
+            batch = [(i, row) for i, row in batch if i not in existing]
+            if not batch:
+                return
+        self.client.append_rows([row + [i] for i, row in batch])
+        self.wal.mark_done([i for i, _ in batch])
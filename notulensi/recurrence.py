@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+
+# Deteksi laporan berulang/duplikat: teks Permasalahan dipecah menjadi
+# shingle karakter, diringkas dengan MinHash, lalu dikelompokkan lewat LSH
+# (banding) per (Vessel, Unit). Semua langkah berupa operasi array; tidak ada
+# perbandingan berpasangan antar laporan.
+
+# Panjang shingle karakter (4 byte -> satu bilangan 32-bit)
+SHINGLE_SIZE = 4
+# Jumlah fungsi hash MinHash = BANDS x ROWS_PER_BAND. Dengan 6 x 4, dua laporan
+# dengan kemiripan Jaccard ~0.65 punya peluang 50% menjadi kandidat; >=0.8
+# hampir selalu, <=0.4 jarang.
+BANDS = 6
+ROWS_PER_BAND = 4
+# Bilangan prima > 2^32 untuk hash universal (a*h + b) mod P
+_PRIME = np.uint64(4294967311)
+_NO_SHINGLE = np.iinfo(np.uint64).max
+
+
+def normalize_text(texts):
+    """Huruf kecil, hanya huruf/angka, satu spasi antar kata."""
+    return texts.astype(str).str.lower().str.replace(r'[^0-9a-z]+', ' ', regex=True).str.strip()
+
+
+def shingle_hashes(texts, size=SHINGLE_SIZE):
+    """
+    Semua shingle karakter sepanjang `size` dari setiap teks (ASCII hasil
+    normalize_text) sebagai (posisi baris, nilai shingle). Shingle dibentuk
+    dari satu buffer byte gabungan, tanpa loop per baris.
+    """
+    lengths = texts.str.len().to_numpy(dtype=np.int64)
+    buffer = np.frombuffer(''.join(texts).encode('ascii'), dtype=np.uint8).astype(np.uint64)
+    counts = np.maximum(lengths - size + 1, 0)
+    starts = np.cumsum(lengths) - lengths
+    rows = np.repeat(np.arange(len(lengths)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(starts, counts)
+    values = np.zeros(len(offsets), dtype=np.uint64)
+    for j in range(size):
+        values = (values << np.uint64(8)) | buffer[offsets + j]
+    return rows, values
+
+
+def minhash_signatures(texts, num_hashes=BANDS * ROWS_PER_BAND, seed=0):
+    """Matriks MinHash (baris x num_hashes); baris tanpa shingle berisi nilai maksimum."""
+    rows, values = shingle_hashes(texts)
+    signatures = np.full((len(texts), num_hashes), _NO_SHINGLE, dtype=np.uint64)
+    if not len(values):
+        return signatures
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 32, size=num_hashes, dtype=np.uint64)
+    b = rng.integers(0, 2 ** 32, size=num_hashes, dtype=np.uint64)
+    # `rows` terurut naik, jadi minimum per baris cukup dengan reduceat
+    present, first = np.unique(rows, return_index=True)
+    for k in range(num_hashes):
+        hashed = (a[k] * values + b[k]) % _PRIME
+        signatures[present, k] = np.minimum.reduceat(hashed, first)
+    return signatures
+
+
+def _connected_labels(bucket_ids, n):
+    """Label komponen terhubung (label = posisi terkecil) dari beberapa pengelompokan bucket."""
+    labels = np.arange(n)
+    while True:
+        previous = labels
+        for buckets in bucket_ids:
+            smallest = np.full(buckets.max() + 1, n, dtype=np.int64)
+            np.minimum.at(smallest, buckets, labels)
+            labels = np.minimum(labels, smallest[buckets])
+        labels = labels[labels]  # pointer jumping
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def cluster_reports(df):
+    """
+    ID klaster laporan berulang per baris `df` (Series dengan index `df`).
+    Laporan dengan Vessel dan Unit yang sama dan teks Permasalahan yang mirip
+    mendapat ID yang sama; laporan tanpa pasangan bernilai -1.
+    """
+    clusters = pd.Series(-1, index=df.index, dtype='int64')
+    texts = normalize_text(df['Permasalahan'])
+    candidates = np.flatnonzero(texts.str.len().to_numpy() >= SHINGLE_SIZE)
+    if len(candidates) < 2:
+        return clusters
+
+    signatures = minhash_signatures(texts.iloc[candidates])
+    groups = pd.DataFrame({
+        'vessel': pd.factorize(df['Vessel'].iloc[candidates])[0],
+        'unit': pd.factorize(df['Unit'].iloc[candidates])[0],
+    })
+    bucket_ids = []
+    for band in range(BANDS):
+        band_frame = groups.copy()
+        for r in range(ROWS_PER_BAND):
+            band_frame[f'h{r}'] = signatures[:, band * ROWS_PER_BAND + r]
+        bucket_ids.append(band_frame.groupby(list(band_frame.columns), sort=False).ngroup().to_numpy())
+
+    labels = _connected_labels(bucket_ids, len(candidates))
+    sizes = np.bincount(labels, minlength=len(candidates))
+    recurring = sizes[labels] > 1
+    clusters.iloc[candidates[recurring]] = labels[recurring]
+    return clusters
+
+
+def recurring_issues(df, clusters, min_reports=2):
+    """
+    Ringkasan masalah berulang untuk `df` (subset data master) berdasarkan
+    `clusters` dari cluster_reports: satu baris per klaster dengan minimal
+    `min_reports` laporan di dalam `df`, terbanyak lebih dulu.
+    """
+    columns = ['Vessel', 'Unit', 'Permasalahan', 'Jumlah Laporan', 'OPEN', 'Pertama', 'Terakhir']
+    cluster_ids = clusters.reindex(df.index).fillna(-1).astype('int64')
+    member = cluster_ids >= 0
+    if not member.any():
+        return pd.DataFrame(columns=columns)
+
+    members = df.loc[member, ['Vessel', 'Unit', 'Permasalahan', 'Status', 'Date_Ref']].copy()
+    members['Cluster'] = cluster_ids[member]
+    members['Is_Open'] = members['Status'] == 'OPEN'
+    members = members.sort_values('Date_Ref', kind='stable')
+    summary = members.groupby('Cluster', sort=False).agg(
+        Vessel=('Vessel', 'last'),
+        Unit=('Unit', 'last'),
+        Permasalahan=('Permasalahan', 'last'),
+        Jumlah_Laporan=('Permasalahan', 'size'),
+        OPEN=('Is_Open', 'sum'),
+        Pertama=('Date_Ref', 'first'),
+        Terakhir=('Date_Ref', 'last'),
+    ).rename(columns={'Jumlah_Laporan': 'Jumlah Laporan'})
+    summary = summary[summary['Jumlah Laporan'] >= min_reports]
+    summary['Vessel'] = summary['Vessel'].astype(str)
+    summary['Unit'] = summary['Unit'].astype(str)
+    return summary.sort_values(['Jumlah Laporan', 'Terakhir'], ascending=False).reset_index(drop=True)[columns]
+
+
+def unique_open_count(df, clusters):
+    """Jumlah masalah OPEN setelah laporan berulang dalam satu klaster dihitung sekali."""
+    is_open = df['Status'] == 'OPEN'
+    cluster_ids = clusters.reindex(df.index[is_open]).fillna(-1).astype('int64')
+    return int((cluster_ids < 0).sum() + cluster_ids[cluster_ids >= 0].nunique())
@@ -0,0 +1,155 @@
+import bisect
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from notulensi.index import group_positions
+from notulensi.ingest import concat_frames
+
+# Kolom teks bebas yang diindeks
+SEARCH_COLUMNS = ['Permasalahan', 'Penyelesaian', 'Keterangan']
+RESULT_COLUMNS = ['Day', 'Vessel', 'Unit'] + SEARCH_COLUMNS + ['Status']
+# Token: huruf/angka (tanda baca seperti "no.3" atau "AE-3" memisah token)
+TOKEN_PATTERN = r'[0-9a-z]+'
+# Kata fungsi bahasa Indonesia yang tidak membedakan laporan
+STOPWORDS = frozenset("""
+    yang dan di ke dari untuk pada dengan ini itu ada sudah telah akan oleh atau
+    karena juga dalam saat masih agar bisa dapat sebagai serta tersebut sehingga
+    maka lalu kemudian setelah sebelum jika namun tetapi bahwa secara para
+""".split())
+# Akhiran -nya dibuang ("pompanya" -> "pompa") asal sisa kata minimal 3 huruf
+_CLITIC = re.compile(r'^(\w{3,}?)nya$')
+_EMPTY = np.array([], dtype=np.intp)
+
+
+def normalize_token(token):
+    return _CLITIC.sub(r'\1', token)
+
+
+def tokenize(text):
+    """Token kueri: huruf kecil, tanpa tanda baca, stopword dan akhiran -nya."""
+    tokens = re.findall(TOKEN_PATTERN, str(text).lower())
+    return [normalize_token(t) for t in tokens if t not in STOPWORDS]
+
+
+def tokenize_series(texts):
+    """Versi vektor dari tokenize: Series token dengan index = posisi baris asal."""
+    tokens = texts.str.lower().str.findall(TOKEN_PATTERN).explode().dropna()
+    tokens = tokens[~tokens.isin(STOPWORDS)]
+    return tokens.str.replace(_CLITIC, r'\1', regex=True)
+
+
+def build_postings(frame, base=0):
+    """
+    Posting list {token: posisi baris terurut} untuk `frame`, dengan posisi
+    digeser `base`. Tokenisasi dan pengelompokan dilakukan secara vektor.
+    """
+    if frame.empty:
+        return {}
+    texts = frame[SEARCH_COLUMNS[0]].astype(str)
+    for col in SEARCH_COLUMNS[1:]:
+        texts = texts + ' ' + frame[col].astype(str)
+    tokens = tokenize_series(texts.reset_index(drop=True))
+    pairs = pd.DataFrame({'pos': tokens.index.to_numpy() + base, 'token': tokens.to_numpy()})
+    pairs = pairs.drop_duplicates().reset_index(drop=True)
+    row_positions = pairs['pos'].to_numpy(dtype=np.intp)
+    return {token: row_positions[idx] for token, idx in group_positions(pairs['token']).items()}
+
+
+class SearchIndex:
+    """
+    Inverted index teks laporan untuk satu sumber data append-only.
+
+    Saat sumber hanya bertambah baris (generation sama), hanya baris baru
+    yang ditokenisasi dan posting list-nya disambung. Jika sumber dimuat
+    ulang penuh (generation berubah), indeks dibangun ulang. Kosakata
+    disimpan terurut sehingga pencarian prefiks cukup dengan bisect.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, generation):
+        self.generation = generation
+        self.n_rows = 0
+        self._postings = {}
+        self._vocab = []
+
+    def update(self, frame, generation):
+        with self._lock:
+            self._update(frame, generation)
+
+    def _update(self, frame, generation):
+        if generation != self.generation:
+            self._reset(generation)
+        if len(frame) <= self.n_rows:
+            # Sudah terindeks (mungkin oleh sesi lain dengan snapshot yang lebih baru)
+            return
+        new_postings = build_postings(frame.iloc[self.n_rows:], base=self.n_rows)
+        new_tokens = False
+        for token, positions in new_postings.items():
+            existing = self._postings.get(token)
+            if existing is None:
+                self._postings[token] = positions
+                new_tokens = True
+            else:
+                self._postings[token] = np.concatenate([existing, positions])
+        if new_tokens:
+            self._vocab = sorted(self._postings)
+        self.n_rows = len(frame)
+
+    def lookup(self, term):
+        """Posisi baris yang memuat token berawalan `term`."""
+        start = bisect.bisect_left(self._vocab, term)
+        stop = bisect.bisect_left(self._vocab, term + '\uffff')
+        parts = [self._postings[token] for token in self._vocab[start:stop]]
+        if not parts:
+            return _EMPTY
+        return parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+
+    def match(self, frame, generation, query):
+        """
+        Posisi baris `frame` yang memuat SEMUA kata kueri (masing-masing
+        sebagai prefiks). Indeks diperbarui dulu ke `frame` bila perlu.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return _EMPTY
+        with self._lock:
+            self._update(frame, generation)
+            selections = sorted((self.lookup(term) for term in set(terms)), key=len)
+        result = selections[0]
+        for positions in selections[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, positions, assume_unique=True)
+        # Abaikan baris yang ditambahkan setelah snapshot `frame`
+        return result[:np.searchsorted(result, len(frame))]
+
+
+def search_reports(dataset, indexes, query, vessels=None, units=None, statuses=None):
+    """
+    Laporan yang cocok dengan `query` dari setiap sumber CombinedDataset
+    `dataset` (mis. CSV histori dan snapshot Google Sheet), masing-masing
+    dengan SearchIndex-nya. Seperti frame gabungan, baris yang laporannya
+    ada di sumber setelahnya (snapshot sheet) dibuang. Filter
+    kapal/unit/status hanya diterapkan pada baris yang cocok. Hasil
+    diurutkan dari laporan terbaru.
+    """
+    dataset.snapshot()
+    results = []
+    for i, (part, index) in enumerate(zip(dataset.parts, indexes)):
+        snapshot = part.snapshot()
+        positions = index.match(snapshot.frame, snapshot.generation, query)
+        if not len(positions):
+            continue
+        matched = snapshot.frame.take(positions)
+        results.append(matched[~dataset.superseded(i, matched)])
+    matches = concat_frames(results)
+    for column, values in (('Vessel', vessels), ('Unit', units), ('Status', statuses)):
+        if values:
+            matches = matches[matches[column].isin(values)]
+    return matches.sort_values('Date_Ref', ascending=False, na_position='last', kind='stable')
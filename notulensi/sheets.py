@@ -0,0 +1,97 @@
+import os
+import threading
+from urllib.parse import urlsplit
+
+from notulensi import metrics
+
+# --- Konfigurasi Google Sheets ---
+SHEET_NAME = "Sheet1"  # Ganti sesuai dengan nama sheet kamu
+SPREADSHEET_ID = "1Dnv5CQ2P1LtSst4f7DySC_vkEQBk5rPmzLst0KeAZ7g"  # ID dari URL Sheet kamu
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive",
+]
+# Arahkan ke server Sheets palsu lokal (mis. http://127.0.0.1:8080) untuk pengujian
+BASE_URL_ENV = "SHEETS_API_BASE_URL"
+GOOGLE_API_HOSTS = ("sheets.googleapis.com", "www.googleapis.com")
+# Kolom ke-10 (setelah Status) berisi ID laporan dari klien, untuk mencegah duplikasi
+SUBMISSION_ID_COLUMN = 10
+
+
+def _redirect_session(base_url):
+    """requests.Session yang mengalihkan semua panggilan Google API ke `base_url`."""
+    import requests
+
+    target = urlsplit(base_url)
+
+    class _RedirectSession(requests.Session):
+        def request(self, method, url, *args, **kwargs):
+            parts = urlsplit(url)
+            if parts.hostname in GOOGLE_API_HOSTS:
+                url = parts._replace(scheme=target.scheme, netloc=target.netloc).geturl()
+            return super().request(method, url, *args, **kwargs)
+
+    return _RedirectSession()
+
+
+class SheetsClient:
+    """
+    Klien Google Sheets yang dibuat sekali per proses.
+
+    Autentikasi dan pembukaan worksheet baru dilakukan saat pertama kali
+    dibutuhkan, lalu dipakai ulang (koneksi HTTP ikut dipakai ulang oleh
+    session). Token OAuth diperbarui otomatis oleh google-auth ketika kedaluwarsa.
+    """
+
+    def __init__(self, credentials_info=None, spreadsheet_id=SPREADSHEET_ID,
+                 sheet_name=SHEET_NAME, base_url=None):
+        self.credentials_info = credentials_info
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_name = sheet_name
+        self.base_url = base_url or os.environ.get(BASE_URL_ENV)
+        self._worksheet = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        import gspread
+
+        if self.base_url:
+            client = gspread.Client(None, session=_redirect_session(self.base_url))
+        else:
+            from google.oauth2.service_account import Credentials
+
+            creds = Credentials.from_service_account_info(self.credentials_info, scopes=SCOPES)
+            client = gspread.authorize(creds)
+        return client.open_by_key(self.spreadsheet_id).worksheet(self.sheet_name)
+
+    @property
+    def worksheet(self):
+        with self._lock:
+            if self._worksheet is None:
+                with metrics.timer('sheets.connect'):
+                    self._worksheet = self._connect()
+            return self._worksheet
+
+    def append_rows(self, rows):
+        """Tambahkan beberapa baris dalam satu request API."""
+        with metrics.timer('sheets.append_rows'):
+            result = self.worksheet.append_rows(rows)
+        metrics.count('sheets.rows_appended', len(rows))
+        return result
+
+    def get_all_values(self):
+        with metrics.timer('sheets.get_all_values'):
+            return self.worksheet.get_all_values()
+
+    def revision(self):
+        """Waktu update terakhir spreadsheet (Drive API), atau None jika tidak tersedia."""
+        try:
+            with metrics.timer('sheets.revision'):
+                return self.worksheet.spreadsheet.get_lastUpdateTime()
+        except Exception:
+            return None
+
+    def submission_ids(self):
+        """Semua ID laporan yang sudah tercatat di sheet."""
+        with metrics.timer('sheets.submission_ids'):
+            return self.worksheet.col_values(SUBMISSION_ID_COLUMN)
@@ -0,0 +1,85 @@
+import os
+import sys
+
+import pandas as pd
+
+from notulensi import data
+
+CACHE_DIR = os.path.join(data.BASE_DIR, 'cache')
+SOURCE_HASH_KEY = b'notulensi_source_hash'
+SOURCE_OFFSET_KEY = b'notulensi_source_offset'
+SCHEMA_VERSION_KEY = b'notulensi_schema_version'
+
+
+def parquet_available():
+    """Parquet butuh pyarrow (sudah terpasang bersama streamlit); tanpa itu tetap pakai CSV."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def parquet_path_for(source_path):
+    """Lokasi file Parquet pendamping untuk sebuah file sumber CSV."""
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(CACHE_DIR, name + '.parquet')
+
+
+def write_parquet(df, path, source_hash=None, source_offset=None):
+    """
+    Simpan frame hasil normalize_frame ke Parquet. Kolom categorical
+    (Vessel/Unit/Status) tersimpan dictionary-encoded, tanggal sebagai
+    timestamp. Hash dan panjang (byte) bagian CSV sumber yang tercakup
+    disimpan di metadata supaya file yang basi bisa dikenali.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if source_hash is not None:
+        metadata = dict(table.schema.metadata or {})
+        metadata[SOURCE_HASH_KEY] = source_hash.encode()
+        metadata[SOURCE_OFFSET_KEY] = str(source_offset or 0).encode()
+        metadata[SCHEMA_VERSION_KEY] = str(data.SCHEMA_VERSION).encode()
+        table = table.replace_schema_metadata(metadata)
+    tmp_path = path + '.tmp'
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def parquet_checkpoint(path):
+    """(hash, offset) bagian CSV sumber yang tercakup file Parquet, atau (None, 0)."""
+    import pyarrow.parquet as pq
+
+    if not os.path.exists(path):
+        return None, 0
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except (OSError, ValueError):
+        return None, 0
+    source_hash = metadata.get(SOURCE_HASH_KEY)
+    if not source_hash or metadata.get(SCHEMA_VERSION_KEY) != str(data.SCHEMA_VERSION).encode():
+        return None, 0
+    return source_hash.decode(), int(metadata.get(SOURCE_OFFSET_KEY, b'0'))
+
+
+def read_parquet(path):
+    """Baca checkpoint Parquet utuh (dipakai IncrementalDataset saat cold start)."""
+    return pd.read_parquet(path)
+
+
+def convert_csv_to_parquet(source_path=data.DATA_FILE, path=None):
+    """Konversi CSV notulensi ke Parquet. Mengembalikan lokasi file Parquet."""
+    path = path or parquet_path_for(source_path)
+    write_parquet(
+        data.load_dataset(source_path), path,
+        data.content_hash(source_path), os.path.getsize(source_path),
+    )
+    return path
+
+
+if __name__ == '__main__':
+    # python -m notulensi.storage [file.csv] [file.parquet]
+    print(convert_csv_to_parquet(*sys.argv[1:3]))
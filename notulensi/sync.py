@@ -0,0 +1,128 @@
+import csv
+import hashlib
+import json
+import os
+import threading
+
+from notulensi import BASE_DIR, COLUMNS
+
+SNAPSHOT_FILE = os.path.join(BASE_DIR, 'snapshot', 'sheet_snapshot.csv')
+SNAPSHOT_COLUMNS = COLUMNS + ['Submission ID']
+
+
+def row_hash(row):
+    return hashlib.sha1('\x1f'.join(row).encode('utf-8')).hexdigest()
+
+
+def _pad(row):
+    row = list(row[:len(SNAPSHOT_COLUMNS)])
+    return row + [''] * (len(SNAPSHOT_COLUMNS) - len(row))
+
+
+class SheetSync:
+    """
+    Menarik isi Google Sheet ke snapshot CSV lokal yang dibaca halaman analisis.
+
+    Jika waktu update spreadsheet tidak berubah, tidak ada data yang diambil.
+    Setiap baris diberi hash; jika baris lama tidak berubah, hanya baris baru
+    yang ditambahkan ke akhir snapshot (sehingga IncrementalDataset cukup
+    memparse baris baru). Jika ada baris lama yang berubah/dihapus, snapshot
+    ditulis ulang secara atomik.
+
+    State menyimpan ukuran file snapshot yang ditulis terakhir. Jika state
+    hilang atau tidak cocok dengan file (mis. proses mati di antara menulis
+    snapshot dan menyimpan state), snapshot selalu ditulis ulang, bukan
+    ditambah, supaya baris tidak tercatat dua kali.
+    """
+
+    def __init__(self, client, path=SNAPSHOT_FILE):
+        self.client = client
+        self.path = path
+        self.state_path = os.path.splitext(path)[0] + '.state.json'
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._state = self._load_state()
+
+    def _load_state(self):
+        if os.path.exists(self.state_path) and os.path.exists(self.path):
+            try:
+                with open(self.state_path, encoding='utf-8') as f:
+                    return json.load(f)
+            except ValueError:
+                pass
+        return {'revision': None, 'row_hashes': [], 'snapshot_size': None}
+
+    def _snapshot_matches_state(self):
+        """True jika file snapshot persis yang terakhir ditulis sesuai state."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return False
+        return size == self._state.get('snapshot_size')
+
+    def _save_state(self):
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def pull(self):
+        """Sinkronkan snapshot dengan sheet. Mengembalikan jumlah baris yang ditulis."""
+        with self._lock:
+            revision = self.client.revision()
+            if revision is not None and revision == self._state['revision'] and self._snapshot_matches_state():
+                return 0
+
+            values = self.client.get_all_values()
+            rows = [_pad(row) for row in values[1:] if any(cell.strip() for cell in row)]
+            hashes = [row_hash(row) for row in rows]
+            old_hashes = self._state['row_hashes']
+
+            # Tanpa hash lama (state baru/hilang) snapshot selalu ditulis ulang
+            if old_hashes and hashes[:len(old_hashes)] == old_hashes and self._snapshot_matches_state():
+                new_rows = rows[len(old_hashes):]
+                if new_rows:
+                    with open(self.path, 'a', encoding='utf-8', newline='') as f:
+                        csv.writer(f).writerows(new_rows)
+                written = len(new_rows)
+            else:
+                tmp_path = self.path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(SNAPSHOT_COLUMNS)
+                    writer.writerows(rows)
+                os.replace(tmp_path, self.path)
+                written = len(rows)
+
+            self._state = {
+                'revision': revision,
+                'row_hashes': hashes,
+                'snapshot_size': os.path.getsize(self.path),
+            }
+            self._save_state()
+            return written
+
+    def request_pull(self):
+        """Minta worker menarik data secepatnya (mis. setelah laporan terkirim)."""
+        self._wake.set()
+
+    def start(self, interval=60):
+        """Jalankan pull berkala di thread latar belakang (sekali per proses)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, args=(interval,), name='sheet-sync', daemon=True)
+            self._thread.start()
+
+    def _run(self, interval):
+        while True:
+            try:
+                self.pull()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+            self._wake.wait(interval)
+            self._wake.clear()
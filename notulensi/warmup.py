@@ -0,0 +1,57 @@
+import importlib
+import os
+import threading
+import time
+
+# Modul berat yang diimpor di latar belakang setelah login, supaya halaman
+# pertama yang membutuhkannya tidak menunggu impor.
+WARM_MODULES = ['numpy', 'pandas', 'pyarrow', 'plotly.express']
+# Isi '0' untuk menonaktifkan warm-up
+WARMUP_ENV = 'NOTULENSI_WARMUP'
+
+_lock = threading.Lock()
+_thread = None
+# modul/langkah -> durasi (detik), untuk laporan dan panel metrik
+timings = {}
+
+
+def enabled():
+    return os.environ.get(WARMUP_ENV, '1') != '0'
+
+
+def _timed(name, func):
+    t0 = time.perf_counter()
+    try:
+        func()
+    except Exception:
+        # Warm-up hanya mempercepat; kegagalan akan muncul lagi di halaman yang membutuhkan
+        return
+    timings[name] = time.perf_counter() - t0
+
+
+def _run(modules, load_data):
+    for module in modules:
+        _timed(f'import {module}', lambda: importlib.import_module(module))
+    if load_data:
+        # Dataset bersama dan FilterIndex dibangun sekali per proses (lihat cache.py)
+        from notulensi import cache
+
+        _timed('load dataset', cache.load_cube)
+        _timed('build filter index', cache.load_indexed_data)
+
+    from notulensi import metrics
+
+    for name, seconds in timings.items():
+        metrics.REGISTRY.record_stage(f'warmup.{name}', seconds * 1000)
+
+
+def start(modules=WARM_MODULES, load_data=True):
+    """Mulai warm-up di thread daemon (sekali per proses). Kembali seketika."""
+    global _thread
+    if not enabled():
+        return None
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run, args=(modules, load_data), name='warmup', daemon=True)
+            _thread.start()
+    return _thread
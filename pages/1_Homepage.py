@@ -1,100 +1,68 @@
+import html
+
 import streamlit as st
 import pandas as pd
-from datetime import datetime
-import os
-import numpy as np 
+
+from notulensi import metrics, metrics_panel
+from notulensi.aggregates import cube_years, fleet_summary
+from notulensi.cache import current_data_version, get_export, load_aging_report, load_cube
+from notulensi.export import EXPORT_FORMATS, export_filename
+
+metrics_panel.begin_page('Homepage')
 
 # --- Logika Autentikasi ---
 if 'logged_in' not in st.session_state or not st.session_state.logged_in:
     st.error("Anda harus login untuk mengakses halaman ini. Silakan kembali ke halaman utama.")
     st.stop() 
 
-# --- Konfigurasi ---
-DATA_FILE = 'notulensi_kerusakan.csv'
-DATE_FORMAT = '%d/%m/%Y'
-
-# --- FUNGSI PEMBANTU UNTUK MEMUAT DAN MEMPROSES DATA CSV ---
-@st.cache_data(ttl=3600) 
+# --- FUNGSI PEMBANTU UNTUK STATISTIK DARI KUBUS AGREGAT ---
 def get_processed_data_for_display(selected_year=None):
-    """Memuat, memproses, dan memfilter data CSV untuk mendapatkan statistik per kapal dan global."""
-    if not os.path.exists(DATA_FILE):
-        return pd.DataFrame(), 0, 0, []
-
+    """Mengambil statistik per kapal dan global dari kubus agregat (tanpa memindai data mentah)."""
     try:
-        df = pd.read_csv(DATA_FILE)
+        with metrics.timer('load'):
+            cube = load_cube()
     except Exception:
         return pd.DataFrame(), 0, 0, []
 
-    # Data cleaning dan preprocessing
-    df['Vessel'] = df['Vessel'].astype(str).str.upper().str.strip()
-    df['Status'] = df.get('Status', 'OPEN').astype(str).str.upper().str.strip()
-    df['Issued Date'] = df.get('Issued Date', pd.NA).astype(str).str.strip()
-    
-    # Konversi tanggal Issued Date 
-    df['Date_Issued'] = pd.to_datetime(df['Issued Date'], format=DATE_FORMAT, errors='coerce')
-    
-    # Filter baris yang tidak memiliki kode kapal atau tanggal invalid
-    df = df.dropna(subset=['Vessel', 'Date_Issued'])
-    df = df[df['Vessel'] != 'NAN']
+    if cube.empty:
+        return pd.DataFrame(), 0, 0, []
 
     # Dapatkan tahun-tahun yang valid
-    valid_years = df['Date_Issued'].dt.year.dropna().astype(int).unique()
-
-    # Terapkan filter tahun
-    df_filtered = df.copy()
-    if selected_year and selected_year != 'All':
-        df_filtered = df_filtered[df_filtered['Date_Issued'].dt.year == int(selected_year)]
+    valid_years = cube_years(cube)
 
-    # 1. Hitung TOTAL GLOBAL (setelah filter tahun)
-    total_open_global = (df_filtered['Status'] == 'OPEN').sum()
-    total_closed_global = (df_filtered['Status'] == 'CLOSED').sum()
+    # Terapkan filter tahun langsung pada kubus
+    year = None if not selected_year or selected_year == 'All' else int(selected_year)
+    with metrics.timer('aggregate'):
+        result, total_open_global, total_closed_global = fleet_summary(cube, year)
 
-    # 2. Hitung statistik per kapal
-    stats = df_filtered.groupby('Vessel')['Status'].value_counts().unstack(fill_value=0)
-    
-    stats['OPEN'] = stats.get('OPEN', 0)
-    stats['CLOSED'] = stats.get('CLOSED', 0)
-    
-    last_inspection = df.groupby('Vessel')['Date_Issued'].max().dt.strftime(DATE_FORMAT)
+    return result, total_open_global, total_closed_global, valid_years
 
-    result = stats[['OPEN', 'CLOSED']].reset_index()
-    result['last_inspection'] = result['Vessel'].map(last_inspection)
-    
-    return result, total_open_global, total_closed_global, valid_years.tolist()
 
-
-# --- FUNGSI UTAMA UNTUK DATA CARD ---
-def get_ship_list(df_stats):
-    """Mengambil data status Open/Closed NC secara dinamis dari DataFrame statistik."""
-    ship_list = []
-    if not df_stats.empty:
-        for _, row in df_stats.iterrows():
-            ship_list.append({
-                "code": row['Vessel'],
-                "open_nc": int(row['OPEN']),
-                "closed_nc": int(row['CLOSED']),
-                "last_inspection": row['last_inspection'] if pd.notna(row['last_inspection']) else 'N/A'
-            })
-    return ship_list
+def export_reader(path):
+    """
+    Callable untuk `data=` st.download_button: file export baru dibaca saat
+    tombol Download diklik, bukan di setiap rerun selama tombol tampil.
+    """
+    def read():
+        with open(path, 'rb') as export_file:
+            return export_file.read()
+    return read
 
 
-# --- FUNGSI DISPLAY CARD DENGAN HTML/CSS KUSTOM ---
-def display_ship_cards(ship_list):
-    """Menampilkan daftar kapal dalam format card kustom."""
-    st.markdown("""
+# --- CSS STATIS HALAMAN (dikirim dalam satu elemen per rerun) ---
+PAGE_CSS = """
         <style>
-            /* Global Card Container */
+            /* Global Card Grid */
             .card-container {
-                display: flex;
-                flex-wrap: wrap;
+                display: grid;
+                grid-template-columns: repeat(3, minmax(0, 1fr));
                 gap: 20px;
-                padding: 10px;
+                padding: 10px 0;
             }
             .ship-card-content {
                 background-color: #FFFFFF; 
-                border-radius: 12px 12px 0 0;
+                border-radius: 12px;
                 padding: 20px;
-                width: 100% !important; 
                 box-shadow: 0 6px 12px rgba(0, 0, 0, 0.15); 
                 border-top: 5px solid #005691;
                 transition: transform 0.2s;
@@ -105,7 +73,7 @@ def display_ship_cards(ship_list):
                 background-color: #005691;
                 color: white;
                 border: none;
-                border-radius: 0 0 12px 12px;
+                border-radius: 8px;
             }
             .stButton>button:hover {
                 background-color: #004070;
@@ -134,6 +102,11 @@ def display_ship_cards(ship_list):
                 font-weight: bold;
                 color: #00BA38;
             }
+            .sla-breach {
+                font-size: 0.8em;
+                color: #FF4B4B;
+                margin-top: 10px;
+            }
             .last-inspection {
                 font-size: 0.8em;
                 color: #777777;
@@ -166,46 +139,97 @@ def display_ship_cards(ship_list):
                 font-size: 0.9em;
                 color: #555555;
             }
+            /* Tombol Export biar sejajar & warna seragam */
+            div[data-testid="stPopover"] {
+                margin-top: 28px;
+            }
+            div[data-testid="stDownloadButton"] > button {
+                height: 38px;
+                background-color: #005691 !important;
+                color: white !important;
+                border: none;
+                border-radius: 6px;
+            }
+            div[data-testid="stDownloadButton"] > button:hover {
+                background-color: #004070 !important;
+            }
         </style>
-    """, unsafe_allow_html=True)
+"""
+
+# Jumlah card per halaman grid (3 kolom x 10 baris)
+CARDS_PER_PAGE = 30
+
+CARD_TEMPLATE = """<div class="ship-card-content">
+<div class="ship-code-display">{code}</div>
+<div style="font-size: 0.9em; color: #777;">Kode Kapal: {code}</div>
+<div class="nc-grid">
+<div class="nc-item"><div class="nc-value-open">{open_nc}</div><div class="nc-label">Laporan Open</div></div>
+<div class="nc-item"><div class="nc-value-closed">{closed_nc}</div><div class="nc-label">Laporan Closed</div></div>
+</div>
+<div class="sla-breach">{sla_note}</div>
+<div class="last-inspection">Terakhir Update: {last_inspection}</div>
+</div>"""
+
 
-    ship_list.sort(key=lambda x: x['code']) 
-    num_cols = 3 
-    cols = st.columns(num_cols)
-    
-    for i, ship in enumerate(ship_list):
-        col = cols[i % num_cols]
-        
-        ship_name = ship['code']
-
-        with col:
-            card_html = f"""
-                <div class="ship-card-content">
-                    <div class="ship-code-display">{ship_name}</div>
-                    <div style="font-size: 0.9em; color: #777;">Kode Kapal: {ship['code']}</div>
-                    <div class="nc-grid">
-                        <div class="nc-item">
-                            <div class="nc-value-open">{ship['open_nc']}</div>
-                            <div class="nc-label">Laporan Open</div>
-                        </div>
-                        <div class="nc-item">
-                            <div class="nc-value-closed">{ship['closed_nc']}</div>
-                            <div class="nc-label">Laporan Closed</div>
-                        </div>
-                    </div>
-                    <div class="last-inspection">
-                        Terakhir Update: {ship['last_inspection']}
-                    </div>
-                </div>
-            """
-            st.markdown(card_html, unsafe_allow_html=True)
-            
-            if st.button(f"Lihat Detail {ship['code']}", key=f"btn_{ship['code']}", use_container_width=True):
-                 st.session_state.selected_ship_code = ship['code']
-                 st.session_state.selected_ship_name = ship_name 
-                 st.switch_page("pages/2_Laporan_Aktif_&_Input.py")
-                 
-            st.markdown(f'<div style="margin-bottom: 20px;"></div>', unsafe_allow_html=True)
+# --- FUNGSI UTAMA UNTUK DATA CARD ---
+def get_ship_list(df_stats, sla_breaches=None):
+    """
+    Mengambil data status Open/Closed NC dari DataFrame statistik (konversi
+    vektor, urut kode kapal), ditambah jumlah laporan OPEN yang melewati SLA.
+    """
+    if df_stats.empty:
+        return []
+    codes = df_stats['Vessel'].astype(str)
+    breaches = codes.map(sla_breaches).fillna(0).astype(int) if sla_breaches is not None else 0
+    ships = pd.DataFrame({
+        "code": codes,
+        "open_nc": df_stats['OPEN'].astype(int),
+        "closed_nc": df_stats['CLOSED'].astype(int),
+        "last_inspection": df_stats['last_inspection'].fillna('N/A'),
+        "sla_breaches": breaches,
+    }).sort_values('code')
+    return ships.to_dict('records')
+
+
+# --- FUNGSI DISPLAY CARD DENGAN HTML/CSS KUSTOM ---
+def display_ship_cards(ship_list, sla_days):
+    """
+    Menampilkan daftar kapal sebagai satu grid HTML (satu elemen Streamlit
+    untuk semua card), dengan paginasi untuk armada besar dan satu tombol
+    detail untuk kapal yang dipilih.
+    """
+    num_pages = max(1, -(-len(ship_list) // CARDS_PER_PAGE))
+    page = 1
+    if num_pages > 1:
+        page = st.selectbox(
+            "Halaman", list(range(1, num_pages + 1)), key="homepage_card_page",
+            format_func=lambda p: f"Halaman {p} dari {num_pages}",
+        )
+    page_ships = ship_list[(page - 1) * CARDS_PER_PAGE: page * CARDS_PER_PAGE]
+
+    cards_html = "".join(
+        CARD_TEMPLATE.format(
+            code=html.escape(ship['code']),
+            open_nc=ship['open_nc'],
+            closed_nc=ship['closed_nc'],
+            last_inspection=html.escape(str(ship['last_inspection'])),
+            sla_note=f"⚠️ {ship['sla_breaches']} OPEN &gt; {sla_days} hari" if ship['sla_breaches'] else "&nbsp;",
+        )
+        for ship in page_ships
+    )
+    st.markdown(f'<div class="card-container">{cards_html}</div>', unsafe_allow_html=True)
+
+    col_select, col_button = st.columns([3, 1])
+    with col_select:
+        ship_code = st.selectbox(
+            "Pilih Kapal", [ship['code'] for ship in page_ships], key="homepage_selected_ship",
+        )
+    with col_button:
+        st.markdown('<div style="margin-top: 28px;"></div>', unsafe_allow_html=True)
+        if st.button(f"Lihat Detail {ship_code}", key="btn_ship_detail", use_container_width=True):
+            st.session_state.selected_ship_code = ship_code
+            st.session_state.selected_ship_name = ship_code
+            st.switch_page("pages/2_Laporan_Aktif_&_Input.py")
 
 
 # --- MAIN LOGIC ---
@@ -214,22 +238,8 @@ st.markdown("# Homepage")
 st.markdown("## Laporan Kerusakan Kapal")
 st.write("---")
 
-# 💅 CSS tambahan buat tombol Export CSV biar sejajar & warna seragam
-st.markdown("""
-    <style>
-        div[data-testid="stDownloadButton"] > button {
-            height: 38px;
-            margin-top: 22px;
-            background-color: #005691 !important;
-            color: white !important;
-            border: none;
-            border-radius: 6px;
-        }
-        div[data-testid="stDownloadButton"] > button:hover {
-            background-color: #004070 !important;
-        }
-    </style>
-""", unsafe_allow_html=True)
+# CSS halaman (card, metrik global, tombol Export) dalam satu elemen
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
 # --- FILTER TAHUN & EXPORT BUTTON ---
 df_stats_temp, _, _, valid_years_list_temp = get_processed_data_for_display()
@@ -241,17 +251,33 @@ with col_filter:
     selected_year = st.selectbox("Filter Tahun Kejadian (Global)", year_options, key="filter_tahun_homepage")
 
 with col_export:
-    try:
-        with open(DATA_FILE, "rb") as file:
-            st.download_button(
-                label="⬇️ Export CSV",
-                data=file,
-                file_name="notulensi_kerusakan.csv",
-                mime="text/csv",
-                use_container_width=True
-            )
-    except FileNotFoundError:
-        st.warning("File CSV belum tersedia", icon="⚠️")
+    # File export hanya dibuat saat diminta, lalu di-cache per versi data & filter
+    with st.popover("⬇️ Export", use_container_width=True):
+        export_format = st.selectbox(
+            "Format", list(EXPORT_FORMATS), key="export_format",
+            format_func=lambda fmt: EXPORT_FORMATS[fmt][0],
+        )
+        vessel_options = df_stats_temp['Vessel'].tolist() if not df_stats_temp.empty else []
+        export_vessels = st.multiselect("Kapal (kosong = semua)", vessel_options, key="export_vessels")
+        export_year = None if selected_year == 'All' else int(selected_year)
+        st.caption(f"Tahun: {selected_year}")
+
+        export_request = (export_format, export_year, tuple(sorted(export_vessels)))
+        if st.button("Siapkan File", key="btn_prepare_export", use_container_width=True):
+            st.session_state.export_request = export_request
+
+        if st.session_state.get('export_request') == export_request:
+            try:
+                export_path = get_export(current_data_version(), *export_request)
+                st.download_button(
+                    label="⬇️ Download",
+                    data=export_reader(export_path),
+                    file_name=export_filename(*export_request),
+                    mime=EXPORT_FORMATS[export_format][1],
+                    use_container_width=True
+                )
+            except Exception as e:
+                st.warning(f"Export gagal dibuat: {e}", icon="⚠️")
 
 # --- LOAD DATA ---
 df_stats, total_open, total_closed, _ = get_processed_data_for_display(selected_year)
@@ -293,7 +319,16 @@ st.markdown("### Pilih Kapal untuk Laporan Detail")
 if df_stats.empty:
     st.warning("Tidak ada data kapal yang valid ditemukan untuk filter ini.")
 else:
-    final_ship_list = get_ship_list(df_stats)
-    display_ship_cards(final_ship_list)
+    # Umur laporan OPEN dihitung scheduler latar belakang; di sini hanya dibaca
+    try:
+        aging_report = load_aging_report()
+        sla_breaches, sla_days = aging_report.vessel_breaches(), aging_report.sla_days
+    except Exception:
+        sla_breaches, sla_days = None, None
+    with metrics.timer('render'):
+        final_ship_list = get_ship_list(df_stats, sla_breaches)
+        display_ship_cards(final_ship_list, sla_days)
 
 st.info("Silakan pilih salah satu kapal di atas untuk melihat atau menginput laporan kerusakan.")
+
+metrics_panel.render_panel()
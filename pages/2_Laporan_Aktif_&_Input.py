@@ -1,62 +1,154 @@
-import streamlit as st
-import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
-from datetime import datetime
-
-# --- Konfigurasi Halaman ---
-st.set_page_config(page_title="Input Notulensi", page_icon="🛠️")
-
-st.title("📋 Input Notulensi Kerusakan Kapal")
-st.markdown("Gunakan form di bawah untuk menambahkan data notulensi baru ke Google Sheet.")
-
-# --- Konfigurasi Google Sheets ---
-SHEET_NAME = "Sheet1"  # Ganti sesuai dengan nama sheet kamu
-SPREADSHEET_ID = "1Dnv5CQ2P1LtSst4f7DySC_vkEQBk5rPmzLst0KeAZ7g"  # ID dari URL Sheet kamu
-
-# Ambil credentials dari secrets Streamlit (step 4)
-creds = Credentials.from_service_account_info(st.secrets["gcp_service_account"])
-
-# Koneksi ke Google Sheet
-client = gspread.authorize(creds)
-sheet = client.open_by_key(SPREADSHEET_ID).worksheet(SHEET_NAME)
-
-# --- Form Input ---
-with st.form("notulensi_form"):
-    day = st.text_input("Day")
-    vessel = st.text_input("Vessel")
-    permasalahan = st.text_area("Permasalahan")
-    penyelesaian = st.text_area("Penyelesaian")
-    unit = st.text_input("Unit")
-    issued_date = st.date_input("Issued Date")
-    closed_date = st.date_input("Closed Date", value=None)
-    keterangan = st.text_area("Keterangan")
-    status = st.selectbox("Status", ["Open", "Closed", "Pending"])
-
-    submitted = st.form_submit_button("Submit")
-
-    if submitted:
-        # Ubah ke format list sesuai urutan kolom di Google Sheet
-        new_row = [
-            day,
-            vessel,
-            permasalahan,
-            penyelesaian,
-            unit,
-            issued_date.strftime("%Y-%m-%d"),
-            closed_date.strftime("%Y-%m-%d") if closed_date else "",
-            keterangan,
-            status
-        ]
-
-        # Simpan ke Google Sheet
-        sheet.append_row(new_row)
-        st.success("✅ Data berhasil disimpan ke Google Sheet!")
-
-        # Optional: tampilkan preview data yang baru dikirim
-        st.subheader("Data yang dikirim:")
-        df_preview = pd.DataFrame([new_row], columns=[
-            "Day", "Vessel", "Permasalahan", "Penyelesaian", "Unit",
-            "Issued Date", "Closed Date", "Keterangan", "Status"
-        ])
-        st.dataframe(df_preview)
+import streamlit as st
+import pandas as pd
+
+from notulensi import analysis, metrics, metrics_panel
+from notulensi.cache import get_outbox, load_indexed_data
+from notulensi.outbox import new_submission_id
+
+# --- Konfigurasi Halaman ---
+st.set_page_config(page_title="Input Notulensi", page_icon="🛠️")
+metrics_panel.begin_page('Laporan Aktif & Input')
+
+st.title("📋 Input Notulensi Kerusakan Kapal")
+st.markdown("Gunakan form di bawah untuk menambahkan data notulensi baru ke Google Sheet.")
+
+# Jumlah laporan per halaman pada detail kapal
+REPORTS_PER_PAGE = 25
+DETAIL_COLUMNS = ['Day', 'Unit', 'Permasalahan', 'Penyelesaian', 'Issued Date', 'Closed Date',
+                  'Keterangan', 'Status', 'Umur (Hari)']
+
+
+def render_vessel_detail(vessel):
+    """Daftar laporan satu kapal (dari indeks per kapal), dengan paginasi dan urutan umur OPEN."""
+    st.subheader(f"🚢 Detail Kapal {vessel}")
+    try:
+        with metrics.timer('load'):
+            df, filter_index = load_indexed_data()
+    except Exception as e:
+        st.error(f"Gagal memuat data laporan. Error: {e}")
+        return
+
+    with metrics.timer('filter'):
+        df_vessel = filter_index.rows(df, 'Vessel', vessel)
+    if df_vessel.empty:
+        st.info(f"Belum ada laporan untuk kapal {vessel}.")
+        return
+
+    col_sort, col_status, col_back = st.columns([2, 2, 1])
+    with col_sort:
+        sort = st.selectbox(
+            "Urutkan", list(analysis.VESSEL_SORTS), key="vessel_detail_sort",
+            format_func=lambda key: analysis.VESSEL_SORTS[key],
+        )
+    with col_status:
+        statuses = st.multiselect(
+            "Status", sorted(df_vessel['Status'].astype(str).unique()), key="vessel_detail_status",
+        )
+    with col_back:
+        st.markdown('<div style="margin-top: 28px;"></div>', unsafe_allow_html=True)
+        if st.button("Tutup Detail", key="btn_close_vessel_detail", use_container_width=True):
+            st.session_state.selected_ship_code = None
+            st.rerun()
+
+    with metrics.timer('aggregate'):
+        if statuses:
+            df_vessel = df_vessel[df_vessel['Status'].isin(statuses)]
+        reports = analysis.vessel_reports(df_vessel, sort)
+
+    open_count = int((reports['Status'] == 'OPEN').sum())
+    col_open, col_total = st.columns(2)
+    col_open.metric("Laporan OPEN", open_count)
+    col_total.metric("Total Laporan", len(reports))
+
+    num_pages = max(1, -(-len(reports) // REPORTS_PER_PAGE))
+    page = 1
+    if num_pages > 1:
+        page = st.selectbox(
+            "Halaman", list(range(1, num_pages + 1)), key="vessel_detail_page",
+            format_func=lambda p: f"Halaman {p} dari {num_pages}",
+        )
+    with metrics.timer('render'):
+        st.dataframe(
+            reports.iloc[(page - 1) * REPORTS_PER_PAGE: page * REPORTS_PER_PAGE][DETAIL_COLUMNS],
+            column_config={"Umur (Hari)": st.column_config.NumberColumn(format="%d")},
+            hide_index=True,
+            use_container_width=True,
+        )
+    st.markdown("---")
+
+
+# --- Detail Kapal (dipilih dari Homepage) ---
+selected_ship_code = st.session_state.get('selected_ship_code')
+if selected_ship_code:
+    render_vessel_detail(selected_ship_code)
+
+# Laporan dicatat ke log lokal dulu, lalu dikirim ke Google Sheet di latar belakang.
+# Tanpa credentials Google Sheet, detail kapal tetap tampil; hanya form yang tidak bisa dipakai.
+try:
+    outbox = get_outbox()
+    outbox_error = None
+except Exception as e:
+    outbox = None
+    outbox_error = e
+
+# ID laporan dibuat di sisi klien; submit ganda dengan ID yang sama diabaikan
+if 'submission_id' not in st.session_state:
+    st.session_state.submission_id = new_submission_id()
+
+# --- Form Input ---
+with st.form("notulensi_form"):
+    day = st.text_input("Day")
+    vessel = st.text_input("Vessel", value=selected_ship_code or "")
+    permasalahan = st.text_area("Permasalahan")
+    penyelesaian = st.text_area("Penyelesaian")
+    unit = st.text_input("Unit")
+    issued_date = st.date_input("Issued Date")
+    closed_date = st.date_input("Closed Date", value=None)
+    keterangan = st.text_area("Keterangan")
+    status = st.selectbox("Status", ["Open", "Closed", "Pending"])
+
+    submitted = st.form_submit_button("Submit")
+
+    if submitted and outbox is None:
+        st.error(f"Koneksi ke Google Sheet belum tersedia, laporan tidak bisa dikirim. Error: {outbox_error}")
+    elif submitted:
+        # Ubah ke format list sesuai urutan kolom di Google Sheet
+        new_row = [
+            day,
+            vessel,
+            permasalahan,
+            penyelesaian,
+            unit,
+            issued_date.strftime("%Y-%m-%d"),
+            closed_date.strftime("%Y-%m-%d") if closed_date else "",
+            keterangan,
+            status
+        ]
+
+        # Simpan ke log lokal; pengiriman ke Google Sheet dilakukan worker
+        try:
+            with metrics.timer('outbox.submit'):
+                outbox.submit(new_row, st.session_state.submission_id)
+        except OSError as e:
+            st.error(f"Gagal menyimpan laporan. Error: {e}")
+            st.stop()
+        st.session_state.submission_id = new_submission_id()
+        st.success("✅ Data berhasil disimpan dan akan dikirim ke Google Sheet!")
+
+        # Optional: tampilkan preview data yang baru dikirim
+        st.subheader("Data yang dikirim:")
+        df_preview = pd.DataFrame([new_row], columns=[
+            "Day", "Vessel", "Permasalahan", "Penyelesaian", "Unit",
+            "Issued Date", "Closed Date", "Keterangan", "Status"
+        ])
+        st.dataframe(df_preview)
+
+# --- Status Pengiriman ---
+if outbox is not None:
+    outbox_status = outbox.status()
+    if outbox_status['pending']:
+        st.caption(f"⏳ {outbox_status['pending']} laporan menunggu dikirim ke Google Sheet.")
+    if outbox_status['last_error']:
+        st.warning(f"Pengiriman ke Google Sheet sedang dicoba ulang: {outbox_status['last_error']}")
+
+metrics_panel.render_panel()
@@ -1,344 +1,391 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-from datetime import datetime
-import os
-import numpy as np 
-
-# --- Logika Autentikasi ---
-if 'logged_in' not in st.session_state or not st.session_state.logged_in:
-    st.error("Anda harus login untuk mengakses halaman ini. Silakan kembali ke halaman utama.")
-    st.stop() 
-
-# --- PERUBAHAN UTAMA: Hapus Cek Kapal Terpilih ---
-# Dashboard ini sekarang beroperasi dalam mode GLOBAL (semua kapal)
-# VARIABEL KAPAL DIPILIH DIHAPUS (SELECTED_SHIP_CODE/NAME)
-# ----------------------------------------------------
-
-# --- Konfigurasi ---
-DATA_FILE = 'notulensi_kerusakan.csv' 
-COLUMNS = ['Day', 'Vessel', 'Permasalahan', 'Penyelesaian', 'Unit', 'Issued Date', 'Closed Date', 'Keterangan', 'Status'] 
-DATE_FORMAT = '%d/%m/%Y'
-
-# --- Fungsi Manajemen Data ---
-
-@st.cache_data() 
-def load_data_dashboard():
-    """Memuat SEMUA data dari CSV dan melakukan pre-processing untuk analisis GLOBAL."""
-    if os.path.exists(DATA_FILE):
-        try:
-            df = pd.read_csv(DATA_FILE)
-        except Exception as e:
-            st.error(f"Gagal memuat file data '{DATA_FILE}'. Error: {e}")
-            return pd.DataFrame()
-            
-        if 'Closed Date' not in df.columns:
-             df['Closed Date'] = pd.NA
-        
-        df['Vessel'] = df['Vessel'].astype(str).str.upper().str.strip()
-        df['Status'] = df.get('Status', 'OPEN').astype(str).str.upper()
-        df['Unit'] = df['Unit'].astype(str).str.upper().str.strip().fillna('TIDAK DITENTUKAN')
-
-        # Konversi tanggal
-        df['Date_Day'] = pd.to_datetime(df['Day'], format=DATE_FORMAT, errors='coerce')
-        df['Date_Issue'] = pd.to_datetime(df['Issued Date'], format=DATE_FORMAT, errors='coerce')
-        df['Date_Closed'] = pd.to_datetime(df['Closed Date'], format=DATE_FORMAT, errors='coerce') 
-
-        # Hapus baris di mana Date_Day tidak valid atau Vessel kosong
-        df = df.dropna(subset=['Date_Day', 'Vessel']).reset_index(drop=True)
-        
-        # Hitung Resolution Time (MTTR) dengan hari kalender INKLUSIF (+1)
-        df['Resolution_Time_Days'] = (df['Date_Closed'] - df['Date_Issue']).dt.days + 1
-        
-        # Bersihkan Resolution_Time_Days yang tidak valid
-        df.loc[df['Resolution_Time_Days'] <= 0, 'Resolution_Time_Days'] = np.nan
-        
-        return df # Mengembalikan SEMUA data
-    else:
-        st.info(f"File data '{DATA_FILE}' tidak ditemukan di lokasi yang diharapkan. Pastikan sudah ada.")
-        return pd.DataFrame()
-
-# --- Fungsi Callback untuk Tombol Select/Clear All ---
-def toggle_all_vessels():
-    # Fungsi ini tetap relevan karena sekarang kita melihat SEMUA kapal
-    all_vessels = st.session_state.all_vessels_list
-    current_selection = st.session_state.filter_vessel_dashboard
-    
-    if len(current_selection) == len(all_vessels):
-        # Jika semua sudah terpilih, clear selection
-        st.session_state.filter_vessel_dashboard = []
-    else:
-        # Jika belum semua terpilih, pilih semua
-        st.session_state.filter_vessel_dashboard = all_vessels
-
-# --- Tampilan Utama Dashboard ---
-
-st.title("📊 Dashboard Analisis Kerusakan Kapal (Global)")
-
-df = load_data_dashboard()
-
-if df.empty:
-    st.info("Data laporan kerusakan tidak ditemukan atau kosong. Silakan input data di halaman Laporan Aktif & Input.")
-    st.stop() 
-
-# --- Filter Global Tahun dan Kapal ---
-valid_years = df['Date_Day'].dt.year.dropna().astype(int).unique()
-year_options = ['All'] + sorted(valid_years.tolist(), reverse=True)
-all_vessels = sorted(df['Vessel'].dropna().unique().tolist())
-
-st.session_state.all_vessels_list = all_vessels
-
-
-with st.container(border=True): 
-    
-    col_filter_year, col_filter_vessel_select, col_spacer_top = st.columns([1, 2.7, 1.3])
-    
-    with col_filter_year:
-        selected_year = st.selectbox("Filter Tahun Kejadian", year_options, key="filter_tahun_dashboard")
-        
-    with col_filter_vessel_select:
-        # Menggunakan st.multiselect dengan DEFAULT=all_vessels
-        st.markdown("Kapal (Pilih 1 atau Lebih) - **Global View**") # Label manual
-        selected_vessels = st.multiselect(
-            "Filter Kapal (Pilih 1 atau Lebih)", # Label ini disembunyikan
-            options=all_vessels, 
-            default=all_vessels, 
-            key="filter_vessel_dashboard",
-            label_visibility='collapsed' # Sembunyikan label bawaan
-        )
-        
-        # Tombol Select All diletakkan di bawah filter Kapal (di kolom yang sama)
-        st.button(
-            "🔄 Pilih Semua / Bersihkan", 
-            on_click=toggle_all_vessels, 
-            use_container_width=True
-        )
-
-
-    # Filter data utama
-    df_filtered = df.copy()
-    
-    # Filter berdasarkan Tahun
-    if selected_year and selected_year != 'All':
-        df_filtered = df_filtered[df_filtered['Date_Day'].dt.year == int(selected_year)]
-
-    # Filter berdasarkan Kapal
-    if selected_vessels:
-        df_filtered = df_filtered[df_filtered['Vessel'].isin(selected_vessels)]
-    else:
-        df_filtered = pd.DataFrame()
-
-
-    # === Bagian 1: Ringkasan Metrik & KPI ===
-    if df_filtered.empty:
-        total = open_count = closed_count = 0
-        avg_res_time = "N/A"
-    else:
-        total = len(df_filtered)
-        open_count = len(df_filtered[df_filtered['Status'] == 'OPEN'])
-        closed_count = len(df_filtered[df_filtered['Status'] == 'CLOSED'])
-        
-        df_closed = df_filtered[df_filtered['Status'] == 'CLOSED'].copy()
-        if not df_closed.empty and df_closed['Resolution_Time_Days'].notna().any():
-            avg_res_time = df_closed[df_closed['Resolution_Time_Days'] > 0]['Resolution_Time_Days'].mean() 
-        else:
-            avg_res_time = "N/A"
-
-    st.markdown("##### Ringkasan Status Laporan (Total: **{}**) - Data diambil per {}".format(total, datetime.now().strftime('%H:%M:%S')))
-    
-    col_open, col_closed, col_avg_days_res = st.columns(3) 
-
-    col_open.metric("Laporan Masih OPEN", open_count)
-    col_closed.metric("Laporan Sudah CLOSED", closed_count)
-    
-    col_avg_days_res.metric("Avg. Waktu Penyelesaian (MTTR)", f"{avg_res_time:,.1f} Hari" if avg_res_time != "N/A" else "N/A")
-
-st.markdown("---")
-
-# =========================================================
-# === Bagian 2: Analisis Detail Menggunakan Tabs (Sama seperti sebelumnya) ===
-# =========================================================
-
-tab_unit, tab_vessel, tab_time, tab_kpi = st.tabs(["📊 Analisis Unit/Sistem", "⚓ Kinerja Kapal", "📈 Tren Kerusakan", "🏆 Metrik Efisiensi (MTTR)"])
-
-# --- Cek data kosong global untuk semua tab ---
-if df_filtered.empty:
-    with tab_unit: st.info("Tidak ada data untuk kombinasi filter yang dipilih.")
-    with tab_vessel: st.info("Tidak ada data untuk kombinasi filter yang dipilih.")
-    with tab_time: st.info("Tidak ada data untuk kombinasi filter yang dipilih.")
-    with tab_kpi: st.info("Tidak ada data untuk kombinasi filter yang dipilih.")
-    st.stop()
-
-
-# --- TAB 1: ANALISIS UNIT/SISTEM ---
-with tab_unit:
-    st.subheader("Penyebaran Kerusakan berdasarkan Unit/Sistem")
-    
-    col_bar, col_spacer, col_pie = st.columns([2, 0.1, 1])
-
-    unit_counts = df_filtered['Unit'].value_counts().reset_index()
-    unit_counts.columns = ['Unit', 'Jumlah Kerusakan']
-    
-    fig_unit_bar = px.bar(
-        unit_counts.head(10).sort_values(by='Jumlah Kerusakan', ascending=True),
-        x='Jumlah Kerusakan',
-        y='Unit', 
-        title='Top 10 Unit Paling Bermasalah',
-        color='Jumlah Kerusakan',
-        color_continuous_scale=px.colors.sequential.Sunset,
-        orientation='h'
-    )
-    fig_unit_bar.update_layout(xaxis_title="Jumlah Kerusakan", yaxis_title="")
-    col_bar.plotly_chart(fig_unit_bar, use_container_width=True)
-    
-    top_units = unit_counts['Unit'].head(5).tolist()
-    if top_units:
-        df_top_unit = df_filtered[df_filtered['Unit'].isin(top_units)]
-        
-        status_counts_top_unit = df_top_unit['Status'].value_counts().reset_index()
-        status_counts_top_unit.columns = ['Status', 'Count']
-        
-        fig_unit_pie = px.pie(
-            status_counts_top_unit,
-            values='Count',
-            names='Status',
-            title=f'Status Laporan pada Top {len(top_units)} Unit',
-            hole=0.3,
-            color_discrete_map={'OPEN':'red', 'CLOSED':'green'}
-        )
-        col_pie.plotly_chart(fig_unit_pie, use_container_width=True)
-    else:
-        col_pie.info("Tidak cukup data untuk analisis Top Unit.")
-
-# --- TAB 2: KINERJA KAPAL ---
-with tab_vessel:
-    st.subheader("Analisis Kinerja Kerusakan per Kapal")
-
-    vessel_counts = df_filtered['Vessel'].value_counts().reset_index()
-    vessel_counts.columns = ['Vessel', 'Total Kerusakan']
-    
-    fig_vessel_bar = px.bar(
-        vessel_counts.sort_values(by='Total Kerusakan', ascending=True),
-        x='Total Kerusakan',
-        y='Vessel',
-        title='Total Kerusakan Berdasarkan Kapal',
-        color='Total Kerusakan',
-        color_continuous_scale=px.colors.sequential.Viridis,
-        orientation='h'
-    )
-    fig_vessel_bar.update_layout(xaxis_title="Jumlah Kerusakan", yaxis_title="")
-    st.plotly_chart(fig_vessel_bar, use_container_width=True)
-
-    st.markdown("##### Laporan OPEN Terbanyak per Kapal")
-    df_vessel_open = df_filtered[df_filtered['Status'] == 'OPEN']
-    vessel_open_counts = df_vessel_open.groupby('Vessel').size().sort_values(ascending=False).reset_index(name='Jumlah OPEN')
-    
-    st.data_editor(
-        vessel_open_counts,
-        column_config={
-            "Jumlah OPEN": st.column_config.NumberColumn(
-                "Jumlah OPEN",
-                format="%d", 
-                help="Total laporan yang masih OPEN",
-                width="small" 
-            )
-        },
-        column_order=['Vessel', 'Jumlah OPEN'],
-        hide_index=True,
-        use_container_width=True,
-        disabled=True 
-    )
-
-# --- TAB 3: TREN KERUSAKAN ---
-with tab_time:
-    st.subheader("Tren Laporan Kerusakan dari Waktu ke Waktu")
-    
-    df_filtered['Month'] = df_filtered['Date_Day'].dt.to_period('M')
-    
-    monthly_trend = df_filtered.groupby(['Month', 'Status']).size().reset_index(name='Jumlah')
-    monthly_trend['Month'] = monthly_trend['Month'].astype(str)
-    
-    fig_trend = px.line(
-        monthly_trend,
-        x='Month',
-        y='Jumlah',
-        color='Status',
-        title='Tren Laporan OPEN vs CLOSED per Bulan',
-        markers=True,
-        color_discrete_map={'OPEN':'red', 'CLOSED':'green'}
-    )
-    fig_trend.update_layout(xaxis_title="Bulan", yaxis_title="Jumlah Laporan")
-    st.plotly_chart(fig_trend, use_container_width=True)
-    
-    st.markdown("##### Timeline 15 Permasalahan Aktif (OPEN) Terlama")
-    
-    df_open_timeline = df_filtered[df_filtered['Status'] == 'OPEN'].copy()
-    
-    if not df_open_timeline.empty:
-        df_open_timeline['Duration'] = (datetime.now() - df_open_timeline['Date_Day']).dt.days
-        df_open_timeline = df_open_timeline.sort_values('Duration', ascending=False).head(15).copy()
-        
-        df_open_timeline['Current_Time'] = datetime.now()
-        
-        df_open_timeline['Label'] = df_open_timeline['Vessel'] + ' - ' + df_open_timeline['Permasalahan'].str.slice(0, 30) + '...'
-
-        fig_timeline = px.timeline(
-            df_open_timeline,
-            x_start="Date_Day",
-            x_end="Current_Time", 
-            y="Label",
-            color="Vessel",
-            title="Timeline Durasi 15 Laporan OPEN Terlama",
-            text="Duration"
-        )
-        fig_timeline.update_yaxes(autorange="reversed") 
-        fig_timeline.update_traces(textposition='inside', marker_line_width=0, opacity=0.8) 
-        fig_timeline.update_layout(xaxis_title="Tanggal", yaxis_title="")
-        st.plotly_chart(fig_timeline, use_container_width=True)
-    else:
-        st.info("Tidak ada laporan yang berstatus OPEN dalam kombinasi filter ini.")
-
-# --- TAB 4: METRIK EFISIENSI (MTTR) ---
-with tab_kpi:
-    st.subheader("🏆 Metrik Efisiensi Perbaikan (MTTR)")
-    
-    df_closed_mttr = df_filtered[df_filtered['Status'] == 'CLOSED'].copy()
-
-    if not df_closed_mttr.empty:
-        # 1. Hitung MTTR (rata-rata Resolution_Time_Days) per Unit
-        mttr_unit = df_closed_mttr.groupby('Unit')['Resolution_Time_Days'].mean().reset_index(name='MTTR (Hari)')
-
-        # 2. Hitung Jumlah Kerusakan (untuk konteks)
-        failure_counts = df_filtered.groupby('Unit').size().reset_index(name='Jumlah Kerusakan')
-        
-        # 3. Gabungkan dan sort
-        mttr_display = pd.merge(mttr_unit, failure_counts, on='Unit', how='left').fillna({'Jumlah Kerusakan': 0})
-        
-        # SORTING: Diurutkan dari yang tercepat (MTTR terkecil/Ascending)
-        mttr_display = mttr_display.sort_values(by='MTTR (Hari)', ascending=True).reset_index(drop=True)
-
-        st.info("Analisis **MTTR (Mean Time to Repair)** dihitung dari laporan yang sudah CLOSED dan diurutkan berdasarkan **waktu perbaikan tercepat**.")
-
-        st.markdown("##### 1. Efisiensi Perbaikan (MTTR) per Unit (Tercepat ke Terlambat)")
-        
-        st.data_editor(
-            mttr_display,
-            column_config={
-                "MTTR (Hari)": st.column_config.NumberColumn(
-                    "MTTR (Hari)",
-                    format="%.1f",
-                    help="Rata-rata Waktu yang dibutuhkan untuk menutup laporan (Semakin Kecil, Semakin Cepat Perbaikan)"
-                ),
-                "Jumlah Kerusakan": st.column_config.NumberColumn(
-                    "Total Kerusakan", 
-                    format="%d",
-                    width="small"
-                )
-            },
-            column_order=['Unit', 'MTTR (Hari)', 'Jumlah Kerusakan'],
-            hide_index=True,
-            use_container_width=True,
-            disabled=True
-        )
-    else:
-        st.warning("Tidak ada laporan yang berstatus CLOSED dalam kombinasi filter ini, sehingga MTTR per Unit tidak dapat dihitung.")
+import streamlit as st
+import pandas as pd
+from datetime import date, datetime
+
+from notulensi import analysis, figures, metrics, metrics_panel, recurrence
+from notulensi.cache import get_figure_cache, load_aging_report, load_indexed_data, load_recurrence
+
+metrics_panel.begin_page('Analisis Dashboard')
+
+# --- Logika Autentikasi ---
+if 'logged_in' not in st.session_state or not st.session_state.logged_in:
+    st.error("Anda harus login untuk mengakses halaman ini. Silakan kembali ke halaman utama.")
+    st.stop() 
+
+# --- PERUBAHAN UTAMA: Hapus Cek Kapal Terpilih ---
+# Dashboard ini sekarang beroperasi dalam mode GLOBAL (semua kapal)
+# VARIABEL KAPAL DIPILIH DIHAPUS (SELECTED_SHIP_CODE/NAME)
+# ----------------------------------------------------
+
+# --- Fungsi Manajemen Data ---
+
+def load_data_dashboard():
+    """
+    Mengambil SEMUA data dari data master bersama (sudah dibersihkan dan
+    bertipe) beserta indeks filternya. Data bisa berasal dari CSV histori,
+    snapshot Google Sheet, atau keduanya; jika tidak ada sama sekali, frame
+    kosong dikembalikan.
+    """
+    try:
+        return load_indexed_data()
+    except Exception as e:
+        st.error(f"Gagal memuat data laporan. Error: {e}")
+        return pd.DataFrame(), None
+
+# --- Fungsi Callback untuk Tombol Select/Clear All ---
+def toggle_all_vessels():
+    # Fungsi ini tetap relevan karena sekarang kita melihat SEMUA kapal
+    all_vessels = st.session_state.all_vessels_list
+    current_selection = st.session_state.filter_vessel_dashboard
+    
+    if len(current_selection) == len(all_vessels):
+        # Jika semua sudah terpilih, clear selection
+        st.session_state.filter_vessel_dashboard = []
+    else:
+        # Jika belum semua terpilih, pilih semua
+        st.session_state.filter_vessel_dashboard = all_vessels
+
+# --- Tampilan Utama Dashboard ---
+
+st.title("📊 Dashboard Analisis Kerusakan Kapal (Global)")
+
+with metrics.timer('load'):
+    df, filter_index = load_data_dashboard()
+
+if df.empty:
+    st.info("Data laporan kerusakan tidak ditemukan atau kosong. Silakan input data di halaman Laporan Aktif & Input.")
+    st.stop() 
+
+# --- Filter Global Tahun dan Kapal ---
+valid_years = filter_index.values('Year')
+year_options = ['All'] + sorted(valid_years, reverse=True)
+all_vessels = filter_index.values('Vessel')
+
+st.session_state.all_vessels_list = all_vessels
+
+
+with st.container(border=True): 
+    
+    col_filter_year, col_filter_vessel_select, col_spacer_top = st.columns([1, 2.7, 1.3])
+    
+    with col_filter_year:
+        selected_year = st.selectbox("Filter Tahun Kejadian", year_options, key="filter_tahun_dashboard")
+        
+    with col_filter_vessel_select:
+        # Menggunakan st.multiselect dengan DEFAULT=all_vessels
+        st.markdown("Kapal (Pilih 1 atau Lebih) - **Global View**") # Label manual
+        selected_vessels = st.multiselect(
+            "Filter Kapal (Pilih 1 atau Lebih)", # Label ini disembunyikan
+            options=all_vessels, 
+            default=all_vessels, 
+            key="filter_vessel_dashboard",
+            label_visibility='collapsed' # Sembunyikan label bawaan
+        )
+        
+        # Tombol Select All diletakkan di bawah filter Kapal (di kolom yang sama)
+        st.button(
+            "🔄 Pilih Semua / Bersihkan", 
+            on_click=toggle_all_vessels, 
+            use_container_width=True
+        )
+
+
+    # Filter data utama (tahun dan kapal) lewat indeks posisi baris
+    with metrics.timer('filter'):
+        df_filtered = filter_index.query(df, year=selected_year, vessels=selected_vessels)
+
+
+    # === Bagian 1: Ringkasan Metrik & KPI ===
+    # Semua metrik untuk ringkasan dan keempat tab dihitung dalam satu agregasi
+    with metrics.timer('aggregate'):
+        kpis = analysis.compute_dashboard_kpis(df_filtered)
+    total, open_count, closed_count, avg_res_time = kpis.total, kpis.open_count, kpis.closed_count, kpis.avg_res_time
+
+    st.markdown("##### Ringkasan Status Laporan (Total: **{}**) - Data diambil per {}".format(total, datetime.now().strftime('%H:%M:%S')))
+    
+    col_open, col_closed, col_avg_days_res = st.columns(3) 
+
+    col_open.metric("Laporan Masih OPEN", open_count)
+    col_closed.metric("Laporan Sudah CLOSED", closed_count)
+    
+    col_avg_days_res.metric("Avg. Waktu Penyelesaian (MTTR)", f"{avg_res_time:,.1f} Hari" if avg_res_time != "N/A" else "N/A")
+
+st.markdown("---")
+
+# =========================================================
+# === Bagian 2: Analisis Detail Menggunakan Tabs ===
+# =========================================================
+
+# Figure dibagi lintas sesi, di-cache per (versi data, tahun, himpunan kapal, chart).
+# plotly.express hanya diimpor di dalam fungsi build_*, yaitu saat figure belum ada di cache.
+figure_cache = get_figure_cache()
+
+
+def cached_figure(chart_id, build):
+    """
+    Figure yang dibuat hanya saat tab-nya dibuka dan hanya sekali per
+    kombinasi filter di seluruh server. st.plotly_chart tetap men-serialisasi
+    figure di setiap rerun (lihat figures.FigureCache).
+    """
+    key = figures.figure_key(filter_index.version, selected_year, selected_vessels, chart_id)
+    return figure_cache.get_or_build(key, build)
+
+
+# --- TAB 1: ANALISIS UNIT/SISTEM ---
+def render_tab_unit():
+    st.subheader("Penyebaran Kerusakan berdasarkan Unit/Sistem")
+    
+    col_bar, col_spacer, col_pie = st.columns([2, 0.1, 1])
+
+    unit_counts = kpis.unit_counts
+    
+    def build_unit_bar():
+        import plotly.express as px
+        fig_unit_bar = px.bar(
+            unit_counts.head(10).sort_values(by='Jumlah Kerusakan', ascending=True),
+            x='Jumlah Kerusakan',
+            y='Unit', 
+            title='Top 10 Unit Paling Bermasalah',
+            color='Jumlah Kerusakan',
+            color_continuous_scale=px.colors.sequential.Sunset,
+            orientation='h'
+        )
+        fig_unit_bar.update_layout(xaxis_title="Jumlah Kerusakan", yaxis_title="")
+        return fig_unit_bar
+
+    col_bar.plotly_chart(cached_figure('unit_bar', build_unit_bar), use_container_width=True)
+    
+    top_units = unit_counts['Unit'].head(5).tolist()
+    if top_units:
+        status_counts_top_unit = kpis.top_unit_status_counts
+        
+        def build_unit_pie():
+            import plotly.express as px
+            return px.pie(
+                status_counts_top_unit,
+                values='Count',
+                names='Status',
+                title=f'Status Laporan pada Top {len(top_units)} Unit',
+                hole=0.3,
+                color_discrete_map={'OPEN':'red', 'CLOSED':'green'}
+            )
+
+        col_pie.plotly_chart(cached_figure('unit_pie', build_unit_pie), use_container_width=True)
+    else:
+        col_pie.info("Tidak cukup data untuk analisis Top Unit.")
+
+# --- TAB 2: KINERJA KAPAL ---
+def render_tab_vessel():
+    st.subheader("Analisis Kinerja Kerusakan per Kapal")
+
+    vessel_counts = kpis.vessel_counts
+    
+    def build_vessel_bar():
+        import plotly.express as px
+        fig_vessel_bar = px.bar(
+            vessel_counts.sort_values(by='Total Kerusakan', ascending=True),
+            x='Total Kerusakan',
+            y='Vessel',
+            title='Total Kerusakan Berdasarkan Kapal',
+            color='Total Kerusakan',
+            color_continuous_scale=px.colors.sequential.Viridis,
+            orientation='h'
+        )
+        fig_vessel_bar.update_layout(xaxis_title="Jumlah Kerusakan", yaxis_title="")
+        return fig_vessel_bar
+
+    st.plotly_chart(cached_figure('vessel_bar', build_vessel_bar), use_container_width=True)
+
+    st.markdown("##### Laporan OPEN Terbanyak per Kapal")
+    vessel_open_counts = kpis.open_per_vessel
+    
+    st.data_editor(
+        vessel_open_counts,
+        column_config={
+            "Jumlah OPEN": st.column_config.NumberColumn(
+                "Jumlah OPEN",
+                format="%d", 
+                help="Total laporan yang masih OPEN",
+                width="small" 
+            )
+        },
+        column_order=['Vessel', 'Jumlah OPEN'],
+        hide_index=True,
+        use_container_width=True,
+        disabled=True 
+    )
+
+# --- TAB 3: TREN KERUSAKAN ---
+def render_tab_time():
+    st.subheader("Tren Laporan Kerusakan dari Waktu ke Waktu")
+    
+    # Granularitas tren (minggu/bulan/kuartal) dipilih otomatis dari rentang tanggal
+    trend = kpis.trend
+    period_title = analysis.trend_bucket_title(kpis.trend_bucket)
+    
+    def build_trend():
+        import plotly.express as px
+        fig_trend = px.line(
+            trend,
+            x='Periode',
+            y='Jumlah',
+            color='Status',
+            title=f'Tren Laporan OPEN vs CLOSED per {period_title}',
+            markers=True,
+            color_discrete_map={'OPEN':'red', 'CLOSED':'green'}
+        )
+        fig_trend.update_layout(xaxis_title=period_title, yaxis_title="Jumlah Laporan")
+        return fig_trend
+
+    st.plotly_chart(cached_figure('trend', build_trend), use_container_width=True)
+    
+    st.markdown("##### Timeline 15 Permasalahan Aktif (OPEN) Terlama")
+    
+    def build_timeline():
+        df_open_timeline = analysis.oldest_open_reports(df_filtered, n=15)
+        if df_open_timeline.empty:
+            return None
+        import plotly.express as px
+        fig_timeline = px.timeline(
+            df_open_timeline,
+            x_start="Start_Date",
+            x_end="Current_Time", 
+            y="Label",
+            color="Vessel",
+            title="Timeline Durasi 15 Laporan OPEN Terlama",
+            text="Duration"
+        )
+        fig_timeline.update_yaxes(autorange="reversed") 
+        fig_timeline.update_traces(textposition='inside', marker_line_width=0, opacity=0.8) 
+        fig_timeline.update_layout(xaxis_title="Tanggal", yaxis_title="")
+        return fig_timeline
+
+    # Durasi dihitung terhadap hari ini, jadi figure timeline di-cache per tanggal
+    fig_timeline = cached_figure(f'timeline:{date.today().isoformat()}', build_timeline)
+    if fig_timeline is not None:
+        st.plotly_chart(fig_timeline, use_container_width=True)
+    else:
+        st.info("Tidak ada laporan yang berstatus OPEN dalam kombinasi filter ini.")
+
+    # Umur & SLA dihitung berkala oleh scheduler latar belakang (semua tahun, status hari ini)
+    aging_report = load_aging_report()
+    vessel_set = set(selected_vessels)
+    aging_buckets = aging_report.buckets[aging_report.buckets['Vessel'].isin(vessel_set)]
+    sla_breaches = aging_report.breaches[aging_report.breaches['Vessel'].isin(vessel_set)]
+
+    st.markdown("##### Umur Laporan OPEN per Kapal & Unit (Hari)")
+    st.caption(f"Dihitung {aging_report.computed_at:%d/%m/%Y %H:%M}; mencakup semua laporan OPEN tanpa filter tahun.")
+    if aging_buckets.empty:
+        st.info("Tidak ada laporan OPEN untuk kapal yang dipilih.")
+    else:
+        st.dataframe(aging_buckets, hide_index=True, use_container_width=True)
+
+    st.markdown(f"##### Pelanggaran SLA (OPEN > {aging_report.sla_days} Hari): {len(sla_breaches)} laporan")
+    if not sla_breaches.empty:
+        st.dataframe(sla_breaches, hide_index=True, use_container_width=True)
+
+# --- TAB 4: METRIK EFISIENSI (MTTR) ---
+def render_tab_kpi():
+    st.subheader("🏆 Metrik Efisiensi Perbaikan (MTTR)")
+    
+    # MTTR per Unit, diurutkan dari yang tercepat (MTTR terkecil/Ascending)
+    mttr_display = kpis.mttr_per_unit
+
+    if not mttr_display.empty:
+        st.info("Analisis **MTTR (Mean Time to Repair)** dihitung dari laporan yang sudah CLOSED dan diurutkan berdasarkan **waktu perbaikan tercepat**.")
+
+        st.markdown("##### 1. Efisiensi Perbaikan (MTTR) per Unit (Tercepat ke Terlambat)")
+        
+        st.data_editor(
+            mttr_display,
+            column_config={
+                "MTTR (Hari)": st.column_config.NumberColumn(
+                    "MTTR (Hari)",
+                    format="%.1f",
+                    help="Rata-rata Waktu yang dibutuhkan untuk menutup laporan (Semakin Kecil, Semakin Cepat Perbaikan)"
+                ),
+                "Jumlah Kerusakan": st.column_config.NumberColumn(
+                    "Total Kerusakan", 
+                    format="%d",
+                    width="small"
+                )
+            },
+            column_order=['Unit', 'MTTR (Hari)', 'Jumlah Kerusakan'],
+            hide_index=True,
+            use_container_width=True,
+            disabled=True
+        )
+    else:
+        st.warning("Tidak ada laporan yang berstatus CLOSED dalam kombinasi filter ini, sehingga MTTR per Unit tidak dapat dihitung.")
+
+
+# --- TAB 5: MASALAH BERULANG ---
+def render_tab_recurring():
+    st.subheader("🔁 Masalah Berulang (Laporan Mirip per Kapal & Unit)")
+
+    # Klaster dihitung sekali per versi data untuk seluruh armada, lalu dipotong sesuai filter
+    clusters = load_recurrence(filter_index.version, df)
+    issues = recurrence.recurring_issues(df_filtered, clusters)
+
+    col_reports, col_unique, col_clusters = st.columns(3)
+    col_reports.metric("Laporan OPEN", open_count)
+    col_unique.metric(
+        "Masalah OPEN Unik", recurrence.unique_open_count(df_filtered, clusters),
+        help="Laporan OPEN yang mirip (kapal & unit sama) dihitung sebagai satu masalah"
+    )
+    col_clusters.metric("Masalah Berulang", len(issues))
+
+    if issues.empty:
+        st.info("Tidak ada laporan berulang dalam kombinasi filter ini.")
+        return
+
+    st.data_editor(
+        issues,
+        column_config={
+            "Permasalahan": st.column_config.TextColumn("Permasalahan (terbaru)", width="large"),
+            "Jumlah Laporan": st.column_config.NumberColumn("Jumlah Laporan", format="%d", width="small"),
+            "OPEN": st.column_config.NumberColumn("OPEN", format="%d", width="small"),
+            "Pertama": st.column_config.DateColumn("Pertama", format="DD/MM/YYYY"),
+            "Terakhir": st.column_config.DateColumn("Terakhir", format="DD/MM/YYYY"),
+        },
+        hide_index=True,
+        use_container_width=True,
+        disabled=True
+    )
+
+
+# --- Render Tab ---
+# Mode lazy: hanya tab yang sedang dilihat yang dihitung dan dikirim ke browser.
+# Set LAZY_TABS = False untuk kembali ke st.tabs (semua tab dirender setiap rerun).
+LAZY_TABS = True
+TABS = {
+    "📊 Analisis Unit/Sistem": render_tab_unit,
+    "⚓ Kinerja Kapal": render_tab_vessel,
+    "📈 Tren Kerusakan": render_tab_time,
+    "🏆 Metrik Efisiensi (MTTR)": render_tab_kpi,
+    "🔁 Masalah Berulang": render_tab_recurring,
+}
+
+
+def render_tab(render):
+    # --- Cek data kosong global untuk semua tab ---
+    if df_filtered.empty:
+        st.info("Tidak ada data untuk kombinasi filter yang dipilih.")
+    else:
+        # Termasuk pembuatan figure (jika tidak ada di cache) dan serialisasi Plotly
+        with metrics.timer('render'):
+            render()
+
+
+if LAZY_TABS:
+    active_tab = st.radio(
+        "Tab Analisis", list(TABS), horizontal=True,
+        key="dashboard_active_tab", label_visibility='collapsed'
+    )
+    render_tab(TABS[active_tab])
+else:
+    for tab, render in zip(st.tabs(list(TABS)), TABS.values()):
+        with tab:
+            render_tab(render)
+
+metrics_panel.render_panel()
@@ -0,0 +1,48 @@
+import streamlit as st
+
+from notulensi import metrics, metrics_panel
+from notulensi.cache import load_indexed_data, search_reports
+from notulensi.search import RESULT_COLUMNS
+
+metrics_panel.begin_page('Pencarian Laporan')
+
+# --- Logika Autentikasi ---
+if 'logged_in' not in st.session_state or not st.session_state.logged_in:
+    st.error("Anda harus login untuk mengakses halaman ini. Silakan kembali ke halaman utama.")
+    st.stop()
+
+# Jumlah maksimum hasil yang ditampilkan
+MAX_RESULTS = 500
+
+st.title("🔎 Pencarian Laporan Kerusakan")
+st.markdown("Cari di kolom Permasalahan, Penyelesaian dan Keterangan. "
+            "Setiap kata dicocokkan sebagai awalan, mis. `pomp bahan bakar AE`.")
+
+try:
+    with metrics.timer('load'):
+        df, filter_index = load_indexed_data()
+except Exception as e:
+    st.error(f"Gagal memuat data laporan. Error: {e}")
+    st.stop()
+
+query = st.text_input("Kata kunci", key="search_query", placeholder="mis. fuel pump AE")
+
+col_vessel, col_unit, col_status = st.columns(3)
+with col_vessel:
+    vessels = st.multiselect("Kapal", filter_index.values('Vessel'), key="search_vessels")
+with col_unit:
+    units = st.multiselect("Unit", filter_index.values('Unit'), key="search_units")
+with col_status:
+    statuses = st.multiselect("Status", filter_index.values('Status'), key="search_statuses")
+
+if query.strip():
+    results = search_reports(query, vessels, units, statuses)
+    if results.empty:
+        st.info("Tidak ada laporan yang cocok.")
+    else:
+        st.caption(f"{len(results)} laporan ditemukan"
+                   + (f", menampilkan {MAX_RESULTS} terbaru." if len(results) > MAX_RESULTS else "."))
+        with metrics.timer('render'):
+            st.dataframe(results.head(MAX_RESULTS)[RESULT_COLUMNS], hide_index=True, use_container_width=True)
+
+metrics_panel.render_panel()
@@ -1,8 +1,8 @@
 import streamlit as st
-import pandas as pd
-from datetime import datetime
-import os
-import numpy as np 
+
+# Halaman login tidak membutuhkan pandas/numpy/plotly: modul berat baru
+# diimpor oleh halaman yang memakainya, atau lebih dulu oleh warm-up
+# latar belakang setelah login (lihat notulensi/warmup.py).
 
 # --- Konfigurasi ---
 USERNAME = "staffdpagls" 
@@ -20,11 +20,8 @@ if 'logged_in' not in st.session_state:
     st.session_state.logged_in = False
 if 'selected_ship_code' not in st.session_state:
     st.session_state.selected_ship_code = None
-    
-# Inisialisasi data master (Penting untuk Cache Lintas Halaman)
-if 'data_master_df' not in st.session_state:
-    COLUMNS = ['Day', 'Vessel', 'Permasalahan', 'Penyelesaian', 'Unit', 'Issued Date', 'Closed Date', 'Keterangan', 'Status'] 
-    st.session_state['data_master_df'] = pd.DataFrame(columns=COLUMNS + ['Date_Day'])
+# Data master tidak disimpan per sesi: semua halaman membaca dataset bersama
+# (satu per proses) lewat notulensi.cache.
 
 
 # --- MAIN LOGIC ---
@@ -71,6 +68,8 @@ if not st.session_state.logged_in:
             if username_input == USERNAME and password_input == PASSWORD:
                 st.session_state.logged_in = True
                 st.session_state.username = username_input
+                from notulensi import warmup
+                warmup.start()
                 st.success("Login Berhasil! Mengalihkan ke Homepage...")
                 # PENTING: Redirect ke halaman Home
                 st.switch_page("pages/Home.py") 
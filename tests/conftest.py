@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+
+from notulensi import COLUMNS, data, storage
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path, monkeypatch):
+    # Checkpoint Parquet dan export jangan ditulis ke cache/ milik repo
+    monkeypatch.setattr(storage, 'CACHE_DIR', str(tmp_path / 'cache'))
+
+
+@pytest.fixture
+def frame():
+    """Bangun frame hasil normalize_frame dari baris mentah berkolom COLUMNS."""
+    def build(rows):
+        return data.normalize_frame(pd.DataFrame(rows, columns=COLUMNS))
+    return build
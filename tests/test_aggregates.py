@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+
+from notulensi.aggregates import CUBE_KEYS, build_cube, fleet_summary, merge_cube, subtract_cube
+
+
+@pytest.fixture
+def df(frame):
+    return frame([
+        ['01/07/2024', 'ND', 'A', '', 'ME', '01/07/2024', '03/07/2024', '', 'CLOSED'],
+        ['02/07/2024', 'ND', 'B', '', 'ME', '02/07/2024', '', '', 'OPEN'],
+        ['05/01/2025', 'ND', 'C', '', 'ME', '05/01/2025', '', '', 'OPEN'],
+        ['06/02/2025', 'KS', 'D', '', 'AE', '06/02/2025', '10/02/2025', '', 'CLOSED'],
+        ['07/03/2025', 'KS', 'E', '', 'AE', '07/03/2025', '', '', 'OPEN'],
+        ['08/04/2025', 'ND', 'F', '', 'ME', '08/04/2025', '', '', 'OPEN'],
+        ['09/05/2024', 'KS', 'G', '', 'AE', '09/05/2024', '12/05/2024', '', 'CLOSED'],
+    ])
+
+
+def _sorted(cube):
+    return cube.sort_values(CUBE_KEYS).reset_index(drop=True)
+
+
+def test_merged_deltas_match_full_cube(df):
+    cube = build_cube(df.iloc[:0])
+    for start in range(0, len(df), 3):
+        cube = merge_cube(cube, build_cube(df.iloc[start:start + 3]))
+
+    pd.testing.assert_frame_equal(_sorted(cube), _sorted(build_cube(df)), check_dtype=False)
+
+
+def test_subtracted_rows_leave_counts_of_the_rest(df):
+    cube = subtract_cube(build_cube(df), build_cube(df.iloc[:3]))
+    rest = build_cube(df.iloc[3:])
+
+    counts = _sorted(cube)[CUBE_KEYS + ['Count']]
+    pd.testing.assert_frame_equal(counts, _sorted(rest)[CUBE_KEYS + ['Count']], check_dtype=False)
+
+
+def test_fleet_summary_year_filter(df):
+    cube = build_cube(df)
+
+    result, total_open, total_closed = fleet_summary(cube, 2024)
+    assert result.set_index('Vessel')[['OPEN', 'CLOSED']].to_dict('index') == {
+        'KS': {'OPEN': 0, 'CLOSED': 1},
+        'ND': {'OPEN': 1, 'CLOSED': 1},
+    }
+    assert (total_open, total_closed) == (1, 2)
+
+    _, total_open, total_closed = fleet_summary(cube)
+    assert (total_open, total_closed) == (4, 3)
+    # Tanggal inspeksi terakhir tetap dari seluruh tahun
+    assert result.set_index('Vessel')['last_inspection'].to_dict() == {'KS': '07/03/2025', 'ND': '08/04/2025'}
@@ -0,0 +1,16 @@
+from datetime import date
+
+from notulensi.aging import compute_aging
+
+
+def test_open_report_without_day_is_aged_from_issued_date(frame):
+    df = frame([
+        ['01/06/2025', 'ND', 'Pompa bocor', '', 'ME', '01/06/2025', '', '', 'OPEN'],
+        ['', 'ND', 'Alarm mati', '', 'AE', '10/07/2025', '', '', 'OPEN'],
+        ['01/07/2025', 'ND', 'Lampu putus', '', 'AE', '01/07/2025', '05/07/2025', '', 'CLOSED'],
+    ])
+    report = compute_aging(df, today=date(2025, 8, 15), sla_days=30)
+
+    assert report.buckets[['0-7', '8-30', '31-90', '90+']].to_numpy().sum() == 2
+    assert report.breaches['Permasalahan'].tolist() == ['Pompa bocor', 'Alarm mati']
+    assert report.breaches['Umur (Hari)'].tolist() == [75, 36]
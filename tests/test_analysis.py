@@ -0,0 +1,106 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from notulensi import analysis
+
+
+@pytest.fixture
+def df(frame):
+    return frame([
+        ['01/07/2025', 'ND', 'A', '', 'ME', '01/07/2025', '03/07/2025', '', 'CLOSED'],
+        ['02/07/2025', 'ND', 'B', '', 'ME', '02/07/2025', '', '', 'OPEN'],
+        ['05/07/2025', 'KS', 'C', '', 'AE', '05/07/2025', '14/07/2025', '', 'CLOSED'],
+        ['10/08/2025', 'KS', 'D', '', 'ME', '10/08/2025', '', '', 'OPEN'],
+        ['11/08/2025', 'KS', 'E', '', 'AE', '11/08/2025', '', '', 'OPEN'],
+        ['12/08/2025', 'BL', 'F', '', 'ME', '12/08/2025', '12/08/2025', '', 'CLOSED'],
+    ])
+
+
+def test_summary_counts_and_mttr(df):
+    kpis = analysis.compute_dashboard_kpis(df)
+    assert (kpis.total, kpis.open_count, kpis.closed_count) == (6, 3, 3)
+    # Hari kalender inklusif: 3, 10 dan 1 hari
+    assert kpis.avg_res_time == pytest.approx(14 / 3)
+
+
+def test_unit_and_vessel_counts(df):
+    kpis = analysis.compute_dashboard_kpis(df)
+    assert kpis.unit_counts.values.tolist() == [['ME', 4], ['AE', 2]]
+    assert dict(kpis.top_unit_status_counts.values.tolist()) == {'OPEN': 3, 'CLOSED': 3}
+    assert kpis.vessel_counts.values.tolist() == [['KS', 3], ['ND', 2], ['BL', 1]]
+    assert kpis.open_per_vessel.values.tolist() == [['KS', 2], ['ND', 1]]
+
+
+def test_mttr_per_unit_fastest_first(df):
+    mttr = analysis.compute_dashboard_kpis(df).mttr_per_unit
+    assert mttr['Unit'].tolist() == ['ME', 'AE']
+    assert mttr['MTTR (Hari)'].tolist() == pytest.approx([2.0, 10.0])
+    assert mttr['Jumlah Kerusakan'].tolist() == [4, 2]
+
+
+def test_no_closed_reports_gives_no_mttr(df):
+    kpis = analysis.compute_dashboard_kpis(df[df['Status'] == 'OPEN'])
+    assert kpis.avg_res_time == "N/A"
+    assert kpis.mttr_per_unit.empty
+
+
+def test_empty_selection_gives_default_kpis(df):
+    kpis = analysis.compute_dashboard_kpis(df.iloc[0:0])
+    assert (kpis.total, kpis.open_count, kpis.avg_res_time) == (0, 0, "N/A")
+    assert kpis.unit_counts.empty
+
+
+@pytest.mark.parametrize('days, bucket', [(30, 'week'), (120, 'week'), (400, 'month'), (2000, 'quarter')])
+def test_trend_bucket_follows_date_range(days, bucket):
+    start = pd.Timestamp('2024-01-01')
+    assert analysis.choose_trend_bucket(start, start + pd.Timedelta(days=days)) == bucket
+
+
+def test_bucket_keys_and_labels():
+    dates = pd.Series(pd.to_datetime(['2025-07-07', '2025-07-13', '2025-07-14', None]))
+    weeks = analysis.bucket_keys(dates, 'week')
+    # Minggu dimulai hari Senin: 7 dan 13 Juli satu minggu, 14 Juli minggu berikutnya
+    assert weeks[0] == weeks[1] != weeks[2]
+    assert weeks[3] == -1
+    assert analysis.bucket_label(weeks[0], 'week') == '2025-07-07'
+    assert analysis.bucket_label(analysis.bucket_keys(dates, 'month')[0], 'month') == '2025-07'
+    assert analysis.bucket_label(analysis.bucket_keys(dates, 'quarter')[0], 'quarter') == '2025-Q3'
+
+
+def test_trend_counts_per_bucket_and_status(df):
+    kpis = analysis.compute_dashboard_kpis(df)
+    assert kpis.trend_bucket == 'week'
+    trend = {(p, s): n for p, s, n in kpis.trend.values.tolist()}
+    assert trend == {
+        ('2025-06-30', 'CLOSED'): 2, ('2025-06-30', 'OPEN'): 1,
+        ('2025-08-04', 'OPEN'): 1,
+        ('2025-08-11', 'CLOSED'): 1, ('2025-08-11', 'OPEN'): 1,
+    }
+
+
+def test_oldest_open_reports_selects_top_k(df):
+    now = pd.Timestamp('2025-09-01')
+    oldest = analysis.oldest_open_reports(df, n=2, now=now)
+    assert oldest['Permasalahan'].tolist() == ['B', 'D']
+    assert oldest['Duration'].tolist() == [61, 22]
+    assert oldest['Label'].tolist() == ['ND - B...', 'KS - D...']
+
+
+def test_open_report_without_day_is_aged_from_issued_date(frame):
+    df = frame([
+        ['01/06/2025', 'ND', 'Pompa bocor', '', 'ME', '01/06/2025', '', '', 'OPEN'],
+        ['', 'ND', 'Alarm mati', '', 'AE', '10/05/2025', '', '', 'OPEN'],
+        ['01/07/2025', 'ND', 'Lampu putus', '', 'AE', '01/07/2025', '05/07/2025', '', 'CLOSED'],
+    ])
+    now = datetime(2025, 8, 15)
+
+    reports = analysis.vessel_reports(df, now=now)
+    assert reports['Permasalahan'].tolist() == ['Alarm mati', 'Pompa bocor', 'Lampu putus']
+    assert reports['Umur (Hari)'].tolist()[:2] == [97, 75]
+
+    oldest = analysis.oldest_open_reports(df, now=now)
+    assert oldest['Permasalahan'].tolist() == ['Alarm mati', 'Pompa bocor']
+    assert oldest['Duration'].tolist() == [97, 75]
+    assert oldest['Start_Date'].tolist() == [datetime(2025, 5, 10), datetime(2025, 6, 1)]
@@ -0,0 +1,76 @@
+import json
+
+import pandas as pd
+import pytest
+
+from notulensi import COLUMNS, data
+from notulensi.aggregates import build_cube
+from notulensi.api import FleetAPI
+from notulensi.ingest import DataSnapshot
+
+
+class FakeDataset:
+    """Dataset palsu untuk FleetAPI: snapshot diganti langsung oleh test."""
+
+    def __init__(self, rows, version='v1'):
+        self.set_rows(rows, version)
+
+    def set_rows(self, rows, version):
+        frame = data.normalize_frame(pd.DataFrame(rows, columns=COLUMNS))
+        self._snapshot = DataSnapshot(frame, build_cube(frame), version, None)
+
+    def snapshot(self):
+        return self._snapshot
+
+
+ROWS = [
+    ['01/07/2025', 'ND', 'A', '', 'ME', '01/07/2025', '03/07/2025', '', 'CLOSED'],
+    ['02/07/2025', 'ND', 'B', '', 'ME', '02/07/2025', '', '', 'OPEN'],
+    ['01/07/2024', 'KS', 'C', '', 'AE', '01/07/2024', '', '', 'OPEN'],
+]
+
+
+@pytest.fixture
+def api():
+    return FleetAPI(FakeDataset(ROWS))
+
+
+def test_fleet_matches_cube(api):
+    status, headers, body = api.handle('/api/fleet')
+    payload = json.loads(body)
+    assert status == 200
+    assert headers['Content-Type'].startswith('application/json')
+    assert (payload['years'], payload['total_open'], payload['total_closed']) == ([2024, 2025], 2, 1)
+
+    payload = json.loads(api.handle('/api/fleet?year=2025')[2])
+    assert [(v['Vessel'], v['OPEN'], v['CLOSED']) for v in payload['vessels']] == [('ND', 1, 1)]
+
+
+def test_kpis_filter_by_vessel(api):
+    payload = json.loads(api.handle('/api/kpis?vessels=ND')[2])
+    assert (payload['total'], payload['open'], payload['closed']) == (2, 1, 1)
+    assert payload['avg_resolution_days'] == pytest.approx(3.0)
+
+
+def test_matching_etag_returns_304_until_data_changes(api):
+    status, headers, _ = api.handle('/api/kpis?year=2025')
+    etag = headers['ETag']
+    status, headers, body = api.handle('/api/kpis?year=2025', if_none_match=f'"other", {etag}')
+    assert (status, headers['ETag'], body) == (304, etag, b'')
+    assert api.handle('/api/kpis?year=2024', if_none_match=etag)[0] == 200
+
+    api.dataset.set_rows(ROWS[:2], 'v2')
+    status, headers, body = api.handle('/api/kpis?year=2025', if_none_match=etag)
+    assert status == 200
+    assert headers['ETag'] != etag
+
+
+def test_responses_are_cached_per_version(api, monkeypatch):
+    first = api.handle('/api/mttr')[2]
+    monkeypatch.setattr(api, 'routes', {'/api/mttr': lambda snapshot, params: pytest.fail('tidak di-cache')})
+    assert api.handle('/api/mttr')[2] == first
+
+
+def test_unknown_path_and_bad_parameter(api):
+    assert api.handle('/api/unknown')[0] == 404
+    assert api.handle('/api/fleet?year=abc')[0] == 400
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+from notulensi import data
+
+
+@pytest.fixture(autouse=True)
+def cold_date_cache():
+    data.clear_date_cache()
+    yield
+    data.clear_date_cache()
+
+
+def test_parse_dates_mixed_formats_and_blanks():
+    series = pd.Series(['01/07/2025', '2025-07-02', '03-07-2025', '04/07/25',
+                        '2025-07-05 08:30:00', '', '  ', 'nan', None, 'bukan tanggal'])
+
+    parsed = data.parse_dates(series)
+
+    assert parsed.iloc[:5].tolist() == [
+        pd.Timestamp(2025, 7, 1), pd.Timestamp(2025, 7, 2), pd.Timestamp(2025, 7, 3),
+        pd.Timestamp(2025, 7, 4), pd.Timestamp(2025, 7, 5, 8, 30),
+    ]
+    assert parsed.iloc[5:].isna().all()
+    assert parsed.dtype == 'datetime64[ns]'
+
+
+def test_parse_dates_reuses_cache_across_calls(monkeypatch):
+    data.parse_dates(pd.Series(['01/07/2025', '2025-07-02']))
+    assert '01/07/2025' in data._DATE_CACHE and '2025-07-02' in data._DATE_CACHE
+
+    calls = []
+    to_datetime = pd.to_datetime
+
+    def counting_to_datetime(*args, **kwargs):
+        calls.append(args)
+        return to_datetime(*args, **kwargs)
+
+    monkeypatch.setattr(pd, 'to_datetime', counting_to_datetime)
+
+    parsed = data.parse_dates(pd.Series(['2025-07-02', '01/07/2025', '2025-07-02']))
+
+    assert calls == []
+    assert parsed.tolist() == [pd.Timestamp(2025, 7, 2), pd.Timestamp(2025, 7, 1), pd.Timestamp(2025, 7, 2)]
+
+
+def test_normalize_frame_keeps_iso_rows_and_falls_back_to_day(frame):
+    df = frame([
+        ['01/07/2025', 'nd ', 'A', '', 'me', '01/07/2025', '', '', 'open'],
+        # Ditulis halaman input (%Y-%m-%d): dulu terbuang karena gagal diparse
+        ['2025-07-02', 'ND', 'B', '', 'ME', '2025-07-02', '2025-07-04', '', 'CLOSED'],
+        # Issued Date kosong: Date_Ref memakai Day
+        ['03/07/2024', 'KS', 'C', '', '', '', '', '', ''],
+        ['nan', 'KS', 'D', '', 'AE', 'nan', '', '', 'OPEN'],
+        ['04/07/2025', 'nan', 'E', '', 'AE', '04/07/2025', '', '', 'OPEN'],
+    ])
+
+    assert df['Permasalahan'].tolist() == ['A', 'B', 'C']
+    assert df['Vessel'].tolist() == ['ND', 'ND', 'KS']
+    assert df['Unit'].tolist() == ['ME', 'ME', data.UNIT_DEFAULT]
+    assert df['Status'].tolist() == ['OPEN', 'CLOSED', data.STATUS_DEFAULT]
+    assert df['Date_Ref'].tolist() == [pd.Timestamp(2025, 7, 1), pd.Timestamp(2025, 7, 2), pd.Timestamp(2024, 7, 3)]
+    assert df['Year'].tolist() == [2025, 2025, 2024]
+    assert df['Resolution_Time_Days'].iloc[1] == 3
+    assert df['Resolution_Time_Days'].iloc[[0, 2]].isna().all()
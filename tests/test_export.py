@@ -0,0 +1,78 @@
+import csv
+import gzip
+import io
+import os
+
+import pandas as pd
+import pytest
+
+from notulensi import COLUMNS, export
+from notulensi.sync import SNAPSHOT_COLUMNS
+
+
+def write_csv(path, rows, header=COLUMNS):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def raw_frame(rows):
+    return pd.DataFrame(rows, columns=COLUMNS, dtype=str)
+
+
+RAW = raw_frame([
+    ['01/07/2025', ' nd ', 'Pompa bocor', '', 'ME', '', '', '', 'OPEN'],
+    ['30/12/2024', 'ND', 'Alarm mati', '', 'AE', '02/01/2025', '', '', 'OPEN'],
+    ['01/07/2024', 'KS', 'Lampu putus', '', 'AE', '01/07/2024', '', '', 'CLOSED'],
+])
+
+
+def test_export_without_filters_returns_rows_unchanged():
+    assert export.export_frame(RAW) is RAW
+
+
+def test_year_filter_uses_issued_date_then_day():
+    subset = export.export_frame(RAW, year=2025)
+    assert subset['Permasalahan'].tolist() == ['Pompa bocor', 'Alarm mati']
+
+
+def test_vessel_filter_matches_cleaned_code_but_keeps_raw_value():
+    subset = export.export_frame(RAW, year=2025, vessels=['ND'])
+    assert subset['Vessel'].tolist() == [' nd ', 'ND']
+    assert export.export_frame(RAW, vessels=['KS'])['Permasalahan'].tolist() == ['Lampu putus']
+
+
+def test_raw_sources_prefer_sheet_version_of_report(tmp_path):
+    csv_path = str(tmp_path / 'data.csv')
+    snapshot_path = str(tmp_path / 'snapshot.csv')
+    opened = ['01/07/2025', 'ND', 'Pompa bocor', '', 'ME', '01/07/2025', '', '', 'OPEN']
+    other = ['02/07/2025', 'ND', 'Alarm mati', '', 'AE', '02/07/2025', '', '', 'OPEN']
+    closed = opened[:6] + ['05/07/2025', 'Seal diganti', 'CLOSED', 'id-1']
+    write_csv(csv_path, [opened, other])
+    write_csv(snapshot_path, [closed], header=SNAPSHOT_COLUMNS)
+
+    raw = export.read_raw_sources([csv_path, snapshot_path, str(tmp_path / 'missing.csv')])
+    assert raw[['Permasalahan', 'Status']].values.tolist() == [['Alarm mati', 'OPEN'], ['Pompa bocor', 'CLOSED']]
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'csv.gz'])
+def test_written_export_round_trips_in_chunks(tmp_path, fmt):
+    path = export.write_export(RAW, fmt, str(tmp_path / ('out.' + fmt)), chunk_rows=2)
+    with open(path, 'rb') as f:
+        content = f.read()
+    if fmt == 'csv.gz':
+        content = gzip.decompress(content)
+    result = pd.read_csv(io.BytesIO(content), dtype=str, keep_default_na=False)
+    pd.testing.assert_frame_equal(result, RAW)
+
+
+def test_build_export_removes_files_of_other_versions(tmp_path):
+    source = str(tmp_path / 'data.csv')
+    write_csv(source, RAW.values.tolist())
+    directory = str(tmp_path / 'exports')
+
+    old = export.build_export([source], 'a' * 40, directory=directory)
+    new = export.build_export([source], 'b' * 40, year=2025, directory=directory)
+    assert not os.path.exists(old)
+    assert pd.read_csv(new, dtype=str, keep_default_na=False)['Permasalahan'].tolist() == ['Pompa bocor', 'Alarm mati']
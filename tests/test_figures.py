@@ -0,0 +1,55 @@
+import threading
+import time
+
+import pytest
+
+from notulensi.figures import FigureCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = FigureCache(max_entries=2)
+    cache.get_or_build('a', lambda: 'A')
+    cache.get_or_build('b', lambda: 'B')
+    # 'a' dipakai lagi, jadi 'b' yang paling lama tidak dipakai
+    assert cache.get_or_build('a', lambda: pytest.fail('a harus diambil dari cache')) == 'A'
+    cache.get_or_build('c', lambda: 'C')
+
+    assert len(cache) == 2
+    assert cache.get_or_build('a', lambda: 'A baru') == 'A'
+    assert cache.get_or_build('b', lambda: 'B baru') == 'B baru'
+
+
+def test_concurrent_requests_build_once():
+    cache = FigureCache()
+    builds = []
+    start = threading.Barrier(8)
+    results = []
+
+    def build():
+        builds.append(1)
+        time.sleep(0.05)
+        return object()
+
+    def request():
+        start.wait()
+        results.append(cache.get_or_build('chart', build))
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert len(results) == 8 and all(result is results[0] for result in results)
+
+
+def test_failed_build_is_not_cached():
+    cache = FigureCache()
+
+    def broken():
+        raise ValueError('gagal')
+
+    with pytest.raises(ValueError):
+        cache.get_or_build('chart', broken)
+    assert cache.get_or_build('chart', lambda: 'ok') == 'ok'
@@ -0,0 +1,24 @@
+from notulensi.importtime import _parse, breakdown
+
+STDERR = """import time: self [us] | cumulative | imported package
+import time:        50 |         50 |   sitecustomize
+import time:      1000 |       1050 | site
+import time:       200 |        200 |       _json
+import time:       500 |        700 |     json.scanner
+import time:       400 |       1100 |   json.decoder
+import time:       300 |        300 |   json.encoder
+import time:       100 |       1500 | json
+import time:        80 |         80 | keyword
+"""
+
+
+def test_breakdown_uses_second_level_imports():
+    roots = _parse(STDERR)
+    assert [name for name, _, _ in roots] == ['site', 'json', 'keyword']
+
+    total, detail = breakdown(roots, startup={'site'})
+
+    assert round(total * 1e6) == 1580
+    assert [(name, round(seconds * 1e6)) for name, seconds in detail] == [
+        ('json.decoder', 1100), ('json.encoder', 300), ('keyword', 80),
+    ]
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from notulensi.index import FilterIndex, group_positions
+
+
+@pytest.fixture
+def df(frame):
+    return frame([
+        ['01/07/2025', 'ND', 'A', '', 'ME', '01/07/2025', '', '', 'OPEN'],
+        ['01/07/2024', 'KS', 'B', '', 'AE', '01/07/2024', '', '', 'CLOSED'],
+        ['02/07/2025', 'KS', 'C', '', 'ME', '02/07/2025', '', '', 'OPEN'],
+        ['03/07/2025', 'ND', 'D', '', '', '03/07/2025', '', '', 'CLOSED'],
+        ['01/07/2024', 'ND', 'E', '', 'AE', '01/07/2024', '', '', 'OPEN'],
+    ])
+
+
+def test_group_positions_skips_missing_values():
+    groups = group_positions(pd.Series(['b', None, 'a', 'b', 'a']))
+    assert {k: v.tolist() for k, v in groups.items()} == {'a': [2, 4], 'b': [0, 3]}
+
+
+def test_group_returns_rows_of_one_value(df):
+    index = FilterIndex(df)
+    assert index.values('Vessel') == ['KS', 'ND']
+    assert index.group('Vessel', 'ND').tolist() == [0, 3, 4]
+    assert index.group('Vessel', 'XX').tolist() == []
+    assert index.rows(df, 'Unit', 'TIDAK DITENTUKAN')['Permasalahan'].tolist() == ['D']
+
+
+@pytest.mark.parametrize('year, vessels, units, statuses', [
+    (2025, ['ND'], None, None),
+    ('All', ['KS', 'ND'], ['ME'], None),
+    (2024, ['KS', 'ND'], None, ['OPEN']),
+    (None, ['KS'], ['AE', 'ME'], ['OPEN', 'CLOSED']),
+])
+def test_query_matches_boolean_mask(df, year, vessels, units, statuses):
+    mask = df['Vessel'].isin(vessels)
+    if year not in (None, 'All'):
+        mask &= df['Year'] == year
+    if units:
+        mask &= df['Unit'].isin(units)
+    if statuses:
+        mask &= df['Status'].isin(statuses)
+
+    result = FilterIndex(df).query(df, year=year, vessels=vessels, units=units, statuses=statuses)
+    assert result['Permasalahan'].tolist() == df.loc[mask, 'Permasalahan'].tolist()
+
+
+def test_query_without_restriction_returns_frame_itself(df):
+    index = FilterIndex(df)
+    assert index.query(df, year='All', vessels=index.values('Vessel')) is df
+
+
+def test_query_with_no_vessels_is_empty(df):
+    assert FilterIndex(df).query(df, year='All', vessels=[]).empty
@@ -0,0 +1,249 @@
+import csv
+import os
+
+import pandas as pd
+import pytest
+
+from notulensi import COLUMNS, data, storage
+from notulensi.ingest import CombinedDataset, IncrementalDataset
+from notulensi.sync import SNAPSHOT_COLUMNS
+
+
+def report(n, vessel='ND'):
+    return ['01/07/2025', vessel, f'Masalah {n}', '', 'ME', '01/07/2025', '', '', 'OPEN']
+
+
+def write_csv(path, rows, header=COLUMNS, mode='w'):
+    with open(path, mode, encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        if mode == 'w':
+            writer.writerow(header)
+        writer.writerows(rows)
+
+
+def replace_csv(path, rows):
+    tmp_path = str(path) + '.tmp'
+    write_csv(tmp_path, rows)
+    os.replace(tmp_path, path)
+
+
+def test_appended_rows_are_parsed_incrementally(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    write_csv(path, [report(1), report(2)])
+    dataset = IncrementalDataset(path)
+    assert len(dataset.refresh()) == 2
+    generation = dataset.generation
+
+    write_csv(path, [report(3)], mode='a')
+    frame = dataset.refresh()
+    assert frame['Permasalahan'].tolist() == ['Masalah 1', 'Masalah 2', 'Masalah 3']
+    assert dataset.generation == generation
+
+
+def test_rewritten_rows_trigger_full_load(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    write_csv(path, [report(1), report(2)])
+    dataset = IncrementalDataset(path)
+    dataset.refresh()
+    generation = dataset.generation
+
+    write_csv(path, [report(1)])
+    assert dataset.refresh()['Permasalahan'].tolist() == ['Masalah 1']
+    assert dataset.generation != generation
+
+
+def test_replaced_file_with_same_length_edit_and_append_is_reloaded(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    rows = [report(n) for n in range(1, 200)]
+    write_csv(path, rows)
+    dataset = IncrementalDataset(path)
+    dataset.refresh()
+    generation = dataset.generation
+
+    # Edit panjang-sama jauh sebelum fingerprint 4 KB, ditambah baris baru
+    edited = [report(1, vessel='XX')] + rows[1:] + [report(200)]
+    replace_csv(path, edited)
+    frame = dataset.refresh()
+    assert dataset.generation != generation
+    assert frame['Vessel'].iloc[0] == 'XX'
+    assert len(frame) == 200
+
+
+def test_combined_dataset_counts_sheet_rows_already_in_csv_once(tmp_path):
+    csv_path = str(tmp_path / 'data.csv')
+    snapshot_path = str(tmp_path / 'snapshot.csv')
+    write_csv(csv_path, [report(1), report(2)])
+    write_csv(snapshot_path, [report(n) + [f'id-{n}'] for n in (1, 2, 3)], header=SNAPSHOT_COLUMNS)
+
+    dataset = CombinedDataset([IncrementalDataset(csv_path), IncrementalDataset(snapshot_path)])
+    snapshot = dataset.snapshot()
+    assert sorted(snapshot.frame['Permasalahan']) == ['Masalah 1', 'Masalah 2', 'Masalah 3']
+
+
+def test_combined_dataset_prefers_sheet_version_of_edited_report(tmp_path):
+    csv_path = str(tmp_path / 'data.csv')
+    snapshot_path = str(tmp_path / 'snapshot.csv')
+    closed = report(1)[:6] + ['05/07/2025', 'Sudah diganti', 'CLOSED']
+    write_csv(csv_path, [report(1), report(2)])
+    write_csv(snapshot_path, [closed + ['id-1']], header=SNAPSHOT_COLUMNS)
+
+    dataset = CombinedDataset([IncrementalDataset(csv_path), IncrementalDataset(snapshot_path)])
+    snapshot = dataset.snapshot()
+    frame = snapshot.frame.sort_values('Permasalahan')
+    assert frame['Permasalahan'].tolist() == ['Masalah 1', 'Masalah 2']
+    assert frame['Status'].astype(str).tolist() == ['CLOSED', 'OPEN']
+    counts = snapshot.cube.groupby('Status')['Count'].sum().to_dict()
+    assert counts == {'CLOSED': 1, 'OPEN': 1}
+
+
+def test_combined_dataset_falls_back_to_csv_without_snapshot(tmp_path):
+    csv_path = str(tmp_path / 'data.csv')
+    dataset = CombinedDataset([
+        IncrementalDataset(csv_path), IncrementalDataset(str(tmp_path / 'missing.csv')),
+    ])
+    write_csv(csv_path, [report(1), report(2)])
+    assert len(dataset.snapshot().frame) == 2
+
+
+def test_half_written_quoted_row_is_read_once_complete(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    write_csv(path, [report(1)])
+    dataset = IncrementalDataset(path)
+    dataset.refresh()
+
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('01/07/2025,ND,"Pompa bocor\ndi kamar mesin')
+    assert len(dataset.refresh()) == 1
+
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('",,ME,01/07/2025,,,OPEN\n')
+    frame = dataset.refresh()
+    assert frame['Permasalahan'].tolist() == ['Masalah 1', 'Pompa bocor\ndi kamar mesin']
+
+
+def test_unparsable_tail_is_not_skipped(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    write_csv(path, [report(1)])
+    dataset = IncrementalDataset(path)
+    dataset.refresh()
+
+    write_csv(path, [report(2), report(3) + ['kolom', 'lebih']], mode='a')
+    with pytest.raises(ValueError):
+        dataset.refresh()
+    # Tanpa perubahan file, baris yang gagal tidak boleh dianggap sudah terbaca
+    with pytest.raises(ValueError):
+        dataset.refresh()
+
+    # Baris diperbaiki di tempat: refresh berikutnya memuat penuh, tidak melompat
+    write_csv(path, [report(1), report(2), report(3)])
+    assert dataset.refresh()['Permasalahan'].tolist() == ['Masalah 1', 'Masalah 2', 'Masalah 3']
+
+
+def test_failed_full_load_keeps_history_on_next_refresh(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    write_csv(path, [report(1), report(2) + ['kolom', 'lebih']])
+    dataset = IncrementalDataset(path)
+    with pytest.raises(ValueError):
+        dataset.refresh()
+    assert dataset.offset == 0
+
+    write_csv(path, [report(1), report(2)])
+    write_csv(path, [report(3)], mode='a')
+    assert dataset.refresh()['Permasalahan'].tolist() == ['Masalah 1', 'Masalah 2', 'Masalah 3']
+
+
+def test_last_row_without_newline_is_reloaded_when_continued(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    write_csv(path, [report(1)])
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('01/07/2025,ND,Masalah 2,,ME,01/07/2025,,,OP')
+    dataset = IncrementalDataset(path)
+    assert dataset.refresh()['Status'].astype(str).tolist() == ['OPEN', 'OP']
+
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('EN\n')
+    frame = dataset.refresh()
+    assert frame['Status'].astype(str).tolist() == ['OPEN', 'OPEN']
+
+
+def test_combined_dataset_applies_sheet_appends_as_deltas(tmp_path):
+    csv_path = str(tmp_path / 'data.csv')
+    snapshot_path = str(tmp_path / 'snapshot.csv')
+    write_csv(csv_path, [report(1), report(2), report(3, vessel='KS')])
+    write_csv(snapshot_path, [report(1) + ['id-1']], header=SNAPSHOT_COLUMNS)
+    dataset = CombinedDataset([IncrementalDataset(csv_path), IncrementalDataset(snapshot_path)])
+    dataset.snapshot()
+
+    # Laporan baru, dan laporan 3 yang sudah ditutup di sheet (menggantikan baris CSV)
+    closed = report(3, vessel='KS')[:6] + ['02/07/2025', '', 'CLOSED', 'id-3']
+    write_csv(snapshot_path, [report(4) + ['id-4'], closed], mode='a')
+    snapshot = dataset.snapshot()
+
+    expected = CombinedDataset([IncrementalDataset(csv_path), IncrementalDataset(snapshot_path)]).snapshot()
+    columns = ['Permasalahan', 'Vessel', 'Status']
+    assert sorted(snapshot.frame[columns].astype(str).values.tolist()) == \
+        sorted(expected.frame[columns].astype(str).values.tolist())
+    keys = ['Vessel', 'Year', 'Unit', 'Status']
+    pd.testing.assert_frame_equal(
+        snapshot.cube.sort_values(keys).reset_index(drop=True)[['Vessel', 'Year', 'Unit', 'Status', 'Count']],
+        expected.cube.sort_values(keys).reset_index(drop=True)[['Vessel', 'Year', 'Unit', 'Status', 'Count']],
+        check_dtype=False,
+    )
+    assert dataset.superseded(0, dataset.parts[0].snapshot().frame).tolist() == [True, False, True]
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Catat setiap potongan CSV yang benar-benar diparse oleh IncrementalDataset."""
+    chunks = []
+    parse = IncrementalDataset._parse
+
+    def recording_parse(self, raw):
+        chunks.append(raw.decode('utf-8'))
+        return parse(self, raw)
+
+    monkeypatch.setattr(IncrementalDataset, '_parse', recording_parse)
+    return chunks
+
+
+def checkpointed_csv(tmp_path):
+    path = str(tmp_path / 'data.csv')
+    write_csv(path, [report(1), report(2)])
+    IncrementalDataset(path).refresh()
+    assert os.path.exists(storage.parquet_path_for(path))
+    return path
+
+
+def test_cold_start_reuses_checkpoint_and_parses_only_the_tail(tmp_path, parsed):
+    path = checkpointed_csv(tmp_path)
+    write_csv(path, [report(3)], mode='a')
+    parsed.clear()
+
+    frame = IncrementalDataset(path).refresh()
+
+    assert frame['Permasalahan'].tolist() == ['Masalah 1', 'Masalah 2', 'Masalah 3']
+    assert len(parsed) == 1
+    assert 'Masalah 3' in parsed[0] and 'Masalah 2' not in parsed[0]
+
+
+def test_checkpoint_is_ignored_after_schema_version_change(tmp_path, parsed, monkeypatch):
+    path = checkpointed_csv(tmp_path)
+    monkeypatch.setattr(data, 'SCHEMA_VERSION', data.SCHEMA_VERSION + 1)
+    parsed.clear()
+
+    frame = IncrementalDataset(path).refresh()
+
+    assert frame['Permasalahan'].tolist() == ['Masalah 1', 'Masalah 2']
+    assert len(parsed) == 1 and 'Masalah 1' in parsed[0]
+
+
+def test_checkpoint_is_ignored_when_source_prefix_changed(tmp_path, parsed):
+    path = checkpointed_csv(tmp_path)
+    # Ukuran sama, isi baris pertama berubah
+    write_csv(path, [report(9), report(2), report(3)])
+    parsed.clear()
+
+    frame = IncrementalDataset(path).refresh()
+
+    assert frame['Permasalahan'].tolist() == ['Masalah 9', 'Masalah 2', 'Masalah 3']
+    assert len(parsed) == 1 and 'Masalah 9' in parsed[0]
@@ -0,0 +1,128 @@
+import json
+import threading
+import time
+
+from notulensi.outbox import OutboxWorker, WriteAheadLog
+
+
+class FakeSheet:
+    """Klien Sheets palsu: menyimpan baris di memori, bisa kehilangan respons append."""
+
+    def __init__(self, lost_responses=0):
+        self.rows = []
+        self.lost_responses = lost_responses
+        self.appends = 0
+
+    def append_rows(self, rows):
+        self.appends += 1
+        self.rows.extend(rows)
+        if self.lost_responses:
+            # Baris sudah masuk ke sheet, tetapi klien tidak menerima respons
+            self.lost_responses -= 1
+            raise ConnectionError('respons hilang')
+
+    def submission_ids(self):
+        return [row[-1] for row in self.rows]
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def read_records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_replay_resends_submits_without_ack(tmp_path):
+    path = str(tmp_path / 'outbox.jsonl')
+    wal = WriteAheadLog(path)
+    wal.append('a', ['r1'])
+    wal.append('b', ['r2'])
+    wal.append('c', ['r3'])
+    # Ack hanya untuk 'a', lalu proses "mati" tanpa sempat memadatkan log
+    wal._write([{'op': 'ack', 'id': 'a'}])
+
+    replayed = WriteAheadLog(path)
+    assert replayed.pending() == [('b', ['r2']), ('c', ['r3'])]
+    assert replayed.append('a', ['r1']) is False
+
+
+def test_replay_drops_truncated_tail_and_keeps_later_records(tmp_path):
+    path = str(tmp_path / 'outbox.jsonl')
+    WriteAheadLog(path).append('a', ['r1'])
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "submit", "id": "b", "ro')  # proses mati di tengah penulisan
+
+    wal = WriteAheadLog(path)
+    assert wal.pending() == [('a', ['r1'])]
+    wal.append('c', ['r3'])
+
+    assert [r['id'] for r in read_records(path)] == ['a', 'c']
+    assert WriteAheadLog(path).pending() == [('a', ['r1']), ('c', ['r3'])]
+
+
+def test_duplicate_submission_id_is_ignored(tmp_path):
+    wal = WriteAheadLog(str(tmp_path / 'outbox.jsonl'))
+    assert wal.append('a', ['r1']) is True
+    assert wal.append('a', ['r1']) is False
+    assert wal.pending_count() == 1
+
+
+def test_compaction_empties_log_once_everything_is_acked(tmp_path):
+    path = str(tmp_path / 'outbox.jsonl')
+    wal = WriteAheadLog(path)
+    wal.append('a', ['r1'])
+    wal.append('b', ['r2'])
+
+    wal.mark_done(['a'])
+    assert [r['op'] for r in read_records(path)] == ['submit', 'submit', 'ack']
+
+    wal.mark_done(['b'])
+    assert read_records(path) == []
+    assert WriteAheadLog(path).pending() == []
+
+
+def test_worker_sends_batch_and_acks(tmp_path):
+    wal = WriteAheadLog(str(tmp_path / 'outbox.jsonl'))
+    client = FakeSheet()
+    sent = threading.Event()
+    worker = OutboxWorker(wal, client, max_delay=0.05, on_sent=sent.set)
+
+    worker.submit(['r1'], 'a')
+    worker.submit(['r2'], 'b')
+
+    assert wait_until(lambda: wal.pending_count() == 0)
+    assert sent.is_set()
+    assert client.rows == [['r1', 'a'], ['r2', 'b']]
+    assert worker.status() == {'pending': 0, 'failures': 0, 'last_error': None}
+
+
+def test_worker_does_not_resend_rows_that_arrived_before_a_failure(tmp_path):
+    wal = WriteAheadLog(str(tmp_path / 'outbox.jsonl'))
+    client = FakeSheet(lost_responses=1)
+    worker = OutboxWorker(wal, client, max_delay=0, base_backoff=0.01)
+
+    worker.submit(['r1'], 'a')
+
+    assert wait_until(lambda: wal.pending_count() == 0)
+    assert client.submission_ids() == ['a']
+    assert client.appends == 1
+    assert wait_until(lambda: worker.failures == 0)
+
+
+def test_worker_resends_pending_rows_after_restart(tmp_path):
+    path = str(tmp_path / 'outbox.jsonl')
+    WriteAheadLog(path).append('a', ['r1'])
+
+    wal = WriteAheadLog(path)
+    client = FakeSheet()
+    OutboxWorker(wal, client, max_delay=0)
+
+    assert wait_until(lambda: wal.pending_count() == 0)
+    assert client.rows == [['r1', 'a']]
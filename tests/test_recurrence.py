@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from notulensi import recurrence
+
+
+def report(problem, vessel='ND', unit='ME', day='01/07/2025', status='OPEN'):
+    return [day, vessel, problem, '', unit, day, '', '', status]
+
+
+@pytest.fixture
+def df(frame):
+    return frame([
+        report('Fuel pump bocor pada AE 1', day='01/03/2025', status='CLOSED'),
+        report('Fuel pump bocor pada AE 1.', day='01/05/2025'),
+        report('fuel pump  bocor pada ae 1', day='01/07/2025'),
+        report('Fuel pump bocor pada AE 1', vessel='KS'),
+        report('Fuel pump bocor pada AE 1', unit='AE'),
+        report('Lampu navigasi putus'),
+        report('ok'),
+    ])
+
+
+def test_shingles_are_packed_per_row():
+    rows, values = recurrence.shingle_hashes(pd.Series(['abcde', 'ab', 'wxyz']))
+    assert rows.tolist() == [0, 0, 2]
+    assert values[0] == int.from_bytes(b'abcd', 'big')
+    assert values[2] == int.from_bytes(b'wxyz', 'big')
+
+
+def test_identical_texts_have_identical_signatures():
+    texts = recurrence.normalize_text(pd.Series(['Pompa bocor!', 'pompa  BOCOR', 'lampu']))
+    signatures = recurrence.minhash_signatures(texts)
+    assert (signatures[0] == signatures[1]).all()
+    assert not (signatures[0] == signatures[2]).all()
+
+
+def test_similar_reports_cluster_only_within_vessel_and_unit(df):
+    clusters = recurrence.cluster_reports(df)
+    assert clusters[0] >= 0
+    assert clusters[0] == clusters[1] == clusters[2]
+    assert clusters[3:].tolist() == [-1, -1, -1, -1]
+
+
+def test_recurring_issues_summary(df):
+    issues = recurrence.recurring_issues(df, recurrence.cluster_reports(df))
+    assert len(issues) == 1
+    issue = issues.iloc[0]
+    assert (issue['Vessel'], issue['Unit'], issue['Jumlah Laporan'], issue['OPEN']) == ('ND', 'ME', 3, 2)
+    assert issue['Pertama'] == pd.Timestamp('2025-03-01')
+    assert issue['Terakhir'] == pd.Timestamp('2025-07-01')
+
+
+def test_unique_open_count_counts_a_cluster_once(df):
+    # 6 laporan OPEN, dua di antaranya satu klaster
+    assert recurrence.unique_open_count(df, recurrence.cluster_reports(df)) == 5
@@ -0,0 +1,67 @@
+import csv
+
+from notulensi import COLUMNS, search
+from notulensi.ingest import CombinedDataset, IncrementalDataset
+from notulensi.sync import SNAPSHOT_COLUMNS
+
+
+def report(problem, vessel='ND', day='01/07/2025', status='OPEN', note=''):
+    return [day, vessel, problem, '', 'ME', day, '', note, status]
+
+
+def write_csv(path, rows, header=COLUMNS, mode='w'):
+    with open(path, mode, encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        if mode == 'w':
+            writer.writerow(header)
+        writer.writerows(rows)
+
+
+def test_tokenize_drops_stopwords_punctuation_and_clitic():
+    assert search.tokenize('Pompanya bocor di AE-3, no.3') == ['pompa', 'bocor', 'ae', '3', 'no', '3']
+
+
+def test_match_requires_every_term_as_prefix(frame):
+    df = frame([
+        report('Fuel pump AE bocor'),
+        report('Pompa bahan bakar rusak', note='fuel oil'),
+        report('Lampu navigasi putus'),
+    ])
+    index = search.SearchIndex()
+    assert index.match(df, 1, 'fuel').tolist() == [0, 1]
+    assert index.match(df, 1, 'fu pum').tolist() == [0]
+    assert index.match(df, 1, 'yang dan').tolist() == []
+
+
+def test_index_extends_on_append_and_rebuilds_on_new_generation(frame):
+    index = search.SearchIndex()
+    df = frame([report('Pompa bocor')])
+    index.update(df, 1)
+
+    appended = frame([report('Pompa bocor'), report('Pompa aus')])
+    assert index.match(appended, 1, 'pompa').tolist() == [0, 1]
+    assert index.n_rows == 2
+
+    rewritten = frame([report('Lampu putus')])
+    assert index.match(rewritten, 2, 'pompa').tolist() == []
+    assert index.match(rewritten, 2, 'lampu').tolist() == [0]
+
+
+def test_search_reports_prefers_sheet_version_and_filters(tmp_path):
+    csv_path = str(tmp_path / 'data.csv')
+    snapshot_path = str(tmp_path / 'snapshot.csv')
+    write_csv(csv_path, [
+        report('Pompa bocor', note='menunggu spare'),
+        report('Pompa aus', vessel='KS', day='05/07/2025'),
+    ])
+    closed = report('Pompa bocor', status='CLOSED', note='seal diganti') + ['id-1']
+    write_csv(snapshot_path, [closed], header=SNAPSHOT_COLUMNS)
+    dataset = CombinedDataset([IncrementalDataset(csv_path), IncrementalDataset(snapshot_path)])
+    indexes = [search.SearchIndex() for _ in dataset.parts]
+
+    results = search.search_reports(dataset, indexes, 'pompa')
+    assert results[['Vessel', 'Status']].astype(str).values.tolist() == [['KS', 'OPEN'], ['ND', 'CLOSED']]
+    assert search.search_reports(dataset, indexes, 'pompa', statuses=['OPEN'])['Vessel'].tolist() == ['KS']
+    # Teks yang hanya ada di versi CSV yang sudah digantikan tidak ikut cocok
+    assert search.search_reports(dataset, indexes, 'menunggu').empty
+    assert search.search_reports(dataset, indexes, 'seal')['Vessel'].tolist() == ['ND']
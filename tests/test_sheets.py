@@ -0,0 +1,48 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from notulensi import sheets
+
+
+@pytest.fixture
+def fake_server():
+    """Server HTTP lokal yang mencatat path setiap permintaan."""
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            seen.append(self.path)
+            body = b'{}'
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_address[1]}', seen
+    server.shutdown()
+    server.server_close()
+
+
+def test_base_url_from_environment(monkeypatch):
+    monkeypatch.setenv(sheets.BASE_URL_ENV, 'http://127.0.0.1:9')
+    assert sheets.SheetsClient().base_url == 'http://127.0.0.1:9'
+    assert sheets.SheetsClient(base_url='http://fake').base_url == 'http://fake'
+
+
+def test_redirect_session_sends_google_calls_to_fake_server(fake_server):
+    pytest.importorskip('requests')
+    base_url, seen = fake_server
+    session = sheets._redirect_session(base_url)
+
+    response = session.get('https://sheets.googleapis.com/v4/spreadsheets/abc?includeGridData=false', timeout=5)
+
+    assert response.status_code == 200
+    assert seen == ['/v4/spreadsheets/abc?includeGridData=false']
@@ -0,0 +1,101 @@
+import csv
+import os
+
+from notulensi.sync import SNAPSHOT_COLUMNS, SheetSync
+
+
+def report(n, status='OPEN'):
+    return ['01/07/2025', 'ND', f'Masalah {n}', '', 'ME', '01/07/2025', '', '', status, f'id-{n}']
+
+
+class FakeSheet:
+    """Klien Sheets palsu untuk SheetSync: isi sheet dan waktu update diatur langsung."""
+
+    def __init__(self, rows):
+        self.rows = [list(r) for r in rows]
+        self.updated = 1
+        self.fetches = 0
+
+    def set_rows(self, rows):
+        self.rows = [list(r) for r in rows]
+        self.updated += 1
+
+    def revision(self):
+        return str(self.updated)
+
+    def get_all_values(self):
+        self.fetches += 1
+        return [SNAPSHOT_COLUMNS] + [list(r) for r in self.rows]
+
+
+def snapshot_rows(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == SNAPSHOT_COLUMNS
+    return rows[1:]
+
+
+def test_first_pull_writes_snapshot(tmp_path):
+    path = str(tmp_path / 'snapshot.csv')
+    client = FakeSheet([report(1), report(2)])
+
+    assert SheetSync(client, path).pull() == 2
+    assert snapshot_rows(path) == [report(1), report(2)]
+
+
+def test_unchanged_revision_skips_fetch(tmp_path):
+    client = FakeSheet([report(1)])
+    sync = SheetSync(client, str(tmp_path / 'snapshot.csv'))
+    sync.pull()
+
+    assert sync.pull() == 0
+    assert client.fetches == 1
+
+
+def test_new_rows_are_appended_in_place(tmp_path):
+    path = str(tmp_path / 'snapshot.csv')
+    client = FakeSheet([report(1), report(2)])
+    sync = SheetSync(client, path)
+    sync.pull()
+    inode = os.stat(path).st_ino
+
+    client.set_rows([report(1), report(2), report(3)])
+    assert sync.pull() == 1
+    assert snapshot_rows(path) == [report(1), report(2), report(3)]
+    assert os.stat(path).st_ino == inode
+
+
+def test_edited_row_rewrites_snapshot(tmp_path):
+    path = str(tmp_path / 'snapshot.csv')
+    client = FakeSheet([report(1), report(2)])
+    sync = SheetSync(client, path)
+    sync.pull()
+
+    client.set_rows([report(1, status='CLOSED'), report(2), report(3)])
+    assert sync.pull() == 3
+    assert snapshot_rows(path) == [report(1, status='CLOSED'), report(2), report(3)]
+
+
+def test_missing_state_rewrites_instead_of_appending(tmp_path):
+    path = str(tmp_path / 'snapshot.csv')
+    client = FakeSheet([report(1), report(2)])
+    sync = SheetSync(client, path)
+    sync.pull()
+    os.remove(sync.state_path)
+
+    client.set_rows([report(1), report(2), report(3)])
+    SheetSync(client, path).pull()
+    assert snapshot_rows(path) == [report(1), report(2), report(3)]
+
+
+def test_snapshot_not_matching_state_is_rewritten(tmp_path):
+    path = str(tmp_path / 'snapshot.csv')
+    client = FakeSheet([report(1)])
+    SheetSync(client, path).pull()
+    # Proses mati setelah menambah baris ke snapshot, sebelum state tersimpan
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerow(report(2))
+
+    client.set_rows([report(1), report(2)])
+    SheetSync(client, path).pull()
+    assert snapshot_rows(path) == [report(1), report(2)]